@@ -1,6 +1,10 @@
-import pygame
 import random
-from dataclasses import dataclass
+from sprites import SpriteAtlas
+from world import RoomGraph
+from pathfinding import PathFinder
+from gamelog import get_logger
+
+LOG = get_logger("ai")
 
 class GameContext:
     """Contains all external data the Animatronic logic needs."""
@@ -11,7 +15,10 @@ class GameContext:
                  anim_img,
                  player_room,
                  door_checker,
-                 get_power):
+                 get_power,
+                 sprites=None,
+                 doors=None,
+                 rng=None):
 
         self.rooms = rooms
         self.room_connections = room_connections
@@ -20,34 +27,86 @@ class GameContext:
         self.player_room = player_room
         self.is_door_closed_between = door_checker
         self.get_power = get_power
+        # every AI draw comes from here, never from the `random` module the renderer shares
+        self.rng = rng if rng is not None else random.Random()
+        # shared by every animatronic; preload() it at night start
+        self.sprites = sprites if sprites is not None else SpriteAtlas(fallback=anim_img)
+
+        # compiled room graph: the AI only compares integer ids
+        self.graph = RoomGraph(rooms, room_connections)
+        self.player_room_id = self.graph.id(player_room)
+        self.hall_id = self.graph.ids.get("Hall", -1)
+        # `doors` (a DoorRegistry) is looked up by room id and pushes its changes;
+        # without it the path finder has to poll door_checker
+        self.doors = doors.bind(self.graph) if doors is not None else None
+        door_pairs = None if doors is None else [(self.graph.id(a), self.graph.id(b)) for a, b in doors]
+        self.paths = PathFinder(self.graph, self.door_closed, door_pairs)
+        self.poll_doors = doors is None
+        if doors is not None:
+            doors.subscribe(self._door_changed)
+
+    def door_closed(self, room_a, room_b):
+        """Door check by room id."""
+        if self.doors is not None:
+            return self.doors.is_closed_ids(room_a, room_b)
+        names = self.graph.names
+        return self.is_door_closed_between(names[room_a], names[room_b])
+
+    def _door_changed(self, door):
+        a, b = (self.graph.id(name) for name in door.rooms)
+        self.paths.set_door(a, b, door.closed)
 
 
 class Animatronic:
+    __slots__ = ("name", "game", "room", "pos", "waypoint_index", "speed", "state",
+                 "move_timer", "aggression", "attack_timer", "transitioning", "target",
+                 "transition_progress", "transition_duration", "path", "route_index", "visible",
+                 "goal", "goal_index")
+
     def __init__(self, name, start_room, game: GameContext, route=None):
         self.name = name
         self.game = game
-        self.current_room = start_room
-        self.pos = list(random.choice(game.rooms[start_room].waypoints))
+        self.room = game.graph.id(start_room)          # current room id
+        self.pos = list(game.rng.choice(game.graph.waypoints[self.room]))
         self.waypoint_index = 0
 
         self.speed = 60
         self.state = "patrol"
-        self.move_timer = random.uniform(5, 10)
+        self.move_timer = game.rng.uniform(5, 10)
         self.aggression = 1.0
         self.attack_timer = 0.0
         self.transitioning = False
-        self.transition_target = None
+        self.target = -1                               # transition target room id
         self.transition_progress = 0.0
         self.transition_duration = 0.0
 
-        self.route = route if route else []
+        self.path = game.graph.compile_route(route if route else [])
+        self.route_index = 0
+        self.goal = -1          # detour target (room id) while a door blocks the route
+        self.goal_index = 0     # route index to resume at once the goal is reached
         self.visible = True
-        self.images = {}
+
+    # --- name views for UI / logs ---
+    @property
+    def current_room(self):
+        return self.game.graph.names[self.room]
+
+    @current_room.setter
+    def current_room(self, name):
+        self.room = self.game.graph.id(name)
+
+    @property
+    def transition_target(self):
+        return self.game.graph.names[self.target] if self.target >= 0 else None
+
+    @property
+    def route(self):
+        return [self.game.graph.names[i] for i in self.path.ids]
 
     # ----------------------------------------------------
 
     def update(self, dt):
-        power = self.game.get_power()
+        # power is only read when a move starts or ends, not on every step
 
         self.aggression = min(self.aggression + dt * 0.02, 3.0)
 
@@ -55,7 +114,7 @@ class Animatronic:
         if self.transitioning:
             self.transition_progress += dt / max(self.transition_duration, 0.01)
             if self.transition_progress >= 1.0:
-                self._finish_transition(power)
+                self._finish_transition(self.game.get_power())
             return
 
         self.move_timer -= dt
@@ -63,8 +122,8 @@ class Animatronic:
         if self.state == "patrol":
             self.patrol(dt)
             if self.move_timer <= 0:
-                self.try_move(power)
-                self.move_timer = random.uniform(5 / self.aggression, 10 / self.aggression)
+                self.try_move(self.game.get_power())
+                self.move_timer = self.game.rng.uniform(5 / self.aggression, 10 / self.aggression)
 
         elif self.state == "attack":
             self.attack_timer += dt
@@ -75,18 +134,17 @@ class Animatronic:
 
     def patrol(self, dt):
         # Safety: prevent out-of-range in any case
-        room = self.game.rooms[self.current_room]
-        self.waypoint_index %= len(room.waypoints)
+        waypoints = self.game.graph.waypoints[self.room]
+        self.waypoint_index %= len(waypoints)
 
-        room = self.game.rooms[self.current_room]
-        target = room.waypoints[self.waypoint_index]
+        target = waypoints[self.waypoint_index]
 
         dx = target[0] - self.pos[0]
         dy = target[1] - self.pos[1]
         dist = (dx*dx + dy*dy)**0.5
 
         if dist < 4:
-            self.waypoint_index = (self.waypoint_index + 1) % len(room.waypoints)
+            self.waypoint_index = (self.waypoint_index + 1) % len(waypoints)
             return
 
         vx = (dx / dist) * self.speed
@@ -99,45 +157,59 @@ class Animatronic:
 
     def try_move(self, power):
         """Follow the route with transitions."""
-        if not self.route:
+        path = self.path
+        if not path.ids:
             return
 
-        if not hasattr(self, "route_index"):
-            self.route_index = 0
+        game = self.game
+        if game.poll_doors:
+            game.paths.refresh()
+
+        # detour around a closed door (see door block below)
+        if self.goal >= 0:
+            if self.room != self.goal:
+                self._step_towards_goal()
+                return
+            self.route_index = self.goal_index
+            self.goal = -1
 
         # sync with route
-        if self.current_room != self.route[self.route_index]:
-            if self.current_room in self.route:
-                self.route_index = self.route.index(self.current_room)
+        if self.room != path.ids[self.route_index]:
+            index = path.first_index[self.room]
+            if index >= 0:
+                self.route_index = index
             else:
                 self.route_index = 0
-                self.current_room = self.route[0]
+                self.room = path.ids[0]
 
         # next target
-        next_room = (
-            self.route[self.route_index + 1]
-            if self.route_index < len(self.route) - 1
-            else self.route[0]
-        )
+        next_room = path.next_room[self.route_index]
 
         if self.transitioning:
             return
 
         # office special case
-        if self.current_room == "Hall" and next_room == "Office":
-            if not self.game.is_door_closed_between("Hall", "Office"):
-                print(f"[AI] {self.name} enters Office → attack mode")
-                self._start_transition("Office")
+        if self.room == game.hall_id and next_room == game.player_room_id:
+            if not game.door_closed(game.hall_id, game.player_room_id):
+                LOG.info("%s enters Office → attack mode", self.name)
+                self._start_transition(next_room)
                 self.state = "attack"
             else:
-                print(f"[AI] {self.name} blocked at Hall → Office (door closed)")
+                LOG.debug("%s blocked at Hall → Office (door closed)", self.name)
                 # FIX:
                 self.waypoint_index = 0
             return
 
-        # door block
-        if self.game.is_door_closed_between(self.current_room, next_room):
-            print(f"[AI] {self.name} blocked between {self.current_room} and {next_room}")
+        # door block: go around it if the map allows, otherwise wait
+        if game.door_closed(self.room, next_room):
+            hop = game.paths.step(self.room, next_room)
+            if hop >= 0 and hop != next_room:
+                LOG.debug("%s re-routes around the door to %s", self.name, game.graph.names[next_room])
+                self.goal = next_room
+                self.goal_index = path.next_index[self.route_index]
+                self._start_transition(hop)
+                return
+            LOG.debug("%s blocked between %s and %s", self.name, self.current_room, game.graph.names[next_room])
             # FIX:
             self.waypoint_index = 0
             return
@@ -145,30 +217,39 @@ class Animatronic:
 
         # start transition
         self._start_transition(next_room)
-        print(f"[AI] {self.name} starts moving {self.current_room} → {next_room}")
+        LOG.debug("%s starts moving %s → %s", self.name, self.current_room, game.graph.names[next_room])
 
-        self.route_index = (self.route_index + 1) % len(self.route)
+        self.route_index = path.next_index[self.route_index]
+
+    def _step_towards_goal(self):
+        hop = self.game.paths.step(self.room, self.goal)
+        if hop < 0 or hop == self.room:
+            # every way is shut: wait here like a blocked route
+            self.waypoint_index = 0
+            return
+        self._start_transition(hop)
+        LOG.debug("%s detours %s → %s", self.name, self.current_room, self.game.graph.names[hop])
 
     # ----------------------------------------------------
 
     def _start_transition(self, target):
         self.transitioning = True
-        self.transition_target = target
+        self.target = target
         self.transition_progress = 0
-        self.transition_duration = random.uniform(2.0, 6.0) / max(self.aggression, 0.1)
+        self.transition_duration = self.game.rng.uniform(2.0, 6.0) / max(self.aggression, 0.1)
 
     def _finish_transition(self, power):
         self.transitioning = False
-        self.current_room = self.transition_target
+        self.room = self.target
 
-        room = self.game.rooms[self.current_room]
-        self.pos = list(random.choice(room.waypoints))
+        self.pos = list(self.game.rng.choice(self.game.graph.waypoints[self.room]))
 
+        game = self.game
         if (
-            self.current_room == self.game.player_room
-            and (not self.game.is_door_closed_between("Hall", "Office") or power <= 0)
+            self.room == game.player_room_id
+            and (not game.door_closed(game.hall_id, game.player_room_id) or power <= 0)
         ):
-            print(f"[AI] {self.name} enters Office — attack!")
+            LOG.info("%s enters Office — attack!", self.name)
             self.state = "attack"
             self.attack_timer = 0.0
         else:
@@ -177,20 +258,7 @@ class Animatronic:
     # ----------------------------------------------------
 
     def get_room_image(self):
-        if self.current_room in self.images:
-            return self.images[self.current_room]
-
-        # load on demand
-        path = f"../assets/animatronics/{self.name}/{self.current_room}.png"
-
-        try:
-            img = pygame.image.load(path).convert_alpha()
-        except:
-            img = self.game.anim_img
-
-        img = pygame.transform.scale(img, (320, 240))
-        self.images[self.current_room] = img
-        return img
+        return self.game.sprites.get(self.name, self.current_room)
 
     # ----------------------------------------------------
 
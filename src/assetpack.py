@@ -0,0 +1,177 @@
+"""
+Vorgebackene Bild-Assets.
+Ein Bake-Schritt lädt alle PNGs einmal, skaliert sie auf ihre Spielgröße und
+schreibt die Pixel (Byte-Reihenfolge des Displays) in eine indizierte
+Pack-Datei. Zur Laufzeit wird die Datei per mmap eingeblendet und jede Fläche
+direkt mit frombuffer gebaut - ohne PNG-Dekodierung und ohne smoothscale.
+Fehlt das Pack oder ist ein Eintrag veraltet, wird wie früher das PNG geladen.
+
+    python assetpack.py     # assets/images.pack neu schreiben
+"""
+import os
+import json
+import mmap
+import struct
+import threading
+import pygame
+
+PACK_PATH = "../assets/images.pack"
+PACK_MAGIC = b"FNDPACK1"
+PACK_ALIGN = 64
+PIXEL_ORDER = "BGRA"
+
+# (Pfad, Größe, Alpha, smoothscale) - genau so, wie das Spiel die Bilder lädt
+IMAGE_MANIFEST = [
+    ("../assets/rooms/Office/office_base.png",      (1920, 1080), False, True),
+    ("../assets/rooms/Office/door_left_closed.png", (1920, 1080), True,  True),
+    ("../assets/rooms/stage.png",      (320, 240), False, True),
+    ("../assets/rooms/hall.png",       (320, 240), False, True),
+    ("../assets/rooms/kitchen.png",    (320, 240), False, True),
+    ("../assets/rooms/hallcorner.png", (320, 240), False, True),
+    ("../assets/rooms/backroom.png",   (320, 240), False, True),
+    ("../assets/ui/map_top.png",       (1280, 720), True, False),
+    ("../assets/ui/map_bottom.png",    (1280, 720), True, False),
+    ("../assets/images/rainer_flash.png", (1920, 1080), True, False),
+]
+ANIMATRONIC_DIR = "../assets/animatronics"
+ANIMATRONIC_SPRITE_SIZE = (320, 240)
+
+_pack = None
+_pack_lock = threading.Lock()
+
+
+def _key(path, size):
+    return f"{os.path.normcase(os.path.normpath(path))}@{size[0]}x{size[1]}"
+
+
+def manifest():
+    """Image manifest plus every animatronic room pose found on disk."""
+    entries = list(IMAGE_MANIFEST)
+    if os.path.isdir(ANIMATRONIC_DIR):
+        for name in sorted(os.listdir(ANIMATRONIC_DIR)):
+            folder = os.path.join(ANIMATRONIC_DIR, name)
+            if not os.path.isdir(folder):
+                continue
+            for fname in sorted(os.listdir(folder)):
+                if fname.lower().endswith(".png"):
+                    path = f"{ANIMATRONIC_DIR}/{name}/{fname}"
+                    entries.append((path, ANIMATRONIC_SPRITE_SIZE, True, False))
+    return entries
+
+
+def _scale(img, size, smooth):
+    if img.get_size() == tuple(size):
+        return img
+    if smooth:
+        return pygame.transform.smoothscale(img, size)
+    return pygame.transform.scale(img, size)
+
+
+def bake(path=PACK_PATH):
+    """Write every manifest image at its in-game size into one pack file."""
+    index, blobs, offset = [], [], 0
+    for src, size, alpha, smooth in manifest():
+        if not os.path.exists(src):
+            print(f"[WARN] Pack: missing {src}")
+            continue
+        img = _scale(pygame.image.load(src), size, smooth)
+        if img.get_bitsize() < 24:
+            img = img.convert(32, 0)
+        data = pygame.image.tobytes(img, PIXEL_ORDER)
+        if not alpha:
+            # deckend: Alpha-Byte fest auf 255
+            buf = bytearray(data)
+            buf[3::4] = b"\xff" * (len(buf) // 4)
+            data = bytes(buf)
+        pad = -offset % PACK_ALIGN
+        blobs.append(b"\0" * pad + data)
+        offset += pad
+        index.append({
+            "key": _key(src, size), "size": list(size), "alpha": alpha, "smooth": smooth,
+            "mtime": os.path.getmtime(src), "offset": offset, "length": len(data),
+        })
+        offset += len(data)
+
+    header = json.dumps({"order": PIXEL_ORDER, "images": index}).encode("utf-8")
+    prefix_len = len(PACK_MAGIC) + 4 + len(header)
+    base = prefix_len + (-prefix_len % PACK_ALIGN)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(PACK_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (base - prefix_len))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+    print(f"[INFO] Baked {len(index)} images into {path} ({(base + offset) / 2**20:.1f} MiB)")
+
+
+class ImagePack:
+    """Memory-mapped pack file; surfaces point straight into the mapping."""
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        if self._file.read(len(PACK_MAGIC)) != PACK_MAGIC:
+            self._file.close()
+            raise ValueError(f"not an image pack: {path}")
+        (header_len,) = struct.unpack("<I", self._file.read(4))
+        header = json.loads(self._file.read(header_len).decode("utf-8"))
+        prefix_len = len(PACK_MAGIC) + 4 + header_len
+        self.base = prefix_len + (-prefix_len % PACK_ALIGN)
+        self.order = header["order"]
+        self.entries = {e["key"]: e for e in header["images"]}
+        # ACCESS_COPY: wer auf eine Fläche zeichnet, verändert nie die Datei
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+
+    def surface(self, path, size, alpha, smooth):
+        """Surface for (path, size) or None if missing/stale (not yet converted)."""
+        e = self.entries.get(_key(path, size))
+        if (e is None or e["alpha"] != alpha or e["smooth"] != smooth
+                or not os.path.exists(path) or e["mtime"] != os.path.getmtime(path)):
+            return None
+        start = self.base + e["offset"]
+        return pygame.image.frombuffer(self._view[start:start + e["length"]], tuple(e["size"]), self.order)
+
+
+def get_pack():
+    global _pack
+    with _pack_lock:
+        if _pack is None:
+            try:
+                _pack = ImagePack(PACK_PATH)
+            except (OSError, ValueError):
+                _pack = False
+    return _pack or None
+
+
+def decode_image(path, size, alpha=True, smooth=True):
+    """
+    Thread-safe part of load_image: pack lookup or PNG decode + scale.
+    Returns (surface, from_pack, alpha) for finish_image().
+    """
+    pack = get_pack()
+    if pack is not None:
+        surf = pack.surface(path, size, alpha, smooth)
+        if surf is not None:
+            return surf, True, alpha
+    return _scale(pygame.image.load(path), size, smooth), False, alpha
+
+
+def finish_image(decoded):
+    """Main-thread part of load_image: convert to the display format."""
+    surf, from_pack, alpha = decoded
+    if not alpha:
+        # deckende Bilder einmal ins Display-Format ohne Alpha-Blending kopieren
+        return surf.convert()
+    return surf if from_pack else surf.convert_alpha()
+
+
+def load_image(path, size, alpha=True, smooth=True):
+    """Pre-scaled image from the pack, or load + scale the PNG as fallback."""
+    return finish_image(decode_image(path, size, alpha, smooth))
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    bake()
@@ -0,0 +1,344 @@
+"""
+Headless render benchmark for every screen.
+Each case runs in its own process under the SDL dummy drivers and draws
+seeded frames through the game's real drawing code: night view (office,
+camera feed, map layers, boot static, blackout), main menu, night intro and
+the jumpscare playback loop. Frames are timed between two presents; a
+second run per case counts allocations (tracemalloc) and new surfaces.
+
+    python benchmark.py --save ../benchmarks/baseline.json
+    python benchmark.py --compare ../benchmarks/baseline.json --threshold 0.2
+    python benchmark.py --cases camera,map_top --frames 300
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+
+BENCH_DT = 1.0 / 60.0
+WARMUP_FRAMES = 10
+NIGHT_CASES = ["office", "camera", "map_top", "map_bottom", "camera_boot", "blackout"]
+CASES = NIGHT_CASES + ["menu", "intro", "jumpscare"]
+METRICS = ["ms_per_frame", "alloc_kb_per_frame", "surfaces_per_frame"]
+TEST_CLIP = "../assets/jumpscares/cache/benchmark_clip.mp4"
+TEST_CLIP_SECONDS = 1.0
+
+
+# ----------------------------------------------------------------------
+# in the case process
+# ----------------------------------------------------------------------
+
+class _BenchClock:
+    """Stands in for pygame.time.Clock: never sleeps, every frame is BENCH_DT long."""
+    def __init__(self):
+        self.frames = 0
+
+    def tick(self, framerate=0):
+        self.frames += 1
+        return BENCH_DT * 1000.0
+
+    def get_fps(self):
+        return 1.0 / BENCH_DT
+
+
+class _Recorder:
+    """Called on every present(): closes one frame's timing/allocation/surface sample."""
+    def __init__(self, count_allocations):
+        self.count_allocations = count_allocations
+        self.times, self.alloc_kb, self.surfaces = [], [], []
+        self.new_surfaces = 0
+        self._last = None
+
+    def start(self):
+        if self.count_allocations:
+            import tracemalloc
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+        self.new_surfaces = 0
+        self._last = time.perf_counter()
+
+    def frame_done(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.times.append((now - self._last) * 1000.0)
+        if self.count_allocations:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            self.alloc_kb.append((peak - self._base) / 1024.0)
+            tracemalloc.reset_peak()
+            self._base = current
+        self.surfaces.append(self.new_surfaces)
+        self.new_surfaces = 0
+        self._last = time.perf_counter()
+
+
+def _install_surface_counter(pygame, recorder):
+    """Counts surfaces made by Surface(), transform.*, image.* and Font.render from here on."""
+    base_surface = pygame.Surface
+
+    class CountingSurface(base_surface):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            recorder.new_surfaces += 1
+
+        def copy(self):
+            recorder.new_surfaces += 1
+            return super().copy()
+
+    def counted(fn, dest_arg=None):
+        def wrapper(*args, **kwargs):
+            if dest_arg is None or (len(args) <= dest_arg and "dest_surface" not in kwargs):
+                recorder.new_surfaces += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    pygame.Surface = CountingSurface
+    for name, dest_arg in (("scale", 2), ("smoothscale", 2), ("scale_by", 2), ("smoothscale_by", 2),
+                           ("rotate", None), ("rotozoom", None), ("flip", None)):
+        if hasattr(pygame.transform, name):
+            setattr(pygame.transform, name, counted(getattr(pygame.transform, name), dest_arg))
+    for name in ("load", "frombuffer", "fromstring", "frombytes"):
+        if hasattr(pygame.image, name):
+            setattr(pygame.image, name, counted(getattr(pygame.image, name)))
+
+    base_font = pygame.font.Font
+
+    class CountingFont(base_font):
+        def render(self, *args, **kwargs):
+            recorder.new_surfaces += 1
+            return super().render(*args, **kwargs)
+
+    pygame.font.Font = CountingFont
+    return CountingSurface
+
+
+def _adopt(counting_surface, surface):
+    """Same pixels and format, but copy() is counted (room feeds are copied every frame)."""
+    if surface is None or isinstance(surface, counting_surface):
+        return surface
+    adopted = counting_surface(surface.get_size(), surface.get_flags(), surface)
+    adopted.blit(surface, (0, 0))
+    return adopted
+
+
+def _ensure_test_clip():
+    """Short synthetic clip (green background, moving box) for the jumpscare case."""
+    if os.path.exists(TEST_CLIP):
+        return TEST_CLIP
+    import numpy as np
+    from moviepy.editor import VideoClip
+
+    def make_frame(t):
+        frame = np.zeros((360, 640, 3), dtype=np.uint8)
+        frame[..., 1] = 255
+        x = int(40 + 400 * t / TEST_CLIP_SECONDS)
+        frame[100:260, x:x + 160] = (200, 40, 40)
+        return frame
+
+    os.makedirs(os.path.dirname(TEST_CLIP), exist_ok=True)
+    VideoClip(make_frame, duration=TEST_CLIP_SECONDS).write_videofile(
+        TEST_CLIP, fps=30, codec="libx264", audio=False, logger=None)
+    return TEST_CLIP
+
+
+def run_case(case, frames, seed, count_allocations):
+    """Runs one case in this process and returns its raw per-frame samples."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    pygame.time.Clock = _BenchClock
+    recorder = _Recorder(count_allocations)
+    counting_surface = _install_surface_counter(pygame, recorder) if count_allocations else None
+
+    random.seed(seed)
+    sys.argv = [sys.argv[0], "--echo-level", "error", "--log-file", "../logs/benchmark.log"]
+    import main
+    import render
+    main.wait_for_assets("menu", "night")
+    random.seed(seed)
+    main.game.rng.seed(seed)
+
+    present = render.present
+
+    def timed_present(*args, **kwargs):
+        result = present(*args, **kwargs)
+        recorder.frame_done()
+        return result
+    main.present = timed_present
+
+    if counting_surface is not None:
+        for room in main.ROOMS.values():
+            room.view_surface = _adopt(counting_surface, room.view_surface)
+
+    if case in NIGHT_CASES:
+        main.camera_active = case != "office" and case != "blackout"
+        main.map_open = case.startswith("map_")
+        main.map_layer = 1 if case == "map_top" else 0
+        main.camera_booting = case == "camera_boot"
+        main.camera_index = main.CAMERA_INDEX["Stage"]   # Rainer starts there
+        main.static_alpha = 255
+        main.power = 0 if case == "blackout" else 80.0
+        main.night_timer = 300.0
+        main.game_over = False
+        main.camera_bar_y = main.camera_bar_target_y = main.HEIGHT - 20   # as main() starts the night
+        recorder.start()
+        for i in range(frames + WARMUP_FRAMES):
+            main.STATIC_FRAME_INDEX = i % main.STATIC_NOISE.count
+            main.draw_night_frame(None, False, "2 AM", "1: Stage", False, BENCH_DT)
+            main.present(main.SCREEN, main.WINDOW, main.VIRTUAL_W, main.VIRTUAL_H)
+
+    elif case == "menu":
+        get_events = pygame.event.get
+        shown = [0]
+
+        def scripted_events(*args, **kwargs):
+            events = get_events(*args, **kwargs)
+            shown[0] += 1
+            if shown[0] > frames + WARMUP_FRAMES:
+                events.append(pygame.event.Event(pygame.QUIT))
+            return events
+        pygame.event.get = scripted_events
+        recorder.start()
+        try:
+            main.main_menu()
+        except SystemExit:
+            pass
+
+    elif case == "intro":
+        recorder.start()
+        main.show_night_intro(main.SCREEN, "Night 1")
+
+    elif case == "jumpscare":
+        from jumpscare import load_jumpscare
+        clip = load_jumpscare(_ensure_test_clip(), (main.WIDTH, main.HEIGHT))
+        recorder.start()
+        while len(recorder.times) < frames + WARMUP_FRAMES:
+            main.play_jumpscare_video(clip)
+
+    else:
+        raise ValueError(f"unknown case {case!r}")
+
+    return {
+        "times": recorder.times[WARMUP_FRAMES:],
+        "alloc_kb": recorder.alloc_kb[WARMUP_FRAMES:],
+        "surfaces": recorder.surfaces[WARMUP_FRAMES:],
+    }
+
+
+# ----------------------------------------------------------------------
+# driver
+# ----------------------------------------------------------------------
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0
+
+
+def _spawn(case, frames, seed, count_allocations):
+    cmd = [sys.executable, os.path.abspath(__file__), "--run-case", case,
+           "--frames", str(frames), "--seed", str(seed)]
+    if count_allocations:
+        cmd.append("--allocations")
+    out = subprocess.run(cmd, capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    for line in out.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[len("BENCH "):])
+    raise RuntimeError(f"case {case} failed:\n{out.stdout[-2000:]}{out.stderr[-2000:]}")
+
+
+def benchmark(cases, frames, seed):
+    results = {}
+    for case in cases:
+        timing = _spawn(case, frames, seed, count_allocations=False)
+        allocs = _spawn(case, frames, seed, count_allocations=True)
+        results[case] = {
+            "frames": len(timing["times"]),
+            "ms_per_frame": round(_mean(timing["times"]), 3),
+            "p95_ms": round(_p95(timing["times"]), 3),
+            "alloc_kb_per_frame": round(_mean(allocs["alloc_kb"]), 2),
+            "surfaces_per_frame": round(_mean(allocs["surfaces"]), 2),
+        }
+        r = results[case]
+        print(f"[INFO] {case:<12} {r['ms_per_frame']:8.2f} ms/frame  p95 {r['p95_ms']:7.2f}  "
+              f"{r['alloc_kb_per_frame']:8.1f} KiB alloc  {r['surfaces_per_frame']:5.1f} surfaces")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regressions as (case, metric, old, new); small absolute changes are noise."""
+    regressions = []
+    floors = {"ms_per_frame": 0.2, "alloc_kb_per_frame": 1.0, "surfaces_per_frame": 0.5}
+    for case, new in results.items():
+        old = baseline.get("cases", {}).get(case)
+        if old is None:
+            print(f"[WARN] {case}: not in baseline")
+            continue
+        for metric in METRICS:
+            if new[metric] > old[metric] * (1.0 + threshold) and new[metric] - old[metric] > floors[metric]:
+                regressions.append((case, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless render benchmark.")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"comma separated, from {', '.join(CASES)}")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    parser.add_argument("--allocations", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        samples = run_case(args.run_case, args.frames, args.seed, args.allocations)
+        sys.stdout.write("BENCH " + json.dumps(samples) + "\n")
+        sys.stdout.flush()
+        os._exit(0)  # skip pygame/atexit teardown, the samples are out
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = benchmark(cases, args.frames, args.seed)
+    report = {
+        "version": 1,
+        "frames": args.frames,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+    }
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Wrote {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for case, metric, old, new in regressions:
+            print(f"[WARN] regression {case}.{metric}: {old} -> {new} (+{(new / max(old, 1e-9) - 1):.0%})")
+        if regressions:
+            return 1
+        print(f"[INFO] no regressions past {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Greenscreen-Keying für Jumpscare-Videos.
+Arbeitet nur mit Ganzzahlen, schreibt in einen wiederverwendeten RGBA-Puffer
+und verteilt die Zeilen auf einen Thread-Pool (NumPy gibt dabei den GIL frei).
+
+    python chroma.py     # Microbenchmark: Frames/s bei 1080p und 720p
+"""
+import os
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# g > 1.55 * r  <=>  20 * g > 31 * r   (ganzzahlig, passt in uint16/int32)
+KEY_NUM = 20
+KEY_DEN = 31
+KEY_MIN_GREEN = 40
+
+
+def chroma_key_rgba(frame):
+    """Reference (old) implementation, kept for the benchmark."""
+    frame = np.copy(frame).astype(np.uint8)
+    r, g, b = frame[..., 0], frame[..., 1], frame[..., 2]
+    mask = (g > 1.55 * r) & (g > 1.55 * b) & (g > 40)
+    alpha = np.where(mask, 0, 255).astype(np.uint8)
+    rgba = np.dstack((r, g, b, alpha))
+    return rgba
+
+
+class _Band:
+    """Scratch buffers for one horizontal stripe of the frame."""
+    def __init__(self, y0, y1, width):
+        self.y0, self.y1 = y0, y1
+        shape = (y1 - y0, width)
+        self.rb_max = np.empty(shape, np.uint8)
+        self.lhs = np.empty(shape, np.int32)
+        self.rhs = np.empty(shape, np.int32)
+        self.mask = np.empty(shape, np.bool_)
+        self.bright = np.empty(shape, np.bool_)
+
+
+class ChromaKeyer:
+    """
+    Removes the green screen from RGB frames of a fixed size.
+    The returned array is the keyer's own output buffer and is overwritten
+    by the next call.
+    """
+    def __init__(self, width, height, threads=None, spill=False, softness=0, order="RGBA"):
+        if order not in ("RGBA", "BGRA"):
+            raise ValueError(f"unknown pixel order: {order}")
+        self.width, self.height = width, height
+        self.spill = spill
+        self.softness = int(softness)
+        self.order = order
+        self.out = np.empty((height, width, 4), np.uint8)
+
+        self.threads = max(1, threads if threads else (os.cpu_count() or 1))
+        rows = -(-height // self.threads)
+        self._bands = [_Band(y, min(y + rows, height), width) for y in range(0, height, rows)]
+        self._pool = ThreadPoolExecutor(self.threads) if len(self._bands) > 1 else None
+
+    def _key_band(self, frame, band):
+        y0, y1 = band.y0, band.y1
+        r, g, b = frame[y0:y1, :, 0], frame[y0:y1, :, 1], frame[y0:y1, :, 2]
+        out = self.out[y0:y1]
+        alpha = out[..., 3]
+
+        # Grünanteil: 20*g - 31*max(r, b) > 0  und  g > 40
+        np.maximum(r, b, out=band.rb_max)
+        np.multiply(g, KEY_NUM, out=band.lhs, dtype=np.int32)
+        np.multiply(band.rb_max, KEY_DEN, out=band.rhs, dtype=np.int32)
+        np.greater(g, KEY_MIN_GREEN, out=band.bright)
+
+        if self.softness > 0:
+            # weiche Kante: Alpha fällt linear von -softness (deckend) bis +softness (weg)
+            s = self.softness
+            np.subtract(band.lhs, band.rhs, out=band.lhs)
+            np.subtract(s, band.lhs, out=band.lhs)
+            np.multiply(band.lhs, 255, out=band.lhs)
+            np.floor_divide(band.lhs, 2 * s, out=band.lhs)
+            np.clip(band.lhs, 0, 255, out=band.lhs)
+            np.logical_not(band.bright, out=band.mask)
+            np.copyto(band.lhs, 255, where=band.mask)
+            np.copyto(alpha, band.lhs, casting="unsafe")
+        else:
+            np.greater(band.lhs, band.rhs, out=band.mask)
+            np.logical_and(band.mask, band.bright, out=band.mask)
+            np.logical_not(band.mask, out=band.bright)
+            np.multiply(band.bright, 255, out=alpha, dtype=np.uint8)
+
+        ri, bi = (0, 2) if self.order == "RGBA" else (2, 0)
+        out[..., ri] = r
+        out[..., bi] = b
+        if self.spill:
+            # Grünstich an Kanten entfernen: g auf max(r, b) begrenzen
+            np.minimum(g, band.rb_max, out=out[..., 1])
+        else:
+            out[..., 1] = g
+
+    def key(self, frame):
+        """Key one (height, width, 3) uint8 frame; returns the shared RGBA/BGRA buffer."""
+        if frame.shape[:2] != (self.height, self.width):
+            raise ValueError(f"frame size {frame.shape[1]}x{frame.shape[0]} != keyer size {self.width}x{self.height}")
+        if self._pool is None:
+            self._key_band(frame, self._bands[0])
+        else:
+            for f in [self._pool.submit(self._key_band, frame, band) for band in self._bands]:
+                f.result()
+        return self.out
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def benchmark(sizes=((1920, 1080), (1280, 720)), frames=30):
+    """Print keyed frames/s for the old function and the keyer (1 thread / all threads)."""
+    rng = np.random.default_rng(0)
+    for w, h in sizes:
+        frame = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        frame[: h // 2, :, 1] = 220   # halbes Bild "Greenscreen"
+
+        def run(fn):
+            fn(frame)  # warm-up
+            t = time.perf_counter()
+            for _ in range(frames):
+                fn(frame)
+            return frames / (time.perf_counter() - t)
+
+        results = [("reference", run(chroma_key_rgba))]
+        for threads in sorted({1, os.cpu_count() or 1}):
+            keyer = ChromaKeyer(w, h, threads=threads)
+            results.append((f"keyer x{threads}", run(keyer.key)))
+            keyer.close()
+        keyer = ChromaKeyer(w, h, spill=True, softness=64)
+        results.append((f"keyer x{keyer.threads} spill+soft", run(keyer.key)))
+        keyer.close()
+
+        for name, fps in results:
+            print(f"{w}x{h}  {name:<24} {fps:8.1f} frames/s")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,73 @@
+"""
+Dirty-Rectangle-Compositor für die Office-Ansicht.
+Merkt sich pro Layer den zuletzt gezeichneten Zustand und sammelt nur die
+Rechtecke, die sich seit dem letzten Frame geändert haben.
+"""
+import pygame
+
+_UNSET = object()
+
+
+class DirtyCompositor:
+    """Retained-mode layer tracker: collects damaged rects instead of redrawing everything."""
+    def __init__(self, width, height):
+        self.screen_rect = pygame.Rect(0, 0, width, height)
+        self._keys = {}
+        self._rects = {}
+        self._dirty = []
+        self._full = True
+
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.idle_frames = 0
+
+    def invalidate(self):
+        """Next collect() forces a full redraw (camera, map, jumpscare, resize...)."""
+        self._full = True
+
+    def track(self, name, key, rect):
+        """
+        Registers the current state of a layer.
+        If `key` differs from last frame, the old and the new rect become dirty.
+        """
+        rect = pygame.Rect(rect)
+        if self._keys.get(name, _UNSET) == key and self._rects.get(name) == rect:
+            return
+        old = self._rects.get(name)
+        if old is not None:
+            self._dirty.append(old)
+        self._dirty.append(rect)
+        self._keys[name] = key
+        self._rects[name] = rect
+
+    def collect(self):
+        """
+        Returns None when the whole screen must be redrawn,
+        otherwise a (possibly empty) list of merged dirty rects.
+        """
+        dirty, self._dirty = self._dirty, []
+        if self._full:
+            self._full = False
+            self.full_frames += 1
+            return None
+
+        merged = []
+        for rect in dirty:
+            rect = rect.clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            # überlappende Rechtecke zusammenfassen, bis nichts mehr kollidiert
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+
+        if any(r == self.screen_rect for r in merged):
+            self.full_frames += 1
+            return None
+        if merged:
+            self.partial_frames += 1
+        else:
+            self.idle_frames += 1
+        return merged
@@ -0,0 +1,454 @@
+"""
+Struct-of-arrays AI engine for custom nights with many animatronics.
+Same rules as Animatronic.update (patrol, transition, attack, jumpscare), but
+every field lives in a NumPy array and one tick advances all animatronics
+with vectorised operations.
+
+    python crowd.py     # lockstep checks against Animatronic + per-tick benchmark
+"""
+import sys
+import time
+import numpy as np
+import world
+from gamelog import GAME_LOG
+
+PATROL, ATTACK, JUMPSCARE = 0, 1, 2
+STATE_NAMES = ("patrol", "attack", "jumpscare")
+
+
+class CrowdEngine:
+    """
+    All animatronics of a night as arrays. `game` is the usual GameContext;
+    `rng` is a numpy Generator (every random draw is a unit uniform, scaled
+    like random.uniform/random.choice in Animatronic). Without `rng` or `seed`
+    it is seeded from the simulation's game.rng, never from the shared `random`.
+    """
+    def __init__(self, game, names, start_rooms, routes, speeds=None, rng=None, seed=None):
+        self.game = game
+        if rng is None:
+            rng = np.random.default_rng(seed if seed is not None else game.rng.getrandbits(64))
+        self.rng = rng
+        self.recorder = None   # optional callable(entity, u) seeing every draw (lockstep check)
+
+        # --- room tables (same ids as the compiled RoomGraph) ---
+        graph = game.graph
+        self.room_names = list(graph.names)
+        self.room_id = graph.ids
+        R = len(graph)
+        wmax = max(len(pts) for pts in graph.waypoints)
+        self.waypoints = np.zeros((R, wmax, 2), np.float64)
+        self.wp_count = np.zeros(R, np.int64)
+        for i, pts in enumerate(graph.waypoints):
+            self.waypoints[i, :len(pts)] = pts
+            self.wp_count[i] = len(pts)
+        self.player_room = game.player_room_id
+        self.hall = game.hall_id
+
+        # --- per-animatronic state ---
+        N = len(names)
+        self.names = list(names)
+        self.room = np.array([self.room_id[r] for r in start_rooms], np.int64)
+        self.pos = np.zeros((N, 2), np.float64)
+        self.waypoint_index = np.zeros(N, np.int64)
+        self.speed = np.full(N, 60.0) if speeds is None else np.asarray(speeds, np.float64).copy()
+        self.state = np.full(N, PATROL, np.int64)
+        self.move_timer = np.zeros(N)
+        self.aggression = np.ones(N)
+        self.attack_timer = np.zeros(N)
+        self.transitioning = np.zeros(N, np.bool_)
+        self.transition_target = np.zeros(N, np.int64)
+        self.transition_progress = np.zeros(N)
+        self.transition_duration = np.zeros(N)
+
+        # routes: padded id matrix + first occurrence of every room (route.index())
+        lmax = max(1, max(len(r) for r in routes))
+        self.route = np.zeros((N, lmax), np.int64)
+        self.route_len = np.array([len(r) for r in routes], np.int64)
+        self.route_pos = np.full((N, R), -1, np.int64)
+        for i, route in enumerate(routes):
+            for j, name in enumerate(route):
+                rid = self.room_id[name]
+                self.route[i, j] = rid
+                if self.route_pos[i, rid] < 0:
+                    self.route_pos[i, rid] = j
+        self.route_index = np.zeros(N, np.int64)
+        self.goal = np.full(N, -1, np.int64)         # detour target while a door blocks the route
+        self.goal_index = np.zeros(N, np.int64)      # route index to resume at once the goal is reached
+
+        # PathFinder next hops as an array, copied again only after the finder rebuilt rows
+        self._hops = None
+        self._hops_version = -1
+
+        # only door pairs an animatronic can actually ask about are polled per tick
+        pairs = {(self.hall, self.player_room)} if self.hall >= 0 else set()
+        for route in routes:
+            ids = [self.room_id[name] for name in route]
+            pairs.update(zip(ids, ids[1:] + ids[:1]))
+        self._door_pairs = sorted(pairs)
+        self._doors = np.zeros((R, R), np.bool_)
+        # with a door registry the matrix is kept up to date by events, not polled per tick
+        self._door_events = game.doors is not None
+        self._door_matrix(force=True)
+        if self._door_events:
+            game.doors.subscribe(self._door_changed)
+
+        everyone = np.arange(N)
+        self.pos[:] = self._choose_waypoint(everyone, self.room)
+        self.move_timer[:] = self._uniform(everyone, 5.0, 10.0)
+
+    @classmethod
+    def from_animatronics(cls, game, animatronics, rng=None, seed=None):
+        """Snapshot existing Animatronic objects (positions, timers, routes) into arrays."""
+        engine = cls(game, [a.name for a in animatronics], [a.current_room for a in animatronics],
+                     [a.route for a in animatronics], [a.speed for a in animatronics], rng=rng, seed=seed)
+        for i, a in enumerate(animatronics):
+            engine.room[i] = a.room
+            engine.pos[i] = a.pos
+            engine.waypoint_index[i] = a.waypoint_index
+            engine.state[i] = STATE_NAMES.index(a.state)
+            engine.move_timer[i] = a.move_timer
+            engine.aggression[i] = a.aggression
+            engine.attack_timer[i] = a.attack_timer
+            engine.transitioning[i] = a.transitioning
+            engine.transition_target[i] = max(a.target, 0)
+            engine.transition_progress[i] = a.transition_progress
+            engine.transition_duration[i] = a.transition_duration
+            engine.route_index[i] = a.route_index
+            engine.goal[i] = a.goal
+            engine.goal_index[i] = a.goal_index
+        return engine
+
+    def __len__(self):
+        return len(self.names)
+
+    # ----------------------------------------------------
+
+    def _units(self, idx):
+        u = self.rng.random(len(idx))
+        if self.recorder is not None:
+            for i, x in zip(idx, u):
+                self.recorder(int(i), float(x))
+        return u
+
+    def _uniform(self, idx, low, high):
+        return low + (high - low) * self._units(idx)
+
+    def _choose_waypoint(self, idx, rooms):
+        k = (self._units(idx) * self.wp_count[rooms]).astype(np.int64)
+        return self.waypoints[rooms, k]
+
+    def _door_matrix(self, force=False):
+        if self._door_events and not force:
+            return self._doors
+        closed = self.game.door_closed
+        for a, b in self._door_pairs:
+            self._doors[a, b] = closed(a, b)
+        return self._doors
+
+    def _next_hops(self):
+        """game.paths next-hop table (same detours as Animatronic) as an (R, R) array."""
+        paths = self.game.paths
+        if self.game.poll_doors:
+            paths.refresh()
+        if self._hops_version != paths.rebuilt_rows:
+            self._hops = np.array(paths.next_hop, np.int64)
+            self._hops_version = paths.rebuilt_rows
+        return self._hops
+
+    def _door_changed(self, door):
+        a, b = (self.room_id[name] for name in door.rooms)
+        self._doors[a, b] = self._doors[b, a] = door.closed
+
+    # ----------------------------------------------------
+
+    def update(self, dt):
+        """One tick for every animatronic (Animatronic.update, vectorised)."""
+        power = self.game.get_power()
+        doors = self._door_matrix()
+
+        np.minimum(self.aggression + dt * 0.02, 3.0, out=self.aggression)
+
+        # handle transition movement
+        moving = self.transitioning.copy()
+        t = np.flatnonzero(moving)
+        if len(t):
+            self.transition_progress[t] += dt / np.maximum(self.transition_duration[t], 0.01)
+            self._finish_transition(t[self.transition_progress[t] >= 1.0], power, doors)
+
+        idle = ~moving
+        self.move_timer[idle] -= dt
+        patrolling = idle & (self.state == PATROL)
+        attacking = idle & (self.state == ATTACK)
+
+        p = np.flatnonzero(patrolling)
+        if len(p):
+            self._patrol(p, dt)
+            m = p[self.move_timer[p] <= 0]
+            if len(m):
+                self._try_move(m, doors)
+                agg = self.aggression[m]
+                self.move_timer[m] = self._uniform(m, 5 / agg, 10 / agg)
+
+        a = np.flatnonzero(attacking)
+        if len(a):
+            self.attack_timer[a] += dt
+            self.state[a[self.attack_timer[a] > 3.0]] = JUMPSCARE
+
+    def _patrol(self, idx, dt):
+        rooms = self.room[idx]
+        wi = self.waypoint_index[idx] % self.wp_count[rooms]
+        target = self.waypoints[rooms, wi]
+        d = target - self.pos[idx]
+        dist = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1])
+
+        arrived = dist < 4
+        wi[arrived] = (wi[arrived] + 1) % self.wp_count[rooms[arrived]]
+        self.waypoint_index[idx] = wi
+
+        go = ~arrived
+        step = d[go] / dist[go, None] * self.speed[idx[go], None]
+        self.pos[idx[go]] += step * dt
+
+    def _try_move(self, idx, doors):
+        """Follow the route with transitions."""
+        idx = idx[self.route_len[idx] > 0]
+        if not len(idx):
+            return
+        hops = self._next_hops()
+
+        # detour around a closed door (see door block below)
+        goal = self.goal[idx]
+        detour = goal >= 0
+        if detour.any():
+            arrived = detour & (self.room[idx] == goal)
+            done = idx[arrived]
+            self.route_index[done] = self.goal_index[done]
+            self.goal[done] = -1
+
+            away = detour & ~arrived
+            w = idx[away]
+            if len(w):
+                hop = hops[self.room[w], goal[away]]
+                stuck = (hop < 0) | (hop == self.room[w])
+                # every way is shut: wait here like a blocked route
+                self.waypoint_index[w[stuck]] = 0
+                self._start_transition(w[~stuck], hop[~stuck])
+                idx = idx[~away]
+                if not len(idx):
+                    return
+
+        # sync with route
+        ri = self.route_index[idx]
+        lost = self.room[idx] != self.route[idx, ri]
+        if lost.any():
+            found = self.route_pos[idx, self.room[idx]]
+            ri = np.where(lost, np.where(found >= 0, found, 0), ri)
+            reset = lost & (found < 0)
+            self.room[idx[reset]] = self.route[idx[reset], 0]
+            self.route_index[idx] = ri
+
+        # next target
+        last = ri >= self.route_len[idx] - 1
+        nxt = np.where(last, self.route[idx, 0], self.route[idx, np.minimum(ri + 1, self.route.shape[1] - 1)])
+        cur = self.room[idx]
+
+        # office special case
+        office = (cur == self.hall) & (nxt == self.player_room)
+        office_open = not doors[self.hall, self.player_room] if self.hall >= 0 else True
+        if office_open:
+            enter = idx[office]
+            self._start_transition(enter, self.player_room)
+            self.state[enter] = ATTACK
+        else:
+            self.waypoint_index[idx[office]] = 0
+
+        # door block: go around it if the map allows, otherwise wait
+        rest = ~office
+        blocked = rest & doors[cur, nxt]
+        if blocked.any():
+            b = idx[blocked]
+            hop = hops[cur[blocked], nxt[blocked]]
+            around = (hop >= 0) & (hop != nxt[blocked])
+            r = b[around]
+            self.goal[r] = nxt[blocked][around]
+            self.goal_index[r] = (ri[blocked][around] + 1) % self.route_len[r]
+            self._start_transition(r, hop[around])
+            self.waypoint_index[b[~around]] = 0
+
+        # start transition
+        go = rest & ~blocked
+        g = idx[go]
+        self._start_transition(g, nxt[go])
+        self.route_index[g] = (ri[go] + 1) % self.route_len[g]
+
+    def _start_transition(self, idx, target):
+        if not len(idx):
+            return
+        self.transitioning[idx] = True
+        self.transition_target[idx] = target
+        self.transition_progress[idx] = 0
+        self.transition_duration[idx] = self._uniform(idx, 2.0, 6.0) / np.maximum(self.aggression[idx], 0.1)
+
+    def _finish_transition(self, idx, power, doors):
+        if not len(idx):
+            return
+        self.transitioning[idx] = False
+        self.room[idx] = self.transition_target[idx]
+        self.pos[idx] = self._choose_waypoint(idx, self.room[idx])
+
+        office_open = not doors[self.hall, self.player_room] if self.hall >= 0 else True
+        attack = (self.room[idx] == self.player_room) & (office_open or power <= 0)
+        self.state[idx[attack]] = ATTACK
+        self.attack_timer[idx[attack]] = 0.0
+        self.state[idx[~attack]] = PATROL
+
+    # ----------------------------------------------------
+
+    def jumpscares(self):
+        """Indices of animatronics that reached the office in jumpscare state."""
+        return np.flatnonzero((self.room == self.player_room) & (self.state == JUMPSCARE))
+
+    def rooms_of(self):
+        return [self.room_names[r] for r in self.room]
+
+
+# ----------------------------------------------------
+# Lockstep check + benchmark
+# ----------------------------------------------------
+
+def make_game(power=lambda: world.MAX_POWER, doors=None):
+    from animatronic import GameContext
+    from sprites import SpriteAtlas
+    doors = doors if doors is not None else world.make_doors()
+    return GameContext(
+        rooms=world.make_rooms(),
+        room_connections=world.ROOM_CONNECTIONS,
+        camera_order=list(world.ROOM_WAYPOINTS),
+        anim_img=None,
+        player_room=world.PLAYER_ROOM,
+        door_checker=doors.is_closed,
+        get_power=power,
+        sprites=SpriteAtlas(),
+        doors=doors,
+    ), doors
+
+
+def make_animatronics(game, count, seed=0):
+    from animatronic import Animatronic, ANIMATRONIC_PATHS
+    game.rng.seed(seed)
+    names = sorted(ANIMATRONIC_PATHS)
+    crowd = []
+    for i in range(count):
+        name = names[i % len(names)]
+        route = ANIMATRONIC_PATHS[name]
+        a = Animatronic(f"{name}{i}", route[0], game, route=route)
+        a.speed = game.rng.uniform(45, 70)
+        crowd.append(a)
+    return crowd
+
+
+class _ReplayRandom:
+    """Stands in for game.rng during the check."""
+    def __init__(self):
+        self.queues = {}
+        self.current = None
+
+    def push(self, entity, u):
+        self.queues.setdefault(entity, []).append(u)
+
+    def _next(self):
+        return self.queues[self.current].pop(0)
+
+    def uniform(self, low, high):
+        return low + (high - low) * self._next()
+
+    def choice(self, seq):
+        return seq[int(self._next() * len(seq))]
+
+
+DETOUR_DOORS = (("Hall", "Office", 7.0), ("Hall", "Backroom", 5.0))   # Backroom -> HallCorner -> Hall
+
+
+def lockstep_check(count=20, ticks=120 * 120, seed=1, toggles=(("Hall", "Office", 7.0),)):
+    """
+    Run Animatronic objects and the engine side by side; the engine's random
+    draws are replayed into the objects, so every state transition must match.
+    `toggles` are (room_a, room_b, period) doors flipped every period seconds;
+    extra doors are added to the map. Returns (ticks compared, detours started).
+    """
+    from simclock import SIM_STEP
+    doors = world.make_doors()
+    for room_a, room_b, _ in toggles:
+        if doors.get(room_a, room_b) is None:
+            doors.add(room_a, room_b)
+    game, doors = make_game(doors=doors)
+    objects = make_animatronics(game, count, seed)
+    engine = CrowdEngine.from_animatronics(game, objects, seed=seed)
+    replay = _ReplayRandom()
+    engine.recorder = replay.push
+    game.rng = replay   # the objects draw exactly what the engine drew
+
+    detours = 0
+    with GAME_LOG.muted("ai"):
+        door_ticks = [(room_a, room_b, int(period / SIM_STEP)) for room_a, room_b, period in toggles]
+        for tick in range(ticks):
+            for room_a, room_b, every in door_ticks:
+                if tick % every == 0:
+                    doors.toggle(room_a, room_b)
+            had_goal = engine.goal >= 0
+            engine.update(SIM_STEP)
+            detours += int(np.count_nonzero((engine.goal >= 0) & ~had_goal))
+            for i, a in enumerate(objects):
+                replay.current = i
+                a.update(SIM_STEP)
+            for i, a in enumerate(objects):
+                ok = (a.room == engine.room[i]
+                      and a.state == STATE_NAMES[engine.state[i]]
+                      and a.transitioning == engine.transitioning[i]
+                      and a.waypoint_index == engine.waypoint_index[i]
+                      and abs(a.pos[0] - engine.pos[i, 0]) < 1e-6
+                      and abs(a.pos[1] - engine.pos[i, 1]) < 1e-6)
+                if not ok:
+                    raise AssertionError(f"tick {tick}: {a.name} diverged "
+                                         f"({a.current_room}/{a.state} vs "
+                                         f"{engine.room_names[engine.room[i]]}/{STATE_NAMES[engine.state[i]]})")
+                if a.goal != engine.goal[i]:
+                    raise AssertionError(f"tick {tick}: {a.name} detours to {a.goal}, engine to {engine.goal[i]}")
+    return ticks, detours
+
+
+def benchmark(counts=(2, 10, 50, 100, 500), ticks=600):
+    """Per-tick cost of the object path vs. the array engine as N grows."""
+    from simclock import SIM_STEP
+    with GAME_LOG.muted("ai"):
+        results = []
+        for n in counts:
+            game, _ = make_game()
+            objects = make_animatronics(game, n)
+            engine = CrowdEngine.from_animatronics(game, objects, seed=0)
+
+            t = time.perf_counter()
+            for _ in range(ticks):
+                for a in objects:
+                    a.update(SIM_STEP)
+            obj_us = (time.perf_counter() - t) / ticks * 1e6
+
+            t = time.perf_counter()
+            for _ in range(ticks):
+                engine.update(SIM_STEP)
+            arr_us = (time.perf_counter() - t) / ticks * 1e6
+            results.append((n, obj_us, arr_us))
+    for n, obj_us, arr_us in results:
+        print(f"N={n:4d}  objects {obj_us:9.1f} us/tick   arrays {arr_us:9.1f} us/tick   x{obj_us / arr_us:5.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    ticks, _ = lockstep_check()
+    print(f"[OK] {ticks} ticks in lockstep with Animatronic")
+    ticks, detours = lockstep_check(toggles=DETOUR_DOORS)
+    if not detours:
+        raise AssertionError("second door never caused a detour")
+    print(f"[OK] {ticks} ticks in lockstep with a second door ({detours} detours)")
+    benchmark()
+    sys.exit(0)
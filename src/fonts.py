@@ -0,0 +1,191 @@
+"""
+Font- und Text-Cache.
+Lädt jede (Schrift, Größe) nur einmal, hält gerenderte Texte in einem LRU-Cache
+und setzt dynamische Zahlen (Timer, Power) aus einem Glyph-Atlas zusammen.
+"""
+import os
+import pygame
+from collections import OrderedDict
+
+PIXEL_FONT = "../assets/fonts/pixel_font.ttf"
+
+TEXT_CACHE_SIZE = 256
+DIGITS = "0123456789"
+
+
+class FontRegistry:
+    """Loads every (face, size) pair exactly once."""
+    def __init__(self):
+        self._fonts = {}
+        self.loads = 0
+        self.hits = 0
+
+    def get(self, face, size):
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        # Dateipfade über Font(), alles andere als Systemschrift
+        if os.path.splitext(face)[1].lower() in (".ttf", ".otf"):
+            font = pygame.font.Font(face, size)
+        else:
+            font = pygame.font.SysFont(face, size)
+        self.loads += 1
+        self._fonts[key] = font
+        return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color, antialias)."""
+    def __init__(self, registry, capacity=TEXT_CACHE_SIZE):
+        self.registry = registry
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, face, size, text, color, antialias=True):
+        key = (face, size, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self.registry.get(face, size).render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+class GlyphAtlas:
+    """Pre-rendered single characters of one font/color, digits share one cell width."""
+    def __init__(self, font, color, antialias=True):
+        self.font = font
+        self.color = tuple(color)
+        self.antialias = antialias
+        self.height = font.get_height()
+        self._glyphs = {}
+        for ch in DIGITS:
+            self._glyphs[ch] = font.render(ch, antialias, color)
+        # Tabellenziffern: jede Ziffer bekommt dieselbe Breite, damit sich
+        # beim Hochzählen nichts verschiebt
+        self.digit_width = max(g.get_width() for g in self._glyphs.values())
+
+    def glyph(self, ch):
+        g = self._glyphs.get(ch)
+        if g is None:
+            g = self.font.render(ch, self.antialias, self.color)
+            self._glyphs[ch] = g
+        return g
+
+    def advance(self, ch):
+        return self.digit_width if ch in DIGITS else self.glyph(ch).get_width()
+
+
+class DynamicLabel:
+    """
+    Retained text line built from a GlyphAtlas.
+    Only characters that differ from the previous text are re-blitted.
+    """
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.text = None
+        self.surface = None
+        self._offsets = []
+        self.glyph_blits = 0
+
+    def _rebuild(self, text):
+        width = sum(self.atlas.advance(ch) for ch in text)
+        self.surface = pygame.Surface((max(width, 1), self.atlas.height), pygame.SRCALPHA)
+        self._offsets = []
+        x = 0
+        for ch in text:
+            self._offsets.append(x)
+            self._blit_cell(ch, x)
+            x += self.atlas.advance(ch)
+
+    def _blit_cell(self, ch, x):
+        g = self.atlas.glyph(ch)
+        # Ziffern innerhalb ihrer Zelle zentrieren
+        if ch in DIGITS:
+            x += (self.atlas.digit_width - g.get_width()) // 2
+        self.surface.blit(g, (x, 0))
+        self.glyph_blits += 1
+
+    def set_text(self, text):
+        if text == self.text:
+            return self.surface
+
+        old = self.text
+        if old is None or len(old) != len(text):
+            self._rebuild(text)
+        else:
+            changed = [i for i, (a, b) in enumerate(zip(old, text)) if a != b]
+            if all(old[i] in DIGITS and text[i] in DIGITS for i in changed):
+                w = self.atlas.digit_width
+                for i in changed:
+                    x = self._offsets[i]
+                    self.surface.fill((0, 0, 0, 0), (x, 0, w, self.atlas.height))
+                    self._blit_cell(text[i], x)
+            else:
+                self._rebuild(text)
+
+        self.text = text
+        return self.surface
+
+
+FONTS = FontRegistry()
+TEXT = TextCache(FONTS)
+_atlases = {}
+_labels = {}
+
+
+def get_font(face, size):
+    return FONTS.get(face, size)
+
+
+def render_text(face, size, text, color, antialias=True):
+    """Gecachte Variante von font.render()."""
+    return TEXT.render(face, size, text, color, antialias)
+
+
+def get_atlas(face, size, color, antialias=True):
+    key = (face, size, tuple(color), antialias)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = GlyphAtlas(FONTS.get(face, size), color, antialias)
+        _atlases[key] = atlas
+    return atlas
+
+
+def dynamic_text(name, face, size, text, color, antialias=True):
+    """Liefert die Fläche einer benannten, sich oft ändernden Textzeile (z.B. Timer)."""
+    key = (name, face, size, tuple(color), antialias)
+    label = _labels.get(key)
+    if label is None:
+        label = DynamicLabel(get_atlas(face, size, color, antialias))
+        _labels[key] = label
+    return label.set_text(text)
+
+
+def cache_stats():
+    """Hit/miss counters; font_loads must stay constant once the frame loop is warm."""
+    return {
+        "font_loads": FONTS.loads,
+        "font_hits": FONTS.hits,
+        "text_hits": TEXT.hits,
+        "text_misses": TEXT.misses,
+        "text_evictions": TEXT.evictions,
+        "text_cached": len(TEXT._surfaces),
+        "glyph_blits": sum(l.glyph_blits for l in _labels.values()),
+    }
@@ -0,0 +1,206 @@
+"""
+Buffered, leveled game log.
+Callers never touch stdout or a file: a record (time, level, category,
+message template, args) is appended to an in-memory ring buffer and a
+background thread formats and writes it to the log file and, from
+`echo_level` up, to the console. A disabled level costs one call to a no-op;
+the template is only formatted when a record is written or dumped, so pass
+plain values (names, numbers), not objects that change afterwards.
+
+    LOG = get_logger("ai")
+    LOG.debug("%s starts moving %s -> %s", name, a, b)
+
+    GAME_LOG.start("../logs/game.log")      # writer thread, flushed at exit
+    GAME_LOG.dump(50, category="ai")        # last 50 AI events
+"""
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+
+DEBUG, INFO, WARN, ERROR, OFF = 10, 20, 30, 40, 100
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERROR", OFF: "OFF"}
+LEVELS = {name.lower(): level for level, name in LEVEL_NAMES.items()}
+
+RING_SIZE = 4096         # records kept for dumps
+PENDING_SIZE = 16384     # records waiting for the writer (oldest dropped if it falls behind)
+FLUSH_INTERVAL = 0.5     # seconds between background writes
+
+
+def _noop(*args):
+    pass
+
+
+def parse_level(value):
+    """'debug' / 'INFO' / 20 -> level number."""
+    if isinstance(value, int):
+        return value
+    try:
+        return LEVELS[value.lower()]
+    except KeyError:
+        raise ValueError(f"unknown log level {value!r} (one of {', '.join(LEVELS)})") from None
+
+
+def format_record(record, timestamp=True):
+    t, level, category, msg, args = record
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args!r}"
+    line = f"[{LEVEL_NAMES[level]}] {category}: {msg}"
+    return f"{t:10.3f} {line}" if timestamp else line
+
+
+class Channel:
+    """Logger for one category; debug/info/warn/error are no-ops below its level."""
+    __slots__ = ("category", "level", "_log", "debug", "info", "warn", "error")
+
+    def __init__(self, log, category, level):
+        self._log = log
+        self.category = category
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = level
+        emit = self._log.emit
+        for name, method_level in (("debug", DEBUG), ("info", INFO), ("warn", WARN), ("error", ERROR)):
+            setattr(self, name, partial(emit, method_level, self.category) if method_level >= level else _noop)
+
+    def enabled(self, level):
+        """For callers that would have to build expensive arguments."""
+        return level >= self.level
+
+
+class GameLog:
+    def __init__(self, level=INFO, echo_level=INFO, ring_size=RING_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.level = level
+        self.echo_level = echo_level
+        self.flush_interval = flush_interval
+        self.path = None
+        self.dropped = 0
+        self._levels = {}        # category -> level overriding self.level
+        self._channels = {}
+        self._ring = deque(maxlen=ring_size)
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._file = None
+        self._thread = None
+        self._start = time.perf_counter()
+
+    # --- configuration ---
+    def channel(self, category):
+        chan = self._channels.get(category)
+        if chan is None:
+            chan = self._channels[category] = Channel(self, category, self._levels.get(category, self.level))
+        return chan
+
+    def set_level(self, level, category=None):
+        """Level for one category, or the default for every category without its own."""
+        level = parse_level(level)
+        if category is None:
+            self.level = level
+        else:
+            self._levels[category] = level
+        self._apply_levels()
+
+    def _apply_levels(self):
+        for name, chan in self._channels.items():
+            chan.set_level(self._levels.get(name, self.level))
+
+    @contextmanager
+    def muted(self, category):
+        """`category` is OFF inside the with-block (batch runs), then back to its previous level."""
+        previous = self._levels.get(category)
+        self.set_level(OFF, category)
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._levels[category]
+                self._apply_levels()
+            else:
+                self.set_level(previous, category)
+
+    # --- recording (game thread) ---
+    def emit(self, level, category, msg, *args):
+        record = (time.perf_counter() - self._start, level, category, msg, args)
+        with self._lock:
+            self._ring.append(record)
+            if self._thread is not None:
+                if len(self._pending) >= PENDING_SIZE:
+                    self._pending.popleft()
+                    self.dropped += 1
+                self._pending.append(record)
+        if level >= ERROR:
+            self._wake.set()
+
+    def recent(self, n=None, category=None, min_level=DEBUG):
+        """Last n records (oldest first), optionally of one category."""
+        with self._lock:
+            records = [r for r in self._ring
+                       if r[1] >= min_level and (category is None or r[2] == category)]
+        return records[-n:] if n else records
+
+    def dump(self, n=None, category=None, path=None):
+        """Writes the last n records to `path` (or stdout); returns the number written."""
+        lines = [format_record(r) for r in self.recent(n, category)]
+        if path is None:
+            sys.stdout.write("".join(line + "\n" for line in lines))
+            sys.stdout.flush()
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in lines)
+        return len(lines)
+
+    # --- writing (background thread) ---
+    def start(self, path=None):
+        """Starts the writer thread; records from now on go to `path` and the console."""
+        if self._thread is not None:
+            return
+        self.path = path
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+        with self._lock:
+            # what was logged before start (loading) is written too
+            self._pending.extend(self._ring)
+            self._thread = threading.Thread(target=self._run, name="gamelog", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Writes everything pending now (also called at exit)."""
+        with self._lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = deque()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.writelines(format_record(r) + "\n" for r in batch)
+                self._file.flush()
+            echo = [format_record(r, timestamp=False) + "\n" for r in batch if r[1] >= self.echo_level]
+            if echo:
+                sys.stdout.write("".join(echo))
+                sys.stdout.flush()
+
+
+GAME_LOG = GameLog()
+
+
+def get_logger(category):
+    return GAME_LOG.channel(category)
@@ -0,0 +1,74 @@
+"""
+Räumlicher Index für klickbare UI-Flächen (virtuelle 1920x1080-Koordinaten).
+Widgets werden einmal mit Schlüssel, Rechteck und Gruppe registriert; jedes
+Rechteck landet in allen Gitterzellen, die es berührt. Eine Abfrage schaut
+nur in die eine Zelle unter dem Punkt, egal wie viele Buttons es gibt.
+Gruppen (z.B. "map0", "map1", "menu") trennen Ebenen und Bildschirme:
+gesucht wird nur in den Gruppen, die gerade sichtbar sind.
+"""
+import pygame
+
+HIT_CELL = 128   # Kantenlänge einer Gitterzelle in virtuellen Pixeln
+
+
+class HitIndex:
+    """Uniform grid of widget rects; later registrations win where rects overlap."""
+    def __init__(self, cell=HIT_CELL):
+        self.cell = cell
+        self._cells = {}     # (cx, cy) -> [key, ...]
+        self._widgets = {}   # key -> (rect, group, order)
+        self._order = 0
+
+    def _span(self, rect):
+        c = self.cell
+        for cx in range(rect.left // c, (rect.right - 1) // c + 1):
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                yield cx, cy
+
+    def add(self, key, rect, group=None):
+        """Registers (or moves) widget `key`; returns its rect."""
+        if key in self._widgets:
+            self.remove(key)
+        rect = pygame.Rect(rect)
+        self._widgets[key] = (rect, group, self._order)
+        self._order += 1
+        for cell in self._span(rect):
+            self._cells.setdefault(cell, []).append(key)
+        return rect
+
+    def remove(self, key):
+        entry = self._widgets.pop(key, None)
+        if entry is None:
+            return
+        for cell in self._span(entry[0]):
+            keys = self._cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self._cells[cell]
+
+    def clear(self, group=None):
+        """Drops every widget, or only those of `group`."""
+        for key in [k for k, (_, g, _) in self._widgets.items() if group is None or g == group]:
+            self.remove(key)
+
+    def rect(self, key):
+        return self._widgets[key][0]
+
+    def keys(self, group=None):
+        """Keys of `group` in registration order."""
+        return [k for k, (_, g, _) in self._widgets.items() if group is None or g == group]
+
+    def hit(self, x, y, groups=None):
+        """Topmost widget key at (x, y), or None; `groups` is one group name or a collection."""
+        if isinstance(groups, str):
+            groups = (groups,)
+        best = None
+        best_order = -1
+        for key in self._cells.get((x // self.cell, y // self.cell), ()):
+            rect, group, order = self._widgets[key]
+            if order > best_order and (groups is None or group in groups) and rect.collidepoint(x, y):
+                best, best_order = key, order
+        return best
+
+    def __len__(self):
+        return len(self._widgets)
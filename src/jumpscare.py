@@ -0,0 +1,189 @@
+"""
+Vorgebackene Jumpscare-Videos.
+Ein Bake-Schritt dekodiert das mp4 einmal, entfernt den Greenscreen und
+schreibt alle Frames als rohes RGBA/BGRA (Zielauflösung, Byte-Reihenfolge
+des Displays) plus fertigem PCM-Audio
+in einen Cache. Beim Abspielen wird die Datei nur noch per mmap eingeblendet.
+
+    python jumpscare.py [--force]     # alle Clips in assets/jumpscares backen
+"""
+import os
+import sys
+import json
+import mmap
+import pygame
+from chroma import ChromaKeyer
+from gamelog import get_logger
+
+JUMPSCARE_DIR = "../assets/jumpscares"
+CACHE_DIR = "../assets/jumpscares/cache"
+BAKE_FPS = 30
+BAKE_VERSION = 3   # bump when the baked pixels change (3: resized before keying, not after)
+
+LOG = get_logger("assets")
+
+
+def _cache_paths(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    base = os.path.join(CACHE_DIR, name)
+    return base + ".json", base + ".rgba", base + ".pcm"
+
+
+def _mixer_format():
+    init = pygame.mixer.get_init()
+    if not init:
+        return None
+    freq, fmt, channels = init
+    return [freq, fmt, channels]
+
+
+def _native_order():
+    """Byte order the display blits fastest (BGRA on fast little-endian desktops)."""
+    display = pygame.display.get_surface()
+    if display is not None and display.get_masks()[0] == 0xFF:
+        return "RGBA"
+    return "BGRA"
+
+
+def is_stale(path, size, fps=BAKE_FPS):
+    """True if the baked cache is missing or does not match the source mp4."""
+    meta_path, frames_path, audio_path = _cache_paths(path)
+    if not (os.path.exists(meta_path) and os.path.exists(frames_path)):
+        return True
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return True
+    return (
+        meta.get("version") != BAKE_VERSION
+        or meta.get("source_mtime") != os.path.getmtime(path)
+        or tuple(meta.get("size", ())) != tuple(size)
+        or meta.get("fps") != fps
+        or meta.get("pixel_order") != _native_order()
+        or (meta.get("audio") and meta.get("mixer") != _mixer_format())
+        or os.path.getsize(frames_path) != meta["frames"] * size[0] * size[1] * 4
+    )
+
+
+def bake_jumpscare(path, size, fps=BAKE_FPS):
+    """Decode, key and resize every frame once and write the cache files."""
+    from moviepy.editor import VideoFileClip
+    from PIL import Image
+    import numpy as np
+
+    # --- Compatibility patch for Pillow >= 10 (moviepy resize) ---
+    if not hasattr(Image, "ANTIALIAS"):
+        Image.ANTIALIAS = Image.LANCZOS
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta_path, frames_path, audio_path = _cache_paths(path)
+    source_mtime = os.path.getmtime(path)
+
+    clip = VideoFileClip(path, audio=True)
+    resized = clip.resize(tuple(size))
+
+    # Keyer schreibt direkt in der Byte-Reihenfolge des Displays
+    order = _native_order()
+    keyer = ChromaKeyer(size[0], size[1], order=order)
+    frames = 0
+    tmp_frames = frames_path + ".tmp"
+    with open(tmp_frames, "wb") as out:
+        for frame in resized.iter_frames(fps=fps, dtype="uint8"):
+            out.write(keyer.key(frame[..., :3]).data)
+            frames += 1
+    keyer.close()
+    os.replace(tmp_frames, frames_path)
+
+    # --- Audio direkt im Mixer-Format ablegen (Sound(buffer=...) ohne Dekodieren) ---
+    mixer = _mixer_format()
+    has_audio = clip.audio is not None and mixer is not None
+    if has_audio:
+        freq, fmt, channels = mixer
+        samples = np.vstack(list(clip.audio.iter_chunks(fps=freq, quantize=True,
+                                                        nbytes=abs(fmt) // 8, chunksize=50000)))
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if samples.shape[1] != channels:
+            samples = (samples.mean(axis=1, keepdims=True).astype(samples.dtype)
+                       if channels == 1 else np.repeat(samples[:, :1], channels, axis=1))
+        with open(audio_path, "wb") as out:
+            out.write(np.ascontiguousarray(samples).tobytes())
+    clip.close()
+
+    meta = {
+        "version": BAKE_VERSION,
+        "source": os.path.basename(path),
+        "source_mtime": source_mtime,
+        "size": list(size),
+        "fps": fps,
+        "pixel_order": order,
+        "frames": frames,
+        "audio": has_audio,
+        "mixer": mixer,
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    LOG.info("Baked jumpscare %s: %d frames @ %dx%d", path, frames, size[0], size[1])
+    return meta
+
+
+class BakedJumpscare:
+    """Memory-mapped, pre-keyed jumpscare clip. Frames are wrapped, never decoded."""
+    def __init__(self, path, size, fps=BAKE_FPS):
+        meta_path, frames_path, audio_path = _cache_paths(path)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.size = tuple(self.meta["size"])
+        self.fps = self.meta["fps"]
+        self.frame_count = self.meta["frames"]
+        self.pixel_order = self.meta["pixel_order"]
+        self.frame_bytes = self.size[0] * self.size[1] * 4
+
+        self._file = open(frames_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        self.sound = None
+        if self.meta.get("audio") and os.path.exists(audio_path):
+            with open(audio_path, "rb") as f:
+                self.sound = pygame.mixer.Sound(buffer=f.read())
+
+    def frame(self, index):
+        """Alpha surface that points straight into the mapped file."""
+        start = index * self.frame_bytes
+        return pygame.image.frombuffer(self._view[start:start + self.frame_bytes], self.size, self.pixel_order)
+
+    def frames(self):
+        for i in range(self.frame_count):
+            yield self.frame(i)
+
+    def close(self):
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # noch lebende Frame-Surfaces halten den Puffer, GC räumt später auf
+            pass
+        self._file.close()
+
+
+def load_jumpscare(path, size, fps=BAKE_FPS):
+    """Bake if the cache is missing or the mp4 changed, then map the result."""
+    if is_stale(path, size, fps):
+        bake_jumpscare(path, size, fps)
+    return BakedJumpscare(path, size, fps)
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.mixer.init()
+    force = "--force" in sys.argv
+    for fname in sorted(os.listdir(JUMPSCARE_DIR)):
+        if fname.lower().endswith(".mp4"):
+            src = os.path.join(JUMPSCARE_DIR, fname)
+            if force or is_stale(src, (1920, 1080)):
+                meta = bake_jumpscare(src, (1920, 1080))
+                print(f"[INFO] Baked jumpscare {src}: {meta['frames']} frames @ 1920x1080")
+            else:
+                print(f"[OK] {src} is up to date")
@@ -0,0 +1,85 @@
+"""
+Paralleles Laden von Assets.
+Bilder und Sounds werden auf einem Thread-Pool dekodiert. Fertige Ergebnisse
+landen in einer Queue und werden ausschließlich vom Haupt-Thread übernommen
+(pump()), dort laufen auch convert()/convert_alpha().
+"""
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from gamelog import get_logger
+
+LOG = get_logger("assets")
+
+
+class AssetLoader:
+    """Decodes assets on worker threads, publishes them on the main thread."""
+    def __init__(self, workers=4):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self._finished = queue.Queue()
+        self._jobs = {}        # name -> (group, finalize)
+        self.assets = {}       # name -> published result (main thread only)
+        self.timings = {}      # name -> (group, load_ms, finalize_ms)
+        self.errors = {}
+        self.started = time.perf_counter()
+        self.wall_ms = None
+
+    def submit(self, name, group, fn, *args, finalize=None):
+        """Queue fn(*args) on the pool; finalize(result) later runs on the main thread."""
+        self._jobs[name] = (group, finalize)
+        self._pool.submit(self._run, name, fn, args)
+
+    def _run(self, name, fn, args):
+        start = time.perf_counter()
+        try:
+            result, error = fn(*args), None
+        except Exception as e:
+            result, error = None, e
+        self._finished.put((name, result, error, (time.perf_counter() - start) * 1000.0))
+
+    def pump(self):
+        """Publishes every finished job. Main thread only. Returns how many were published."""
+        published = 0
+        while True:
+            try:
+                name, result, error, load_ms = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            group, finalize = self._jobs[name]
+            start = time.perf_counter()
+            if error is None and finalize is not None:
+                try:
+                    result = finalize(result)
+                except Exception as e:
+                    error = e
+            if error is not None:
+                LOG.error("Could not load %s: %s", name, error)
+                self.errors[name] = error
+                result = None
+            self.assets[name] = result
+            self.timings[name] = (group, load_ms, (time.perf_counter() - start) * 1000.0)
+            published += 1
+
+        if self.wall_ms is None and len(self.assets) == len(self._jobs):
+            self.wall_ms = (time.perf_counter() - self.started) * 1000.0
+        return published
+
+    def progress(self, group=None):
+        names = [n for n, (g, _) in self._jobs.items() if group is None or g == group]
+        return sum(1 for n in names if n in self.assets), len(names)
+
+    def done(self, group=None):
+        loaded, total = self.progress(group)
+        return loaded == total
+
+    def get(self, name, default=None):
+        return self.assets.get(name, default)
+
+    def report(self):
+        """Per-asset load times, slowest first."""
+        lines = [f"[INFO] Asset load report: {len(self.assets)} assets, "
+                 f"{(self.wall_ms or 0.0):.0f} ms wall time"]
+        for name, (group, load_ms, finalize_ms) in sorted(
+                self.timings.items(), key=lambda item: -(item[1][1] + item[1][2])):
+            lines.append(f"    {load_ms:8.1f} ms  + {finalize_ms:6.1f} ms main  [{group}] {name}")
+        return "\n".join(lines)
@@ -1,29 +1,64 @@
 import pygame
 import sys
 import random
-from dataclasses import dataclass
-from typing import List, Tuple
 import os
-from moviepy.editor import VideoFileClip
-from PIL import Image
 from animatronic import Animatronic, ANIMATRONIC_PATHS, GameContext
-import time
-from render import present, window_to_virtual, apply_aspect, draw_ui, draw_camera_overlay, create_scanline_surface, draw_camera_hover_bar, draw_map_hover_bar
+from render import present, present_rects, set_present_quality, get_present_quality, PRESENT_SMOOTH, PRESENT_NEAREST, Viewport, apply_aspect, draw_ui, OVERLAYS, draw_camera_hover_bar, camera_hover_bar_state, draw_map_hover_bar
+from compositor import DirtyCompositor
+from jumpscare import load_jumpscare
+from assetpack import decode_image, finish_image
+from loader import AssetLoader
+from sprites import SpriteAtlas
+from static_noise import StaticNoise, generate_noise_frames
+from fonts import PIXEL_FONT, get_font, render_text
+from world import (NIGHT_LENGTH, ROOM_CONNECTIONS, MAX_POWER, PowerModel, make_rooms, make_doors,
+                   hour_label, OFFICE_SIDES)
+from simclock import FixedStepClock
+from scheduler import Scheduler
+from gamelog import GAME_LOG, DEBUG, get_logger, parse_level
+from profiler import FrameProfiler
+from soundbank import SoundBank, STREAM, SFX, AMBIENT
+from voices import VoicePool, RoomAcoustics, PRIORITY_UI, PRIORITY_JUMPSCARE
+from hitindex import HitIndex
+from widgets import Panel, Label, Button, Toggle
 
 
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-# --- Compatibility patch for Pillow >= 10 ---
-if not hasattr(Image, 'ANTIALIAS'):
-    Image.ANTIALIAS = Image.LANCZOS
+
+def cli_option(name, default=None):
+    """Value after `name` on the command line (`--log-level debug`), else default."""
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+# --- Logging: ring buffer + background writer, nothing on the frame path blocks on stdout ---
+LOG_PATH = cli_option("--log-file", "../logs/game.log")
+AI_DUMP_PATH = "../logs/ai_dump.log"
+AI_DUMP_COUNT = int(cli_option("--dump-ai", 0))  # >0: print the last N AI events after a death
+AI_DUMP_KEY = pygame.K_F9                         # writes the last AI events to AI_DUMP_PATH
+AI_LOG_LEVEL = cli_option("--ai-log-level")       # explicit level for the AI category only
+GAME_LOG.set_level(cli_option("--log-level", "info"))
+if AI_LOG_LEVEL is not None:
+    GAME_LOG.set_level(AI_LOG_LEVEL, "ai")
+elif AI_DUMP_COUNT > 0:
+    GAME_LOG.set_level(DEBUG, "ai")  # every AI event kept in the ring buffer for the dump
+GAME_LOG.echo_level = parse_level(cli_option("--echo-level", "info"))
+GAME_LOG.start(LOG_PATH)
+LOG = get_logger("game")
+LOG_ASSETS = get_logger("assets")
+LOG_AI = get_logger("ai")
+
+# --- Frame profiler: F3 toggles the overlay, --profile-csv streams every frame ---
+PROFILER = FrameProfiler(["idle", "events", "timers", "power", "ai", "logic",
+                          "camera", "office", "overlays", "profiler", "present"])
+PROFILER_KEY = pygame.K_F3
 
 frame_index = 0
 frame_timer = 0
 frame_delay = 0.08
 
-rainer_timer = 0
-rainer_alpha = 0
-
 local_static = []   # will be overridden after loading
 static_frames = []  # if used
 
@@ -31,26 +66,15 @@ in_menu = True
 in_controls_menu = False
 
 
-# Night clock setup
-night_start_time = time.time()
-night_length = 450  # 7 minutes 30 seconds
+# Night clock setup (driven by the fixed-step game clock in main())
 current_hour = "12 AM"
 
 
 # --- Camera Map Clickable Buttons ---
-CAM_MAP_RECTS = []   # list of (pygame.Rect, cam_name)
+UI_HITS = HitIndex()   # every clickable widget, registered once (virtual coordinates)
 MAP_UI_RECT = None   # button in camera UI that opens map
 
 
-hour_offsets = [
-    random.uniform(0, 5),  # 12→1 AM delay
-    random.uniform(0, 5),  # 1→2 AM
-    random.uniform(0, 5),  # ...
-    random.uniform(0, 5),
-    random.uniform(0, 5),
-    random.uniform(0, 5)
-]
-
 click_once = False
 
 
@@ -88,8 +112,15 @@ def compute_window_size(aspect: str) -> tuple[int, int]:
 # Tatsächliches Fenster (Anzeige)
 WINDOW_W, WINDOW_H = compute_window_size(ASPECT_MODE)
 WINDOW = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+VIEWPORT = Viewport(VIRTUAL_W, VIRTUAL_H, WINDOW)  # updated on VIDEORESIZE / set_aspect()
 pygame.display.set_caption("Fünf Nächte beim Drachen")
 
+def set_aspect(mode):
+    """Menü: Fenster im neuen Seitenverhältnis öffnen und den Viewport nachziehen."""
+    global WINDOW, ASPECT_MODE
+    ASPECT_MODE = mode
+    WINDOW = apply_aspect(mode, compute_window_size, VIEWPORT)
+
 # Offscreen-Renderziel in 1920x1080: DARAUF zeichnet das ganze Spiel!
 SCREEN = pygame.Surface((VIRTUAL_W, VIRTUAL_H)).convert()
    
@@ -102,7 +133,6 @@ FONT = pygame.font.SysFont("Arial", 20)
 
 # ----- Configuration -----
 ROOM_SIZE = (320, 240)  # size of each camera viewport for display thumbnails
-PLAYER_ROOM = "Office"  # the room that is the player's location
 
 
 # Load placeholder assets (replace these with your sprites)
@@ -120,13 +150,15 @@ JUMPSCARE_IMG.fill((255,0,0))
 JUMP_TEXT = FONT.render("JUMPSCARE!", True, (255,255,255))
 JUMPSCARE_IMG.blit(JUMP_TEXT, (WIDTH//2 - 60, HEIGHT//2 - 10))
 # --- Static animation state ---
-STATIC_FRAMES = []
+STATIC_NOISE = StaticNoise()  # source frames are published by the asset loader
 STATIC_FRAME_INDEX = 0
 STATIC_FRAME_TIMER = 0.0
 office_locked = False  # prevents others from entering after jumpscare starts
-REC_FONT = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
-rec_flash_timer = 0.0
-rec_visible = True
+REC_FONT = get_font(PIXEL_FONT, 28)
+rec_visible = True          # blinks via EVENTS (see main())
+camera_booting = False      # static "signal lost" right after a camera switch
+camera_switch_flicker = False
+_camera_boot_timer = None
 
 # --- Camera Map Button Positions (editable) ---
 # These are placeholders — you will adjust them after seeing the map in-game.
@@ -146,28 +178,32 @@ static_alpha = 0         # current opacity
 static_target_alpha = 0  # desired opacity (e.g. 100 when active)
 static_fade_speed = 300  # how fast the fade occurs (alpha per second)
 
-SCANLINE_OVERLAY = create_scanline_surface(WIDTH, HEIGHT)
-
 
 ANIM_IMG = pygame.Surface((48, 48))
 ANIM_IMG.fill((200, 50, 50))
+SPRITES = SpriteAtlas(fallback=ANIM_IMG)  # room poses, preloaded with the night assets
 
-# --- Office sprites ---
-OFFICE_BASE = pygame.image.load("../assets/rooms/Office/office_base.png").convert()
-OFFICE_BASE = pygame.transform.smoothscale(OFFICE_BASE, (1920, 1080))
+# --- Office sprites (published by the asset loader) ---
+OFFICE_BASE = None
+DOOR_CLOSED_IMG = None
 
-DOOR_CLOSED_IMG = pygame.image.load("../assets/rooms/Office/door_left_closed.png").convert_alpha()
-DOOR_CLOSED_IMG = pygame.transform.smoothscale(DOOR_CLOSED_IMG, (1920, 1080))
+# --- Dirty-rect areas of the office view (virtual coordinates) ---
+DOOR_CLOSED_RECT = None
+HUD_RECT = pygame.Rect(WIDTH - 300, 15, 300, 110)
+REC_RECT = pygame.Rect(40, 30, 110, 45)
+CLOCK_RECT = pygame.Rect(WIDTH // 2 - 150, 25, 300, 60)   # hour label, top centre (widest: "12 AM")
+HOVER_BAR_RECT = pygame.Rect(0, HEIGHT - 80, WIDTH, 80)
 
 
 # --- Load pre-rendered static animation ---
 def load_gif_frames(path):
-    """Load all frames from a GIF and return a list of Pygame surfaces with alpha."""
+    """Load all frames from a GIF and return a list of (unconverted) Pygame surfaces with alpha."""
+    from PIL import Image
     frames = []
     try:
         gif = Image.open(path)
     except Exception as e:
-        print(f"[ERROR] Cannot load GIF {path}: {e}")
+        LOG_ASSETS.error("Cannot load GIF %s: %s", path, e)
         return frames
 
     for frame_index in range(getattr(gif, "n_frames", 1)):
@@ -177,139 +213,186 @@ def load_gif_frames(path):
         mode = frame.mode
         size = frame.size
         data = frame.tobytes()
-        surface = pygame.image.fromstring(data, size, mode).convert_alpha()
-        frames.append(surface)
-    print(f"[INFO] Loaded {len(frames)} static frames with alpha.")
+        frames.append(pygame.image.fromstring(data, size, mode))
+    LOG_ASSETS.info("Loaded %d static frames with alpha.", len(frames))
     return frames
 
 
-# Optional: load sounds (place in assets/sounds)
-def safe_load_sound(path):
-    if not os.path.exists(path):
-        print(f"[WARNING] Sound file not found: {path}")
-        return None
-    try:
-        sound = pygame.mixer.Sound(path)
-        print(f"[OK] Loaded sound: {path}")
-        return sound
-    except Exception as e:
-        print(f"[ERROR] Could not load sound: {path} ({e})")
-        return None
+def load_static_frames(path):
+    """GIF static frames, or procedurally generated noise when the GIF is missing."""
+    frames = load_gif_frames(path)
+    if not frames:
+        frames = generate_noise_frames()
+        LOG_ASSETS.info("Generated %d procedural static frames.", len(frames))
+    return frames
 
-# Load sounds
-JUMPSCARE_SOUND = safe_load_sound("../assets/sounds/jumpscare.wav")
-BACKGROUND_LOOP = safe_load_sound("../assets/sounds/background_loop.wav")
-CAMERA_SWITCH_SOUND = safe_load_sound("../assets/sounds/cam_select.wav")
-DOOR_CLOSE_SOUND = safe_load_sound("../assets/sounds/door_close.wav")
-DOOR_OPEN_SOUND = safe_load_sound("../assets/sounds/door_open.wav")
-MAP_OPEN_SOUND = safe_load_sound("../assets/sounds/map_open.wav")
-MAP_CLOSE_SOUND = safe_load_sound("../assets/sounds/map_open.wav")
-CAM_OPEN_SOUND = safe_load_sound("../assets/sounds/cam_open.wav")
-CAM_CLOSE_SOUND = safe_load_sound("../assets/sounds/cam_close.wav")
 
+# Sounds: loops are streamed, effects decoded on first use (or warmed by the loader)
+SOUND_MANIFEST = {
+    "menu_theme":      ("../assets/sounds/menu_theme.wav", STREAM),
+    "background_loop": ("../assets/sounds/background_loop.wav", STREAM),
+    "jumpscare":       ("../assets/sounds/jumpscare.wav", SFX),
+    "cam_select":      ("../assets/sounds/cam_select.wav", SFX),
+    "door_close":      ("../assets/sounds/door_close.wav", SFX),
+    "door_open":       ("../assets/sounds/door_open.wav", SFX),
+    "map_open":        ("../assets/sounds/map_open.wav", SFX),
+    "map_close":       ("../assets/sounds/map_open.wav", SFX),   # same file, shared
+    "cam_open":        ("../assets/sounds/cam_open.wav", SFX),
+    "cam_close":       ("../assets/sounds/cam_close.wav", SFX),
+}
+for i in range(1, 10):
+    SOUND_MANIFEST[f"ambient/{i}"] = (f"../assets/sounds/schnaufer_winkler{i}.wav", AMBIENT)
+WARM_SOUNDS = ["cam_select", "door_close", "door_open"]  # played on input: decode before the night
+VOICES = VoicePool(16)   # every sound effect gets its channel here (acoustics set once the rooms exist)
+SOUNDS = SoundBank(SOUND_MANIFEST, budget=int(float(cli_option("--sound-budget", 6)) * 1024 * 1024),
+                   voices=VOICES)
+BACKGROUND_LOOP = None
 
 
-CAM_OPEN_CHANNEL = pygame.mixer.Channel(7)   # pick any free channel
 
 # Jumpscare video
 RAINER_JUMPSCARE_VIDEO_PATH = "../assets/jumpscares/rainer_jumpscare.mp4"
 
 
-# --- Ambient sounds ---
+# --- Ambient sounds (names in SOUNDS, decoded shortly before they play) ---
 AMBIENT_SOUNDS = []
-for i in range(1, 10):  # assuming ambient1.wav ... ambient9.wav
-    path = f"../assets/sounds/schnaufer_winkler{i}.wav"
-    sound = safe_load_sound(path)
-    if sound:
-        AMBIENT_SOUNDS.append(sound)
-
-if AMBIENT_SOUNDS:
-    print(f"[INFO] Loaded {len(AMBIENT_SOUNDS)} ambient sound(s).")
-
 
-STATIC_FRAMES = load_gif_frames("../assets/effects/static.gif")
 STATIC_FRAME_INDEX = 0
 STATIC_FRAME_TIMER = 0.0
 
-# ----- Map / Rooms / Waypoints -----
-@dataclass
-class Room:
-    name: str
-    view_surface: pygame.Surface
-    waypoints: List[Tuple[int, int]]  # coordinates local to room
-
-
-def load_room_image(path, size=(320, 240)):
-    """Safely load a PNG or return a placeholder if missing."""
+def decode_room_image(path, size=(320, 240)):
+    """Worker part of the room image load; None if the file is missing or broken."""
     if not os.path.exists(path):
-        print(f"[WARN] Missing room image: {path}")
-        return load_placeholder_surface(os.path.basename(path), size)
+        LOG_ASSETS.warn("Missing room image: %s", path)
+        return None
     try:
-        img = pygame.image.load(path).convert()
-        return pygame.transform.smoothscale(img, size)
+        return decode_image(path, size, alpha=False)
     except Exception as e:
-        print(f"[ERROR] Could not load {path}: {e}")
-        return load_placeholder_surface("Error", size)
+        LOG_ASSETS.error("Could not load %s: %s", path, e)
+        return None
+
 
-MAP_TOP = pygame.image.load("../assets/ui/map_top.png").convert_alpha()
-MAP_BOTTOM = pygame.image.load("../assets/ui/map_bottom.png").convert_alpha()
+def finish_room_image(decoded, path, size=(320, 240)):
+    """Convert the decoded room image or return a placeholder if missing."""
+    if decoded is None:
+        return load_placeholder_surface(os.path.basename(path), size)
+    return finish_image(decoded)
 
-# scale to tablet size (same as camera screen)
-MAP_TOP = pygame.transform.scale(MAP_TOP, (1280, 720))
-MAP_BOTTOM = pygame.transform.scale(MAP_BOTTOM, (1280, 720))
+# scaled to tablet size (same as camera screen), published by the asset loader
+MAP_TOP = None
+MAP_BOTTOM = None
 
 
 # ----- Room Definitions -----
-ROOMS = {
-    "Stage": Room(
-        "Stage",
-        load_room_image("../assets/rooms/stage.png", (320, 240)),
-        waypoints=[(160, 30), (160, 210)]
-    ),
-    "Hall": Room(
-        "Hall",
-        load_room_image("../assets/rooms/hall.png", (320, 240)),
-        waypoints=[(50, 50), (250, 180)]
-    ),
-    "Kitchen": Room(
-        "Kitchen",
-        load_room_image("../assets/rooms/kitchen.png", (320, 240)),
-        waypoints=[(30, 30), (280, 200)]
-    ),
-    "HallCorner": Room(
-        "HallCorner",
-        load_room_image("../assets/rooms/hallcorner.png", (320, 240)),
-        waypoints=[(60, 60), (260, 180)]
-    ),
-    "Backroom": Room(
-        "Backroom",
-        load_room_image("../assets/rooms/backroom.png", (320, 240)),
-        waypoints=[(100, 100), (220, 160)]
-    ),
-    "Office": Room(
-        "Office",
-        load_room_image("../assets/rooms/office.png", (320, 240)),
-        waypoints=[(0, 0)]
-    ),
-}
-ROOM_CONNECTIONS = {
-    "Stage": ["Hall"],
-    "Hall": ["Stage", "Backroom", "HallCorner"],
-    "Kitchen": ["Backroom"],
-    "HallCorner": ["Hall", "Office"],
-    "Backroom": ["Hall", "HallCorner"],
-    "Office": ["Hall", "HallCorner"]
+ROOMS = make_rooms()
+ROOM_IMAGES = {
+    "Stage":      "../assets/rooms/stage.png",
+    "Hall":       "../assets/rooms/hall.png",
+    "Kitchen":    "../assets/rooms/kitchen.png",
+    "HallCorner": "../assets/rooms/hallcorner.png",
+    "Backroom":   "../assets/rooms/backroom.png",
+    "Office":     "../assets/rooms/office.png",
 }
 
 
 
+# ----- Background asset loading -----
+# Everything is decoded on worker threads; "menu" assets are awaited behind a
+# loading bar, "night" assets keep loading while the main menu is running.
+LOADER = AssetLoader()
+ASSETS_PUBLISHED = set()
+
+
+def _submit_image(name, group, path, size, alpha=True, smooth=True):
+    LOADER.submit(name, group, decode_image, path, size, alpha, smooth, finalize=finish_image)
+
+
+def submit_asset_jobs():
+    # menu
+    _submit_image("rainer_flash", "menu", "../assets/images/rainer_flash.png", (WIDTH, HEIGHT), smooth=False)
+    LOADER.submit("static_frames", "menu", load_static_frames, "../assets/effects/static.gif",
+                  finalize=lambda frames: [f.convert_alpha() if f.get_flags() & pygame.SRCALPHA else f.convert()
+                                           for f in frames])
+
+    # night
+    _submit_image("office_base", "night", "../assets/rooms/Office/office_base.png", (1920, 1080), alpha=False)
+    _submit_image("door_closed", "night", "../assets/rooms/Office/door_left_closed.png", (1920, 1080))
+    _submit_image("map_top", "night", "../assets/ui/map_top.png", (1280, 720), smooth=False)
+    _submit_image("map_bottom", "night", "../assets/ui/map_bottom.png", (1280, 720), smooth=False)
+    for room_name, path in ROOM_IMAGES.items():
+        LOADER.submit(f"room/{room_name}", "night", decode_room_image, path, (320, 240),
+                      finalize=lambda decoded, path=path: finish_room_image(decoded, path, (320, 240)))
+    for name in WARM_SOUNDS:
+        LOADER.submit(f"sound/{name}", "night", SOUNDS.load, name)
+    LOADER.submit("sprites", "night", SPRITES.decode_all, finalize=SPRITES.finish_all)
+    LOADER.submit("rainer_jumpscare", "night", load_jumpscare, RAINER_JUMPSCARE_VIDEO_PATH, (WIDTH, HEIGHT))
+
+
+def publish_assets(group):
+    """Copy the loaded handles of `group` into the module globals (main thread only)."""
+    global OFFICE_BASE, DOOR_CLOSED_IMG, DOOR_CLOSED_RECT, MAP_TOP, MAP_BOTTOM, AMBIENT_SOUNDS, BACKGROUND_LOOP
+    if group in ASSETS_PUBLISHED:
+        return
+    ASSETS_PUBLISHED.add(group)
+
+    if group == "menu":
+        STATIC_NOISE.set_source(LOADER.get("static_frames") or [])
+        return
+
+    OFFICE_BASE = LOADER.get("office_base")
+    DOOR_CLOSED_IMG = LOADER.get("door_closed")
+    DOOR_CLOSED_RECT = DOOR_CLOSED_IMG.get_bounding_rect()
+    MAP_TOP = LOADER.get("map_top")
+    MAP_BOTTOM = LOADER.get("map_bottom")
+    for room_name in ROOM_IMAGES:
+        ROOMS[room_name].view_surface = LOADER.get(f"room/{room_name}")
+    BACKGROUND_LOOP = SOUNDS.get("background_loop")
+    AMBIENT_SOUNDS = [name for name in SOUNDS.names(AMBIENT) if SOUNDS.exists(name)]
+    if AMBIENT_SOUNDS:
+        LOG_ASSETS.info("Found %d ambient sound(s).", len(AMBIENT_SOUNDS))
+
+
+def wait_for_assets(*groups):
+    """Shows a loading bar until every asset of `groups` is published."""
+    while not all(LOADER.done(g) for g in groups):
+        LOADER.pump()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+
+        loaded = total = 0
+        for g in groups:
+            d, t = LOADER.progress(g)
+            loaded, total = loaded + d, total + t
+
+        SCREEN.fill((0, 0, 0))
+        label = render_text(PIXEL_FONT, 32, "LOADING", (220, 220, 220))
+        SCREEN.blit(label, (WIDTH // 2 - label.get_width() // 2, HEIGHT // 2 - 80))
+        bar = pygame.Rect(WIDTH // 2 - 300, HEIGHT // 2, 600, 24)
+        pygame.draw.rect(SCREEN, (60, 60, 60), bar, 2)
+        pygame.draw.rect(SCREEN, (200, 40, 40),
+                         (bar.x + 4, bar.y + 4, int((bar.width - 8) * loaded / max(total, 1)), bar.height - 8))
+        present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
+        CLOCK.tick(60)
+
+    LOADER.pump()
+    for g in groups:
+        publish_assets(g)
+    if LOADER.done() and LOADER.wall_ms is not None and "report" not in ASSETS_PUBLISHED:
+        ASSETS_PUBLISHED.add("report")
+        LOG_ASSETS.info("%s", LOADER.report())
+
+
+submit_asset_jobs()
+
+
 # ----- Door & Power System -----
-DOORS = {
-    ("Hall", "Office"): {"closed": False}
-}
+DOORS = make_doors()
+OFFICE_DOOR = DOORS.get("Hall", "Office")
 
 # ----- Camera Order -----
 CAMERA_ORDER = ["Stage", "Kitchen", "Hall", "Backroom", "HallCorner", "Office"]
+CAMERA_INDEX = {name: i for i, name in enumerate(CAMERA_ORDER)}
 
 # FNaF-style short labels for each camera
 CAM_LABELS = {
@@ -323,6 +406,25 @@ CAM_LABELS = {
 
 
 
+# --- Map widgets: fixed positions, registered once in UI_HITS ---
+MAP_X, MAP_Y = WIDTH // 2 - 640, HEIGHT // 2 - 360
+MAP_LAYER_RECTS = {
+    1: UI_HITS.add(("layer", 1), (MAP_X +  50, MAP_Y + 30, 180, 50), "map"),   # TOP
+    0: UI_HITS.add(("layer", 0), (MAP_X + 260, MAP_Y + 30, 180, 50), "map"),   # BOTTOM
+}
+MAP_CLOSE_BUTTON = UI_HITS.add(("close", "map"), (WIDTH - 180, 120, 160, 60), "map")
+MAP_CAM_RECTS = {}
+for cam_name, data in CAM_MAP_BUTTON_POS.items():
+    px, py = data["pos"]
+    MAP_CAM_RECTS[cam_name] = UI_HITS.add(("cam", cam_name), (MAP_X + px - 25, MAP_Y + py - 25, 50, 50),
+                                          f"map{data['layer']}")
+
+
+def map_widget_at(vmx, vmy):
+    """Key of the map widget under the virtual mouse position (current layer only), or None."""
+    return UI_HITS.hit(vmx, vmy, ("map", f"map{map_layer}"))
+
+
 # Optional: if you don’t want to access the Office via camera view:
 VIEWABLE_CAMERAS = [r for r in CAMERA_ORDER if r != "Office"]
 
@@ -337,17 +439,15 @@ map_toggle_cooldown = 0
 map_hover_timer = 0
 
 
-MAX_POWER = 100.0
-power = MAX_POWER
-POWER_DRAIN_IDLE = 0.0025      # slower idle drain
-POWER_DRAIN_CAMERA = 0.008     # slower drain when cameras are active
-POWER_DRAIN_DOOR = 0.02        # slightly reduced door cost
+# one game clock for AI, power, night timer and hour label (fixed steps, see main())
+NIGHT_CLOCK = FixedStepClock()
+EVENTS = Scheduler()  # game timers, run up to NIGHT_CLOCK.time every simulation step
+POWER = PowerModel(DOORS, clock=lambda: NIGHT_CLOCK.time, scheduler=EVENTS)
+power = MAX_POWER  # POWER.level() of the last simulation step, read by the HUD
 
 def draw_map_buttons(surface, x, y):
     global map_layer
 
-    btn_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 32)
-
     btn_top = pygame.Rect(x, y, 180, 50)
     btn_bottom = pygame.Rect(x + 200, y, 220, 50)
 
@@ -356,125 +456,82 @@ def draw_map_buttons(surface, x, y):
 
     # TOP button
     pygame.draw.rect(surface, (120, 50, 50) if map_layer == 0 else (60, 60, 60), btn_top, border_radius=8)
-    label = btn_font.render("TOP", True, (255,255,255))
+    label = render_text(PIXEL_FONT, 32, "TOP", (255,255,255))
     surface.blit(label, (btn_top.centerx - label.get_width()//2, btn_top.centery - label.get_height()//2))
 
     # BOTTOM button
     pygame.draw.rect(surface, (120, 50, 50) if map_layer == 1 else (60, 60, 60), btn_bottom, border_radius=8)
-    label = btn_font.render("BOTTOM", True, (255,255,255))
+    label = render_text(PIXEL_FONT, 32, "BOTTOM", (255,255,255))
     surface.blit(label, (btn_bottom.centerx - label.get_width()//2, btn_bottom.centery - label.get_height()//2))
 
     # Click detection
     if click:
         if btn_top.collidepoint(mx, my):
             map_layer = 0
-            print("Switched to TOP layer")
+            LOG.debug("Switched to TOP layer")
         elif btn_bottom.collidepoint(mx, my):
             map_layer = 1
-            print("Switched to BOTTOM layer")
+            LOG.debug("Switched to BOTTOM layer")
 
 
 
-def draw_map_camera_buttons(surface, map_x, map_y):
+def draw_map_camera_buttons(surface, hovered=None):
     """
-    Zeichnet die Kamera-Buttons auf der Map. Maus virtuell mappen + inside beachten.
+    Zeichnet die Kamera-Buttons der aktuellen Map-Ebene an ihren registrierten Positionen.
+    `hovered` ist der Widget-Schlüssel unter der Maus (aus map_widget_at).
     """
-    global CAM_MAP_RECTS, camera_index, map_layer
-    CAM_MAP_RECTS = []
+    active_name = CAMERA_ORDER[camera_index]
+    for key in UI_HITS.keys(f"map{map_layer}"):
+        cam_name = key[1]
+        rect = MAP_CAM_RECTS[cam_name]
 
-    btn_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
-
-    vmx, vmy, inside = window_to_virtual(pygame.mouse.get_pos(), WINDOW, VIRTUAL_W, VIRTUAL_H)
-
-    for cam_name, data in CAM_MAP_BUTTON_POS.items():
-        px, py = data["pos"]
-        layer  = data["layer"]
-        if layer != map_layer:
-            continue
-
-        rect = pygame.Rect(map_x + px - 25, map_y + py - 25, 50, 50)
-        hovered    = bool(inside) and rect.collidepoint(vmx, vmy)
-        active_cam = (CAMERA_ORDER[camera_index] == cam_name)
+        if cam_name == active_name:
+            color = (200, 40, 40)
+        elif key == hovered:
+            color = (150, 150, 150)
+        else:
+            color = (90, 90, 90)
 
-        color = (200, 40, 40) if active_cam else ((150, 150, 150) if hovered else (90, 90, 90))
         pygame.draw.rect(surface, color, rect, border_radius=12)
         pygame.draw.rect(surface, (20, 20, 20), rect, 3, border_radius=12)
 
-        label = btn_font.render(CAM_LABELS.get(cam_name, cam_name[:2]), True, (240, 240, 240))
+        label = render_text(PIXEL_FONT, 28, CAM_LABELS.get(cam_name, cam_name[:2]), (240, 240, 240))
         surface.blit(label, (rect.centerx - label.get_width() // 2,
                              rect.centery - label.get_height() // 2))
 
-        CAM_MAP_RECTS.append((rect, cam_name))
-
 
 
 def draw_map_overlay(surface):
     """
     Map-Overlay mittig zeichnen (Buttons TOP/BOTTOM, Cam-Buttons usw.).
-    Maus wird hier auf virtuelle 1920x1080-Koords gemappt; Hover nur 'inside'.
+    Die Rechtecke stehen fest in UI_HITS; Hover nur 'inside' (nicht in der Letterbox).
     """
-    global CAM_MAP_RECTS
-    CAM_MAP_RECTS = []
-
-    # --- map position (virtuell) ---
-    map_x = WIDTH // 2 - 640
-    map_y = HEIGHT // 2 - 360
-
     if map_layer == 1:
-        surface.blit(MAP_TOP,    (map_x, map_y))
+        surface.blit(MAP_TOP,    (MAP_X, MAP_Y))
     else:
-        surface.blit(MAP_BOTTOM, (map_x, map_y))
-
-    MAP_FONT = pygame.font.Font("../assets/fonts/pixel_font.ttf", 32)
+        surface.blit(MAP_BOTTOM, (MAP_X, MAP_Y))
 
     # -------- TOP/BOTTOM Buttons zeichnen (wie gehabt) --------
-    top_rect    = pygame.Rect(map_x +  50, map_y + 30, 180, 50)
-    bottom_rect = pygame.Rect(map_x + 260, map_y + 30, 180, 50)
+    top_rect    = MAP_LAYER_RECTS[1]
+    bottom_rect = MAP_LAYER_RECTS[0]
 
     pygame.draw.rect(surface, (120, 50, 50) if map_layer == 1 else (60, 60, 60), top_rect,    border_radius=8)
     pygame.draw.rect(surface, (120, 50, 50) if map_layer == 0 else (60, 60, 60), bottom_rect, border_radius=8)
 
-    txt = MAP_FONT.render("TOP", True, (255, 255, 255))
+    txt = render_text(PIXEL_FONT, 32, "TOP", (255, 255, 255))
     surface.blit(txt, (top_rect.centerx - txt.get_width() // 2,    top_rect.centery - txt.get_height() // 2))
-    txt = MAP_FONT.render("BOTTOM", True, (255, 255, 255))
+    txt = render_text(PIXEL_FONT, 32, "BOTTOM", (255, 255, 255))
     surface.blit(txt, (bottom_rect.centerx - txt.get_width() // 2, bottom_rect.centery - txt.get_height() // 2))
 
-    # -------- Cam-Buttons (mit virtueller Maus) --------
-    vmx, vmy, inside = window_to_virtual(pygame.mouse.get_pos(), WINDOW, VIRTUAL_W, VIRTUAL_H)
-    btn_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
-
-    for cam_name, data in CAM_MAP_BUTTON_POS.items():
-        px, py = data["pos"]
-        layer  = data["layer"]
-        if layer != map_layer:
-            continue
-
-        rect = pygame.Rect(map_x + px - 25, map_y + py - 25, 50, 50)
-
-        hovered    = bool(inside) and rect.collidepoint(vmx, vmy)
-        active_cam = (CAMERA_ORDER[camera_index] == cam_name)
-
-        if active_cam:
-            color = (200, 40, 40)
-        elif hovered:
-            color = (150, 150, 150)
-        else:
-            color = (90, 90, 90)
-
-        pygame.draw.rect(surface, color, rect, border_radius=12)
-        pygame.draw.rect(surface, (20, 20, 20), rect, 3, border_radius=12)
-
-        label_text = CAM_LABELS.get(cam_name, cam_name[:2])
-        lbl = btn_font.render(label_text, True, (240, 240, 240))
-        surface.blit(lbl, (rect.centerx - lbl.get_width() // 2,
-                           rect.centery - lbl.get_height() // 2))
-        CAM_MAP_RECTS.append((rect, cam_name))
+    # -------- Cam-Buttons (eine Index-Abfrage statt Test pro Button) --------
+    vmx, vmy, inside = VIEWPORT.mouse()
+    draw_map_camera_buttons(surface, map_widget_at(vmx, vmy) if inside else None)
 
     # -------- MAP close button (wie gehabt) --------
-    close_rect = pygame.Rect(WIDTH - 180, 120, 160, 60)
+    close_rect = MAP_CLOSE_BUTTON
     pygame.draw.rect(surface, (40, 90, 130), close_rect, border_radius=10)
     pygame.draw.rect(surface, (20, 20, 20), close_rect, 3, border_radius=10)
-    close_label = MAP_FONT.render("MAP", True, (255, 255, 255))
+    close_label = render_text(PIXEL_FONT, 32, "MAP", (255, 255, 255))
     surface.blit(close_label, (close_rect.centerx - close_label.get_width() // 2,
                                close_rect.centery - close_label.get_height() // 2))
 
@@ -482,8 +539,7 @@ def draw_map_overlay(surface):
 
 
 def is_door_closed_between(room_a, room_b):
-    key = (room_a, room_b) if (room_a, room_b) in DOORS else (room_b, room_a)
-    return DOORS.get(key, {}).get("closed", False)
+    return DOORS.is_closed(room_a, room_b)
 
 # --- Build Game Context ---
 game = GameContext(
@@ -493,7 +549,10 @@ game = GameContext(
     anim_img=ANIM_IMG,
     player_room="Office",
     door_checker=is_door_closed_between,
-    get_power=lambda: power
+    get_power=lambda: power,
+    sprites=SPRITES,
+    doors=DOORS,
+    rng=random.Random(),  # simulation only; frame-rate dependent effects use the `random` module
 )
 
 # --- Create Animatronics using the new class ---
@@ -512,6 +571,7 @@ fliege = Animatronic(
 )
 
 animatronics = [rainer, fliege]
+VOICES.acoustics = RoomAcoustics(game.graph, game.player_room_id, OFFICE_SIDES)
 
 
 
@@ -519,7 +579,6 @@ animatronics = [rainer, fliege]
 camera_index = 0   # which camera the player is viewing
 game_over = False
 jumpscare_time = 0.0
-NIGHT_LENGTH = 450  # 7 minutes 30 seconds like FNaF
 night_timer = NIGHT_LENGTH
 start_ticks = pygame.time.get_ticks()
 
@@ -542,12 +601,28 @@ def mouse_in_camera_ui(mx, my):
     return False
 
 
+def _end_camera_boot():
+    global camera_booting
+    camera_booting = False
+
+
+def _end_switch_flicker():
+    global camera_switch_flicker
+    camera_switch_flicker = False
+
+
+def _toggle_rec():
+    global rec_visible
+    rec_visible = not rec_visible
+
+
 def handle_camera_switch(key):
-    global camera_index, flicker_timer, camera_booting, camera_boot_timer, current_camera_name
+    global camera_index, camera_booting, camera_switch_flicker, _camera_boot_timer, current_camera_name
 
     # Trigger camera boot-up sequence
     camera_booting = True
-    camera_boot_timer = 0.8  # seconds of static before feed appears
+    EVENTS.cancel(_camera_boot_timer)
+    _camera_boot_timer = EVENTS.after(0.8, _end_camera_boot)  # seconds of static before feed appears
 
     # Map numeric keys (1..N) to indices in VIEWABLE_CAMERAS
     key_map = {
@@ -567,263 +642,162 @@ def handle_camera_switch(key):
             # The 'camera_index' in your rendering code expects an index into CAMERA_ORDER
             # Find the actual index inside CAMERA_ORDER for the selected viewable camera name:
             selected_name = VIEWABLE_CAMERAS[view_idx]
-            camera_index = CAMERA_ORDER.index(selected_name)
+            camera_index = CAMERA_INDEX[selected_name]
 
-            flicker_timer = 0.3  # short flicker when switching cams
+            camera_switch_flicker = True
+            EVENTS.after(0.3, _end_switch_flicker)  # short flicker when switching cams
 
-            if CAMERA_SWITCH_SOUND:
-                CAMERA_SWITCH_SOUND.set_volume(0.3)
-                CAMERA_SWITCH_SOUND.play()
+            SOUNDS.play("cam_select", volume=0.3, priority=PRIORITY_UI)
 
             # Display a human label for overlay (e.g., "1: Hall" or just "1")
             current_camera_name = f"{view_idx+1}: {selected_name}"
-            print(f"[DEBUG] Switched view key {view_idx+1} -> camera_index {camera_index} ({selected_name})")
+            LOG.debug("Switched view key %d -> camera_index %d (%s)", view_idx + 1, camera_index, selected_name)
 
 
 def toggle_door_between(room_a, room_b):
     """Toggle the door state if a door exists between two rooms."""
-    key = (room_a, room_b) if (room_a, room_b) in DOORS else (room_b, room_a)
-    if key in DOORS:
-        DOORS[key]["closed"] = not DOORS[key]["closed"]
+    DOORS.toggle(room_a, room_b)
 
 
-def drain_power(dt, camera_on):
-    """Return new power value after drain."""
-    total_drain = POWER_DRAIN_IDLE
-    if camera_on:
-        total_drain += POWER_DRAIN_CAMERA
-    # add drain for each closed door
-    for door in DOORS.values():
-        if door["closed"]:
-            total_drain += POWER_DRAIN_DOOR
-    return max(power - total_drain * 60 * dt, 0)
+def simulate_step(dt, camera_on):
+    """One fixed simulation step: power events and animatronics."""
+    global power
+    POWER.set_camera(camera_on)     # drain rate only changes on camera/door events
+    power = POWER.update()          # opens all doors at the exact blackout time
+    PROFILER.mark("power")
+    for a in animatronics:
+        a.update(dt)
+    PROFILER.mark("ai")
 
 
 
 def main_menu():
+    wait_for_assets("menu")
+
     # --- Load menu music ---
-    menu_music = safe_load_sound("../assets/sounds/menu_theme.wav")
+    menu_music = SOUNDS.get("menu_theme")
     if menu_music:
         menu_music.set_volume(0.5)
         menu_music.play(-1)
 
-    # --- Fonts ---
-    title_font  = pygame.font.Font("../assets/fonts/pixel_font.ttf", 64)
-    button_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
-    info_font   = pygame.font.Font("../assets/fonts/pixel_font.ttf", 32)
-
-    # --- Build STATIC frames ---
-    if STATIC_FRAMES:
-        static_frames = [
-            pygame.transform.scale(f, (WIDTH, HEIGHT)).convert_alpha()
-            for f in STATIC_FRAMES
-        ]
-    else:
-        surf = pygame.Surface((WIDTH, HEIGHT))
-        surf.fill((20, 20, 20))
-        static_frames = [surf]
-
     frame_index = 0
     frame_timer = 0.0
     frame_delay = 0.04
 
     # --- Rainer flash effect ---
-    try:
-        rainer_img = pygame.image.load("../assets/images/rainer_flash.png").convert_alpha()
-        rainer_img = pygame.transform.scale(rainer_img, (WIDTH, HEIGHT))
-    except:
-        rainer_img = None
+    rainer_img = LOADER.get("rainer_flash")
+    rainer_overlay = rainer_img.copy() if rainer_img else None   # eigene Kopie, nur das Alpha ändert sich
 
-    rainer_timer = random.uniform(5.0, 12.0)
     rainer_alpha = 0
-
-    # Buttons
-    start_rect    = pygame.Rect(WIDTH//2 - 150, HEIGHT//2,            300, 80)
-    graphics_rect = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 + 120,      300, 80)
-    controls_rect = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 + 240,      300, 80)
-    quit_rect     = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 + 360,      300, 80)
-    back_rect     = pygame.Rect(WIDTH//2 - 150, HEIGHT - 200,         300, 80)
-
-    in_controls_menu = False
-    in_graphics_menu = False
-
+    menu_events = Scheduler()
+
+    def rainer_flash():
+        nonlocal rainer_alpha
+        rainer_alpha = 255
+        menu_events.after(random.uniform(8.0, 14.0), rainer_flash)
+
+    if rainer_img:
+        menu_events.after(random.uniform(5.0, 12.0), rainer_flash)
+
+    # --- Screens (Widgets einmal gebaut, Buttons einmal in UI_HITS registriert) ---
+    main_screen = Panel("menu", UI_HITS)
+    main_screen.add(Label("FIVE NIGHTS AT DRACHENSCHANZE", 64, (255, 255, 255), (WIDTH//2, HEIGHT//3), flicker=0.03))
+    main_screen.add(Button("start",    (WIDTH//2 - 150, HEIGHT//2,       300, 80), "Start Night"))
+    main_screen.add(Button("graphics", (WIDTH//2 - 150, HEIGHT//2 + 120, 300, 80), "Graphics"))
+    main_screen.add(Button("controls", (WIDTH//2 - 150, HEIGHT//2 + 240, 300, 80), "Controls"))
+    main_screen.add(Button("quit",     (WIDTH//2 - 150, HEIGHT//2 + 360, 300, 80), "Quit"))
+
+    controls_screen = Panel("controls", UI_HITS)
+    controls_screen.add(Label("Controls", 64, (255, 255, 255), (WIDTH//2, 120)))
+    lines = [
+        "1-5  : Switch cameras",
+        "D    : Toggle Office Door",
+        "Hover bottom arrow : Open camera monitor",
+        "ESC  : Quit game"
+    ]
+    for i, line in enumerate(lines):
+        controls_screen.add(Label(line, 32, (220, 220, 220), (WIDTH//2, 300 + 60 * i)))
+    controls_screen.add(Button("back", (WIDTH//2 - 150, HEIGHT - 200, 300, 80), "Back"))
+
+    graphics_screen = Panel("graphics", UI_HITS)
+    graphics_screen.add(Label("Graphics", 64, (255, 255, 255), (WIDTH//2, 120)))
+    aspect_169  = graphics_screen.add(Toggle("16:9",  (WIDTH//2 - 320, 320, 260, 80), "Aspect: 16:9"))
+    aspect_1610 = graphics_screen.add(Toggle("16:10", (WIDTH//2 +  60, 320, 260, 80), "Aspect: 16:10"))
+    window_info = graphics_screen.add(Label("", 32, (200, 200, 200), (WIDTH//2, 450)))
+    # Skalierfilter (nearest ist schneller auf schwachen Rechnern)
+    filter_button = graphics_screen.add(Button("filter", (WIDTH//2 - 150, 540, 300, 80), ""))
+    graphics_screen.add(Button("back", (WIDTH//2 - 150, HEIGHT - 200, 300, 80), "Back"))
+
+    screen = main_screen
     running = True
 
-    # -------- BUTTON DRAW --------
-    def draw_button(rect, text, hovered):
-        base_color = (40, 30, 30)
-        hover_color = (70, 20, 20) if hovered else base_color
-
-        # Color flicker
-        flicker = random.randint(-10, 10)
-        color = (
-            max(0, min(255, hover_color[0] + flicker)),
-            max(0, min(255, hover_color[1] + flicker)),
-            max(0, min(255, hover_color[2] + flicker)),
-        )
-
-        # Button shake when hovered
-        offset_x = random.randint(-1, 1) if hovered else 0
-        offset_y = random.randint(-1, 1) if hovered else 0
-
-        # Draw main button
-        pygame.draw.rect(SCREEN, color, rect, border_radius=12)
-
-        # Glow effect
-        if hovered:
-            glow = pygame.Surface((rect.width + 10, rect.height + 10), pygame.SRCALPHA)
-            pygame.draw.rect(glow, (255, 30, 30, 35), glow.get_rect(), border_radius=12)
-            SCREEN.blit(glow, (rect.x - 5, rect.y - 5))
-
-        # Draw label
-        label = button_font.render(text, True, (220, 220, 220))
-        SCREEN.blit(label, (
-            rect.centerx - label.get_width()//2 + offset_x,
-            rect.centery - label.get_height()//2 + offset_y
-        ))
-
     # -------- MAIN MENU LOOP --------
     while running:
         dt = CLOCK.tick(60) / 1000.0
 
+        # night assets keep loading in the background while the menu runs
+        LOADER.pump()
+
         # --- static animation ---
         frame_timer += dt
         if frame_timer >= frame_delay:
             frame_timer = 0
-            frame_index = (frame_index + 1) % len(static_frames)
+            frame_index = (frame_index + 1) % STATIC_NOISE.count
 
-        static_surface = static_frames[frame_index].copy()
-        static_surface.set_alpha(50)  # transparent static
-        SCREEN.blit(static_surface, (0, 0))
+        # transparent static
+        SCREEN.blit(STATIC_NOISE.frame((WIDTH, HEIGHT), frame_index, alpha=50), (0, 0))
 
         # --- dark overlay ---
-        dark = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        dark.fill((0, 0, 0, 80))
-        SCREEN.blit(dark, (0, 0))
+        SCREEN.blit(OVERLAYS.dim(WIDTH, HEIGHT), (0, 0))
 
         # --- scanlines ---
-        if 'SCANLINE_OVERLAY' in globals() and SCANLINE_OVERLAY:
-            SCREEN.blit(SCANLINE_OVERLAY, (0, 0))
-
-        
-        vmx, vmy, inside = window_to_virtual(pygame.mouse.get_pos(), WINDOW, VIRTUAL_W, VIRTUAL_H)
-
-        if inside:
-            mx, my = vmx, vmy
-        else:
-            mx, my = -99999, -99999
+        SCREEN.blit(OVERLAYS.scanlines(WIDTH, HEIGHT), (0, 0))
 
+        vmx, vmy, inside = VIEWPORT.mouse()
 
         # --- Rainer flash ---
-        rainer_timer -= dt
-        if rainer_img and rainer_timer <= 0:
-            rainer_alpha = 255
-            rainer_timer = random.uniform(8.0, 14.0)
+        menu_events.advance(dt)
 
-        if rainer_alpha > 0 and rainer_img:
+        if rainer_alpha > 0 and rainer_overlay:
             rainer_alpha = max(0, rainer_alpha - 300 * dt)
-            temp = rainer_img.copy()
-            temp.set_alpha(int(rainer_alpha))
-            SCREEN.blit(temp, (0, 0))
-
-        # -------- CONTROLS SCREEN --------
-        if in_controls_menu:
-            header = title_font.render("Controls", True, (255, 255, 255))
-            SCREEN.blit(header, (WIDTH//2 - header.get_width()//2, 120))
-
-            lines = [
-                "1-5  : Switch cameras",
-                "D    : Toggle Office Door",
-                "Hover bottom arrow : Open camera monitor",
-                "ESC  : Quit game"
-            ]
-            y = 300
-            for line in lines:
-                t = info_font.render(line, True, (220, 220, 220))
-                SCREEN.blit(t, (WIDTH//2 - t.get_width()//2, y))
-                y += 60
-
-            draw_button(back_rect, "Back", back_rect.collidepoint(mx, my))
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if back_rect.collidepoint(mx, my):
-                        in_controls_menu = False
-
-            present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
-            continue  # bleibt IM while-running-Loop
-
-        # -------- GRAPHICS SCREEN (NEU) --------
-        if in_graphics_menu:
-            header = title_font.render("Graphics", True, (255, 255, 255))
-            SCREEN.blit(header, (WIDTH//2 - header.get_width()//2, 120))
-
-            # Aspect-Buttons
-            aspect_169_rect  = pygame.Rect(WIDTH//2 - 320, 320, 260, 80)
-            aspect_1610_rect = pygame.Rect(WIDTH//2 +  60, 320, 260, 80)
+            rainer_overlay.set_alpha(int(rainer_alpha))
+            SCREEN.blit(rainer_overlay, (0, 0))
 
-            is_169  = (ASPECT_MODE == '16:9')
-            is_1610 = (ASPECT_MODE == '16:10')
+        # -------- GRAPHICS SCREEN: Zustände nachziehen (rendert nur bei Änderung) --------
+        if screen is graphics_screen:
+            aspect_169.selected  = (ASPECT_MODE == '16:9')
+            aspect_1610.selected = (ASPECT_MODE == '16:10')
+            window_info.set_text(f"Window: {WINDOW.get_width()}x{WINDOW.get_height()}  (virtual 1920x1080)")
+            filter_name = "Smooth" if get_present_quality() == PRESENT_SMOOTH else "Nearest"
+            filter_button.set_text(f"Filter: {filter_name}")
 
-            draw_button(aspect_169_rect,  "Aspect: 16:9" , aspect_169_rect.collidepoint(mx, my)  or is_169)
-            draw_button(aspect_1610_rect, "Aspect: 16:10", aspect_1610_rect.collidepoint(mx, my) or is_1610)
-
-            info_txt = info_font.render(
-                f"Window: {WINDOW.get_width()}x{WINDOW.get_height()}  (virtual 1920x1080)",
-                True, (200, 200, 200)
-            )
-            SCREEN.blit(info_txt, (WIDTH//2 - info_txt.get_width()//2, 450))
-
-            draw_button(back_rect, "Back", back_rect.collidepoint(mx, my))
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if back_rect.collidepoint(mx, my):
-                        in_graphics_menu = False
-                    elif aspect_169_rect.collidepoint(mx, my):
-                        apply_aspect('16:9')
-                    elif aspect_1610_rect.collidepoint(mx, my):
-                        apply_aspect('16:10')
-
-            present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
-            continue  # bleibt IM while-running-Loop
-
-        # -------- MAIN MENU SCREEN --------
-        if random.random() < 0.03:
-            flicker_color = (
-                random.randint(150, 255),
-                random.randint(150, 255),
-                random.randint(150, 255)
-            )
-        else:
-            flicker_color = (255, 255, 255)
-
-        title = title_font.render("FIVE NIGHTS AT DRACHENSCHANZE", True, flicker_color)
-        SCREEN.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//3))
-
-        # Buttons
-        draw_button(start_rect,    "Start Night", start_rect.collidepoint(mx, my))
-        draw_button(graphics_rect, "Graphics",    graphics_rect.collidepoint(mx, my))  # NEU
-        draw_button(controls_rect, "Controls",    controls_rect.collidepoint(mx, my))
-        draw_button(quit_rect,     "Quit",        quit_rect.collidepoint(mx, my))
+        # Klicks in der Letterbox treffen nichts
+        hovered = screen.hit(vmx, vmy) if inside else None
+        screen.draw(SCREEN, hovered, pygame.mouse.get_pressed()[0])
 
         # --- EVENT HANDLING ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
+            if event.type == pygame.VIDEORESIZE:
+                VIEWPORT.update(WINDOW)
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if start_rect.collidepoint(mx, my):
+                if hovered == "start":
                     running = False
-                elif graphics_rect.collidepoint(mx, my):    # NEU
-                    in_graphics_menu = True                 # NEU
-                elif controls_rect.collidepoint(mx, my):
-                    in_controls_menu = True
-                elif quit_rect.collidepoint(mx, my):
+                elif hovered == "graphics":
+                    screen = graphics_screen
+                elif hovered == "controls":
+                    screen = controls_screen
+                elif hovered == "quit":
                     pygame.quit(); sys.exit()
+                elif hovered == "back":
+                    screen = main_screen
+                elif hovered == "16:9":
+                    set_aspect('16:9')
+                elif hovered == "16:10":
+                    set_aspect('16:10')
+                elif hovered == "filter":
+                    set_present_quality(PRESENT_NEAREST if filter_name == "Smooth" else PRESENT_SMOOTH)
 
         present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
 
@@ -894,16 +868,156 @@ def show_night_intro(screen, text="Night 1", duration=3.0):
     present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
     pygame.time.wait(500)
 
-pygame.mixer.set_num_channels(16)
 pygame.mixer.music.set_volume(1.0)
 
 
 # ----- Main loop -----
+def draw_camera_overlay(surface, camera_name, booting=False, flicker=False):
+    """Draw realistic FNaF-style camera overlay on top of the camera feed."""
+    # --- Base scanline overlay ---
+    surface.blit(OVERLAYS.scanlines(WIDTH, HEIGHT), (0, 0))
+
+    # --- Slight vignette ---
+    surface.blit(OVERLAYS.vignette(WIDTH, HEIGHT), (0, 0))
+
+    # --- REC indicator (now top-left) ---
+    if rec_visible:
+        rec_text = render_text(PIXEL_FONT, 28, "REC", (255, 40, 40))
+        surface.blit(rec_text, (50, 40))
+        pygame.draw.circle(surface, (255, 0, 0), (130, 50), 8)
+
+    # --- Booting effect (signal lost) ---
+    if booting:
+        signal_label = render_text(PIXEL_FONT, 38, "SIGNAL LOST", (255, 255, 255))
+        surface.blit(signal_label, (WIDTH//2 - signal_label.get_width()//2,
+                                    HEIGHT//2 - signal_label.get_height()//2))
+        # Black flicker overlay
+        surface.blit(OVERLAYS.boot(WIDTH, HEIGHT), (0, 0))
+
+    # --- Random flicker (rolled once per frame in the main loop) ---
+    if flicker:
+        surface.blit(OVERLAYS.flicker(WIDTH, HEIGHT), (0, 0))
+
+
+def play_jumpscare_video(jumpscare):
+    """Play the pre-baked jumpscare overlayed on the current game frame (greenscreen already removed)."""
+    if jumpscare is None:
+        return
+    if jumpscare.sound:
+        VOICES.play(jumpscare.sound, PRIORITY_JUMPSCARE)
+
+    # --- Manual Pygame playback straight from the mapped frame file ---
+    clock = pygame.time.Clock()
+    for surf in jumpscare.frames():
+        # --- Redraw last game frame (Office background) first ---
+        SCREEN.blit(OFFICE_BASE, (0, 0))
+        if OFFICE_DOOR.closed:
+            SCREEN.blit(DOOR_CLOSED_IMG, (0, 0))
+
+        # --- Then overlay the jumpscare frame with alpha ---
+        SCREEN.blit(surf, (0, 0))
+        del surf
+        present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
+        clock.tick(jumpscare.fps)
+
+
+def draw_night_frame(dirty, door_closed, current_hour, camera_name, camera_flicker, dt):
+    """
+    Draws one night frame into SCREEN: a full pass if `dirty` is None, otherwise
+    one clipped pass per dirty rect. Map widgets are hit-tested via UI_HITS.
+    """
+    # full redraw = one unclipped pass, otherwise one clipped pass per dirty rect
+    for clip_rect in ([None] if dirty is None else dirty):
+        SCREEN.set_clip(clip_rect)
+        SCREEN.fill((10,10,10))
+
+        # Draw night clock at the top-center of the screen
+        clock_text = render_text(PIXEL_FONT, 48, current_hour, (255, 255, 255))
+        SCREEN.blit(clock_text, (WIDTH // 2 - clock_text.get_width() // 2, 30))
+
+
+        if camera_active:
+            # If map is open: draw the map overlay centered
+            if map_open:
+                draw_map_overlay(SCREEN)
+            else:
+                # Center large camera view (base image)
+                big_room = ROOMS[CAMERA_ORDER[camera_index]]
+                big_view = big_room.view_surface.copy()
+
+                # Normal camera feed: render animatronics onto feed before scaling
+                drawn_rooms = set()
+                if CAMERA_ORDER[camera_index] != "Office":
+                    for a in animatronics:
+                        if a.room == big_room.id and a.visible and a.room not in drawn_rooms:
+                            anim_img = a.get_room_image()
+                            # blit to big_view using same coordinates — you may need to adjust coordinates
+                            big_view.blit(anim_img, (0, 0))
+                            drawn_rooms.add(a.room)
+
+                # Scale and blit camera feed into the "tablet" area
+                big_scaled = pygame.transform.scale(big_view, (1280, 720))
+                SCREEN.blit(big_scaled, (WIDTH//2 - 640, HEIGHT//2 - 360))
+
+            # Draw static overlay on top of camera/map if any
+            # Use static_alpha to control opacity (smaller factor for subtle effect)
+            translucent_static = STATIC_NOISE.frame((1280, 720), STATIC_FRAME_INDEX, alpha=static_alpha * 0.25)
+            SCREEN.blit(translucent_static, (WIDTH // 2 - 640, HEIGHT // 2 - 360))
+
+            # If camera booting, show full-screen static overlay
+            if camera_booting:
+                SCREEN.blit(STATIC_NOISE.frame((WIDTH, HEIGHT), STATIC_FRAME_INDEX, alpha=180), (0, 0))
+            else:
+                # Draw camera overlay HUD (REC, vignette, etc.)
+                draw_camera_overlay(SCREEN, camera_name, booting=camera_booting, flicker=camera_flicker)
+            PROFILER.mark("camera")
+
+        else:
+            # camera not active: draw office world
+            SCREEN.blit(OFFICE_BASE, (0, 0))
+            if door_closed:
+                SCREEN.blit(DOOR_CLOSED_IMG, (0, 0))
+            """
+            for a in animatronics:
+                if a.current_room == "Office" and a.visible:
+                    a.draw_on_surface(SCREEN)
+            """
+            PROFILER.mark("office")
+
+
+
+
+        draw_ui(SCREEN, WIDTH, HEIGHT, night_timer, power, door_closed)
+
+        draw_camera_overlay(SCREEN, camera_name, booting=camera_booting, flicker=camera_flicker)
+
+        #blackout
+        if power <= 0:
+            SCREEN.blit(OVERLAYS.blackout(WIDTH, HEIGHT), (0, 0))
+
+        if game_over:
+            # show jumpscare overlay for a short time
+            SCREEN.blit(JUMPSCARE_IMG, (0,0))
+
+        # Maus aus dem Fenster auf virtuelle 1920x1080-Koordinaten mappen
+        vmx, vmy, inside = VIEWPORT.mouse()
+
+        # Untere Kamera-Hover-Bar
+        draw_camera_hover_bar(SCREEN, WIDTH, HEIGHT, camera_active, camera_bar_y, camera_bar_target_y, dt)
+
+        # Rechte Map-Hover-Bar
+        if camera_active:
+            draw_map_hover_bar(SCREEN, WIDTH, HEIGHT, map_open, vmy)
+        PROFILER.mark("overlays")
+
+    SCREEN.set_clip(None)
+
+
 def main():
-    global game_over, camera_bar_y, click_once, camera_bar_target_y, map_open, map_layer, jumpscare_time,night_timer, camera_index, power, STATIC_FRAMES, cam_toggle_cooldown, camera_active, camera_button_rect, STATIC_OVERLAY, cam_show_timer, STATIC_FRAME_TIMER, STATIC_FRAME_INDEX, static_alpha, static_target_alpha, jumpscare_active, office_locked, fade, CAM_BAR_ACTIVE_COLOR, CAM_BAR_COLOR, CAM_BAR_FONT, CAM_BAR_HEIGHT, CAM_BAR_TEXT_COLOR, cam_hovered
+    global game_over, camera_bar_y, click_once, camera_bar_target_y, map_open, map_layer, jumpscare_time, night_timer, camera_index, cam_toggle_cooldown, camera_active, camera_button_rect, cam_show_timer, STATIC_FRAME_TIMER, STATIC_FRAME_INDEX, static_alpha, jumpscare_active, office_locked, CAM_BAR_ACTIVE_COLOR, CAM_BAR_COLOR, CAM_BAR_FONT, CAM_BAR_HEIGHT, CAM_BAR_TEXT_COLOR, cam_hovered
+    wait_for_assets("menu", "night")
     running = True
-    last_time = pygame.time.get_ticks()
-    flicker_timer = 0.0
+    night_clock = NIGHT_CLOCK
     camera_active = False
     static_alpha = 0.0         # current transparency level
     STATIC_FRAME_INDEX = 0
@@ -911,11 +1025,8 @@ def main():
     map_open = False
     map_layer = 0  # 0 = bottom, 1 = top
     camera_button_rect = pygame.Rect(WIDTH - 180, HEIGHT - 100, 160, 60)
-    door_closed = False
-    ambient_timer = random.uniform(20.0, 30.0)  # initial random delay before first ambient
+    door_closed = OFFICE_DOOR.closed
     # --- Initialize animatronics (before main loop) ---
-    camera_booting = False
-    camera_boot_timer = 0.0
     cam_toggle_cooldown = 0.0
     current_camera_name = "1A"
     jumpscare_active = False
@@ -925,7 +1036,7 @@ def main():
     CAM_BAR_COLOR = (10, 10, 10)
     CAM_BAR_ACTIVE_COLOR = (30, 30, 30)
     CAM_BAR_TEXT_COLOR = (200, 255, 200)
-    CAM_BAR_FONT = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
+    CAM_BAR_FONT = get_font(PIXEL_FONT, 28)
     cam_hovered = False
     camera_bar_y = HEIGHT - 20          # current Y position of the hover bar
     camera_bar_target_y = HEIGHT - 20   # target Y (moves smoothly)
@@ -933,100 +1044,70 @@ def main():
 
 
 
-    def play_jumpscare_video(path):
-        """Play the jumpscare video overlayed on the current game frame (greenscreen removed)."""
-        from moviepy.editor import VideoFileClip
-        from PIL import Image
-        import numpy as np
-        import pygame
-        import tempfile
-        import os
-
-        if not hasattr(Image, "ANTIALIAS"):
-            Image.ANTIALIAS = Image.LANCZOS
-
-        clip = VideoFileClip(path, audio=True)
-
-        # --- Chroma key function: produce alpha transparency instead of black ---
-        def chroma_key_rgba(frame):
-            """Return RGBA frame with transparency where green was detected."""
-            frame = np.copy(frame).astype(np.uint8)
-            r, g, b = frame[..., 0], frame[..., 1], frame[..., 2]
-            mask = (g > 1.55 * r) & (g > 1.55 * b) & (g > 40)
-            alpha = np.where(mask, 0, 255).astype(np.uint8)
-            rgba = np.dstack((r, g, b, alpha))
-            return rgba
-
-        clip = clip.fl_image(chroma_key_rgba).resize((WIDTH, HEIGHT))
-
-        # --- Extract and play sound separately ---
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            audio_path = tmp.name
-            clip.audio.write_audiofile(audio_path, verbose=False, logger=None)
-
-        jumpscare_sound = pygame.mixer.Sound(audio_path)
-        jumpscare_sound.set_volume(3.0)
-        jumpscare_sound.play()
-
-        # --- Manual Pygame playback ---
-        clock = pygame.time.Clock()
-        for frame in clip.iter_frames(fps=30, dtype="uint8"):
-            if frame.shape[2] == 3:
-                # fallback if no alpha
-                surf = pygame.image.frombuffer(frame.tobytes(), clip.size, "RGB").convert()
-            else:
-                surf = pygame.image.frombuffer(frame.tobytes(), clip.size, "RGBA").convert_alpha()
-
-            # --- Redraw last game frame (Office background) first ---
-            office_surface = OFFICE_BASE.copy()
-            if is_door_closed_between("Hall", "Office"):
-                office_surface.blit(DOOR_CLOSED_IMG, (0, 0))
-            office_scaled = pygame.transform.scale(office_surface, (WIDTH, HEIGHT))
-            SCREEN.blit(office_scaled, (0, 0))
-
-            # --- Then overlay the jumpscare frame with alpha ---
-            SCREEN.blit(surf, (0, 0))
-            present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
-            clock.tick(30)
-
-        clip.close()
-
-        # Clean up temp file
-        try:
-            os.remove(audio_path)
-        except:
-            pass
-
+    # Jumpscare was baked/mapped by the asset loader, so nothing is decoded when the player dies
+    rainer_jumpscare = LOADER.get("rainer_jumpscare")
 
     # Optional: slight speed variation
-    rainer.speed = random.uniform(45, 65)
-    fliege.speed = random.uniform(55, 70)
+    rainer.speed = game.rng.uniform(45, 65)
+    fliege.speed = game.rng.uniform(55, 70)
 
     # --- Start background ambiance when the night begins (with fade-in) ---
     if BACKGROUND_LOOP:
         BACKGROUND_LOOP.set_volume(0.0)
         BACKGROUND_LOOP.play(-1)
-        background_fade_timer = 0.0
         background_target_volume = 0.15  # final volume
-    else:
-        background_fade_timer = None
-
+        fade_duration = 5.0  # seconds for full fade-in
+        fade_start = EVENTS.time
 
-    while running:
-        now = pygame.time.get_ticks()
-        dt = (now - last_time) / 1000.0
-        last_time = now
-        CLOCK.tick(60)
-
-        # --- Gradually fade in background ambience ---
-        if BACKGROUND_LOOP and background_fade_timer is not None:
-            background_fade_timer += dt
-            fade_duration = 5.0  # seconds for full fade-in
-            current_volume = min(background_target_volume * (background_fade_timer / fade_duration),
-                                background_target_volume)
+        def fade_in_background():
+            current_volume = min(background_target_volume * (EVENTS.time - fade_start) / fade_duration,
+                                 background_target_volume)
             BACKGROUND_LOOP.set_volume(current_volume)
             if current_volume >= background_target_volume:
-                background_fade_timer = None  # stop updating after fade-in completes
+                background_fade.cancel()  # stop updating after fade-in completes
+
+        background_fade = EVENTS.every(0.05, fade_in_background)
+
+    # --- Ambient noise system: one scheduled sound at a time ---
+    def play_ambient(name, first=False):
+        # heard from the animatronic closest to the office; cold ambients beyond the budget are evicted here
+        source = max(animatronics, key=lambda a: VOICES.acoustics.gain[a.room])
+        SOUNDS.play(name, room=source.room)
+        next_name = random.choice(AMBIENT_SOUNDS)
+        SOUNDS.prefetch(next_name)    # decoded off the main thread long before it is due
+        EVENTS.after(random.uniform(15.0, 25.0) if first else random.uniform(20.0, 30.0), play_ambient, next_name)
+
+    if AMBIENT_SOUNDS:
+        # initial random delay before first ambient
+        first_name = random.choice(AMBIENT_SOUNDS)
+        SOUNDS.prefetch(first_name)
+        EVENTS.after(random.uniform(20.0, 30.0), play_ambient, first_name, True)
+
+    # --- REC indicator blink ---
+    EVENTS.every(0.5, _toggle_rec)
+
+
+    # Office view only redraws what changed between frames
+    office_compositor = DirtyCompositor(WIDTH, HEIGHT)
+
+    # the office view follows the door through events (also when a blackout opens it)
+    def on_door_changed(door):
+        nonlocal door_closed
+        if door is OFFICE_DOOR:
+            door_closed = door.closed
+    DOORS.subscribe(on_door_changed)
+
+    if "--profile" in sys.argv:
+        PROFILER.toggle_overlay()
+    profile_csv = cli_option("--profile-csv")
+    if profile_csv:
+        PROFILER.start_csv(profile_csv)
+
+    while running:
+        PROFILER.frame()
+        # real frame time: UI, audio and animation timers only
+        dt = CLOCK.tick(60) / 1000.0
+        PROFILER.mark("idle")
 
 
         for event in pygame.event.get():
@@ -1035,90 +1116,77 @@ def main():
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 click_once = True
 
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                VIEWPORT.update(WINDOW)
+                office_compositor.invalidate()
+
             elif event.type == pygame.KEYDOWN:
                 handle_camera_switch(event.key)
 
                 if event.key == pygame.K_ESCAPE:
                     running = False
 
+                elif event.key == PROFILER_KEY:
+                    PROFILER.toggle_overlay()
+                    office_compositor.invalidate()
+
+                elif event.key == AI_DUMP_KEY:
+                    if not LOG_AI.enabled(DEBUG):
+                        # AI events are only recorded on request: start now, dump on the next F9
+                        GAME_LOG.set_level(DEBUG, "ai")
+                        LOG.info("Recording AI events, press F9 again to dump them to %s", AI_DUMP_PATH)
+                    else:
+                        count = GAME_LOG.dump(200, category="ai", path=AI_DUMP_PATH)
+                        LOG.info("Dumped %d AI events to %s", count, AI_DUMP_PATH)
+
                 elif event.key == pygame.K_d:
-                    toggle_door_between("Office", "Hall")
-                    door_closed = not door_closed
+                    toggle_door_between("Office", "Hall")  # door_closed follows via on_door_changed
                     if door_closed:
-                        print("Door Closed")
-                        if DOOR_CLOSE_SOUND:
-                            DOOR_CLOSE_SOUND.play()
+                        LOG.info("Door Closed")
+                        SOUNDS.play("door_close", priority=PRIORITY_UI)
                     else:
-                        print("Door Open")
-                        if DOOR_OPEN_SOUND:
-                            DOOR_OPEN_SOUND.play()
-
-
-        # --- Ambient noise system ---
-       
-        ambient_timer -= dt
-        first_ambient = True
-
-        # Inside the loop:
-        ambient_timer -= dt
-        if ambient_timer <= 0 and AMBIENT_SOUNDS:
-            sound = random.choice(AMBIENT_SOUNDS)
-            channel = sound.play()
-            if channel:
-                left = random.uniform(0.2, 1.0)
-                right = random.uniform(0.2, 1.0)
-                channel.set_volume(left, right)
-
-            if first_ambient:
-                ambient_timer = random.uniform(15.0, 25.0)
-                first_ambient = False
-            else:
-                ambient_timer = random.uniform(20.0, 30.0)
-
-
-        #drain power each frame
-        camera_on = camera_active  # using camera drains more
-        power = drain_power(dt, camera_on)
-
-        if power <= 0:
-            for door in DOORS.values():
-                door["closed"] = False
-
+                        LOG.info("Door Open")
+                        SOUNDS.play("door_open", priority=PRIORITY_UI)
+        PROFILER.mark("events")
 
         # --- Skip updates if player is already dead or jumpscare is active ---
         if game_over or jumpscare_active:
             continue  # freeze all updates this frame
 
-        # --- Normal gameplay updates ---
-        # update night timer
-        night_timer -= dt
-        if night_timer <= 0:
-            # survive the night!
-            print("You survived the night!")
-            running = False
-            
-        # Update night clock
-        elapsed = time.time() - night_start_time
-        progress = elapsed / night_length
-
-        # Convert progress (0.0 → 1.0) to hours
-        # 12 AM → 1 AM → 2 AM → ... → 6 AM (6 stages)
-        hours = int(progress * 6)
+        # --- Fixed-step simulation: identical AI timing at any frame rate ---
+        for _ in range(night_clock.advance(dt)):
+            sim_dt = night_clock.tick()
+            EVENTS.run_until(night_clock.time)  # timers, blackout
+            PROFILER.mark("timers")
+            simulate_step(sim_dt, camera_active)
+            night_timer = NIGHT_LENGTH - night_clock.time
+            if night_timer <= 0:
+                # survive the night!
+                LOG.info("You survived the night!")
+                running = False
 
-        clock_labels = ["12 AM", "1 AM", "2 AM", "3 AM", "4 AM", "5 AM", "6 AM"]
+            # --- Smooth fade for static overlay ---
+            if static_alpha < static_target_alpha:
+                static_alpha = min(static_alpha + static_fade_speed * sim_dt, static_target_alpha)
+            elif static_alpha > static_target_alpha:
+                static_alpha = max(static_alpha - static_fade_speed * sim_dt, static_target_alpha)
+            # (target is 255 when camera open, 0 when closed — static_alpha is used for overlays)
+            target_alpha = 255 if camera_active else 0
+            if static_alpha < target_alpha:
+                static_alpha = min(static_alpha + 100 * sim_dt, target_alpha)
+            elif static_alpha > target_alpha:
+                static_alpha = max(static_alpha - 100 * sim_dt, target_alpha)
+
+            if not running or any(a.room == game.player_room_id and a.state == "jumpscare" for a in animatronics):
+                break
 
-        if hours < len(clock_labels):
-            current_hour = clock_labels[hours]
-        else:
-            current_hour = "6 AM"  # just to be safe
+        # Update night clock (same game clock as night_timer)
+        current_hour = hour_label(night_clock.time)
 
-        # update animatronics
         for a in animatronics:
-            a.update(dt)
-
             # Trigger jumpscare if an anim reached the Office and is in jumpscare state
-            if not jumpscare_active and a.current_room == PLAYER_ROOM and a.state == "jumpscare":
-                print(f"[AI] {a.name} reached the Office! Triggering jumpscare...")
+            if not jumpscare_active and a.room == game.player_room_id and a.state == "jumpscare":
+                LOG_AI.info("%s reached the Office! Triggering jumpscare...", a.name)
 
                 # --- Prevent duplicate triggers ---
                 jumpscare_active = True
@@ -1130,9 +1198,9 @@ def main():
 
                 # Play the appropriate jumpscare
                 if a.name == "Rainer":
-                    play_jumpscare_video(RAINER_JUMPSCARE_VIDEO_PATH)
+                    play_jumpscare_video(rainer_jumpscare)
                 elif a.name == "Fliege":
-                    play_jumpscare_video(RAINER_JUMPSCARE_VIDEO_PATH)  # placeholder for Flieged
+                    play_jumpscare_video(rainer_jumpscare)  # placeholder for Flieged
 
                 # --- Fade to black AFTER jumpscare video ---
                 fade_surface = pygame.Surface((WIDTH, HEIGHT))
@@ -1143,7 +1211,10 @@ def main():
                     present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
                     pygame.time.wait(20)
 
-                print("GAME OVER - Player jumpscared.")
+                LOG.info("GAME OVER - Player jumpscared.")
+                if AI_DUMP_COUNT > 0:
+                    GAME_LOG.flush()
+                    GAME_LOG.dump(AI_DUMP_COUNT, category="ai")
                 game_over = True
 
                 # small delay for final sound tail
@@ -1152,229 +1223,89 @@ def main():
                 break
 
 
-        # --- Smooth fade for static overlay ---
-        if static_alpha < static_target_alpha:
-            static_alpha = min(static_alpha + static_fade_speed * dt, static_target_alpha)
-        elif static_alpha > static_target_alpha:
-            static_alpha = max(static_alpha - static_fade_speed * dt, static_target_alpha)
-
 
 
         if camera_active and map_open and click_once:
             # Virtuelle Mauskoordinaten aus dem Fenster mappen
-            vmx, vmy, inside = window_to_virtual(pygame.mouse.get_pos())
+            vmx, vmy, inside = VIEWPORT.mouse()
 
             if inside:
-                # Layer switch buttons
-                if MAP_TOP_RECT and MAP_TOP_RECT.collidepoint(vmx, vmy):
-                    map_layer = 1
-                    click_once = False
-                elif MAP_BOTTOM_RECT and MAP_BOTTOM_RECT.collidepoint(vmx, vmy):
-                    map_layer = 0
-                    click_once = False
-
-                # Camera switching (Cam-Buttons auf der Map)
-                for rect, cam_name in CAM_MAP_RECTS:
-                    if rect.collidepoint(vmx, vmy):
-                        camera_index = CAMERA_ORDER.index(cam_name)
-                        current_camera_name = cam_name
-                        if CAMERA_SWITCH_SOUND:
-                            CAMERA_SWITCH_SOUND.play()
+                widget = map_widget_at(vmx, vmy)
+                if widget is not None:
+                    kind, value = widget
+                    if kind == "layer":
+                        # Layer switch buttons
+                        map_layer = value
+                        click_once = False
+                    elif kind == "cam":
+                        # Camera switching (Cam-Buttons auf der Map)
+                        camera_index = CAMERA_INDEX[value]
+                        current_camera_name = value
+                        SOUNDS.play("cam_select", priority=PRIORITY_UI)
                         click_once = False
-                        break
             else:
                     # Klick in Letterbox/Pillarbox ignorieren
                 click_once = False
 
 
-        # draw .............................................................................................................................................................................
-        SCREEN.fill((10,10,10))
-
-        # Center large camera view (base image)
-        big_room = ROOMS[CAMERA_ORDER[camera_index]]
-        big_view = big_room.view_surface.copy()
-
-        # Ensure STATIC_FRAMES has at least one fallback frame
-        if not STATIC_FRAMES:
-            # create a subtle fallback static frame so nothing crashes / everything blits
-            fallback = pygame.Surface((1280, 720), pygame.SRCALPHA)
-            fallback.fill((30, 30, 30))
-            STATIC_FRAMES = [fallback]
-            STATIC_FRAME_INDEX = 0
-            STATIC_FRAME_TIMER = 0.0
+        PROFILER.mark("logic")
 
+        # draw .............................................................................................................................................................................
         # Update static animation timer (global 1080p static)
-        if CAMERA_ORDER[camera_index] != "Office" and STATIC_FRAMES:
+        if CAMERA_ORDER[camera_index] != "Office":
             STATIC_FRAME_TIMER += dt
             if STATIC_FRAME_TIMER > 0.05:
-                STATIC_FRAME_INDEX = (STATIC_FRAME_INDEX + 1) % len(STATIC_FRAMES)
+                STATIC_FRAME_INDEX = (STATIC_FRAME_INDEX + 1) % STATIC_NOISE.count
                 STATIC_FRAME_TIMER = 0.0
 
-        # Calculate static alpha target and smooth current
-        # (target_alpha is 255 when camera open, 0 when closed — static_alpha is used for overlays)
-        target_alpha = 255 if camera_active else 0
-        if static_alpha < target_alpha:
-            static_alpha = min(static_alpha + 100 * dt, target_alpha)
-        elif static_alpha > target_alpha:
-            static_alpha = max(static_alpha - 100 * dt, target_alpha)
-
-        # If camera is active, draw camera UI (either map or feed)
-        MAP_TOP_RECT = MAP_BOTTOM_RECT = MAP_CLOSE_RECT = None
-
-        # Draw night clock at the top-center of the screen
-        font_clock = pygame.font.Font("../assets/fonts/pixel_font.ttf", 48)
-        clock_text = font_clock.render(current_hour, True, (255, 255, 255))
-        SCREEN.blit(clock_text, (WIDTH // 2 - clock_text.get_width() // 2, 30))
-
-
-        if camera_active:
-            # If map is open: draw the map overlay centered
-            if map_open:
-                MAP_TOP_RECT, MAP_BOTTOM_RECT, MAP_CLOSE_RECT = draw_map_overlay(SCREEN)
-            else:
-                # Normal camera feed: render animatronics onto feed before scaling
-                drawn_rooms = set()
-                if CAMERA_ORDER[camera_index] != "Office":
-                    for a in animatronics:
-                        if a.current_room == big_room.name and a.visible and a.current_room not in drawn_rooms:
-                            anim_img = a.get_room_image()
-                            # blit to big_view using same coordinates — you may need to adjust coordinates
-                            big_view.blit(anim_img, (0, 0))
-                            drawn_rooms.add(a.current_room)
-
-                # Scale and blit camera feed into the "tablet" area
-                big_scaled = pygame.transform.scale(big_view, (1280, 720))
-                SCREEN.blit(big_scaled, (WIDTH//2 - 640, HEIGHT//2 - 360))
-
-            # Draw static overlay on top of camera/map if any
-            try:
-                static_frame = pygame.transform.scale(STATIC_FRAMES[STATIC_FRAME_INDEX], (1280, 720)).convert_alpha()
-                translucent_static = pygame.Surface(static_frame.get_size(), pygame.SRCALPHA)
-                translucent_static.blit(static_frame, (0, 0))
-            except Exception:
-                # fallback translucent static surface when something's wrong
-                translucent_static = pygame.Surface((1280, 720), pygame.SRCALPHA)
-                translucent_static.fill((0, 0, 0, 0))
-
-            # Use static_alpha to control opacity (smaller factor for subtle effect)
-            # Clamp safe values
-            alpha_val = max(0, min(255, int(static_alpha * 0.25)))
-            translucent_static.set_alpha(alpha_val)
-            SCREEN.blit(translucent_static, (WIDTH // 2 - 640, HEIGHT // 2 - 360))
-
-            # If camera booting, show full-screen static overlay (existing variable STATIC_OVERLAY expected)
-            if camera_booting:
-                camera_boot_timer -= dt
-                if 'STATIC_OVERLAY' in globals() and STATIC_OVERLAY:
-                    STATIC_OVERLAY.set_alpha(180)
-                    SCREEN.blit(STATIC_OVERLAY, (0, 0))
-                if camera_boot_timer <= 0:
-                    camera_booting = False
-            else:
-                # Draw camera overlay HUD (REC, vignette, etc.)
-                draw_camera_overlay(SCREEN, current_camera_name, booting=camera_booting)
+        # --- random flicker (rolled once per frame, from the render-side `random`, never game.rng) ---
+        camera_flicker = camera_switch_flicker or random.random() < 0.02
 
+        # --- Dirty rects: office view only, everything else is a full redraw ---
+        if camera_active or map_open or camera_booting or jumpscare_active or game_over or PROFILER.visible:
+            office_compositor.invalidate()
+            dirty = None
         else:
-            # camera not active: draw office world
-            office_surface = OFFICE_BASE.copy()
-            if door_closed:
-                office_surface.blit(DOOR_CLOSED_IMG, (0, 0))
-            """
-            for a in animatronics:
-                if a.current_room == "Office" and a.visible:
-                    a.draw_on_surface(office_surface)
-            """
-            office_scaled = pygame.transform.scale(office_surface, (WIDTH, HEIGHT))
-            SCREEN.blit(office_scaled, (0, 0))
-
-
-
-
-        draw_ui(SCREEN, WIDTH, HEIGHT, night_timer, power, is_door_closed_between("Hall", "Office"))
-
-        def draw_camera_overlay(surface, camera_name, booting=False):
-            """Draw realistic FNaF-style camera overlay on top of the camera feed."""
-            global rec_flash_timer, rec_visible
-
-            # --- Base scanline overlay ---
-            surface.blit(SCANLINE_OVERLAY, (0, 0))
-
-            # --- Slight vignette ---
-            vignette = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            for i in range(0, 255, 15):
-                pygame.draw.rect(vignette, (0, 0, 0, i // 8),
-                                (i // 6, i // 6, WIDTH - i // 3, HEIGHT - i // 3), 5)
-            surface.blit(vignette, (0, 0))
-
-            # --- REC indicator (now top-left) ---
-            rec_flash_timer += 1 / 60
-            if rec_flash_timer >= 0.5:
-                rec_flash_timer = 0
-                rec_visible = not rec_visible
-
-            if rec_visible:
-                rec_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 28)
-                rec_text = rec_font.render("REC", True, (255, 40, 40))
-                surface.blit(rec_text, (50, 40))
-                pygame.draw.circle(surface, (255, 0, 0), (130, 50), 8)
-
-            # --- Booting effect (signal lost) ---
-            if booting:
-                signal_font = pygame.font.Font("../assets/fonts/pixel_font.ttf", 38)
-                signal_label = signal_font.render("SIGNAL LOST", True, (255, 255, 255))
-                surface.blit(signal_label, (WIDTH//2 - signal_label.get_width()//2,
-                                            HEIGHT//2 - signal_label.get_height()//2))
-                # Black flicker overlay
-                boot_overlay = pygame.Surface((WIDTH, HEIGHT))
-                boot_overlay.fill((0, 0, 0))
-                boot_overlay.set_alpha(random.randint(160, 220))
-                surface.blit(boot_overlay, (0, 0))
-
-            # --- Random flicker ---
-            if random.random() < 0.02:
-                flicker_overlay = pygame.Surface((WIDTH, HEIGHT))
-                brightness = random.randint(15, 40)
-                flicker_overlay.fill((brightness, brightness, brightness))
-                flicker_overlay.set_alpha(random.randint(20, 60))
-                surface.blit(flicker_overlay, (0, 0))
-
-
-        draw_camera_overlay(SCREEN, current_camera_name, booting=camera_booting)
-
-        #blackout
-        if power <= 0:
-            blackout = pygame.Surface((WIDTH, HEIGHT))
-            blackout.set_alpha(180)
-            blackout.fill((0, 0, 0))
-            SCREEN.blit(blackout, (0, 0))
-
+            office_compositor.track("door", door_closed, DOOR_CLOSED_RECT)
+            office_compositor.track("hud", (int(night_timer), f"{power:.0f}", power > 20, door_closed), HUD_RECT)
+            office_compositor.track("rec", rec_visible, REC_RECT)
+            office_compositor.track("clock", current_hour, CLOCK_RECT)
+            office_compositor.track("flicker", camera_flicker, SCREEN.get_rect())
+            office_compositor.track("blackout", power <= 0, SCREEN.get_rect())
+            bar_hovered, bar_y = camera_hover_bar_state(HEIGHT, camera_bar_y, dt)
+            office_compositor.track("hover_bar", (bar_hovered, int(bar_y)), HOVER_BAR_RECT)
+            dirty = office_compositor.collect()
+
+        draw_night_frame(dirty, door_closed, current_hour, current_camera_name, camera_flicker, dt)
         if game_over:
             # show jumpscare overlay for a short time
-            SCREEN.blit(JUMPSCARE_IMG, (0,0))
             jumpscare_time -= dt
             if jumpscare_time <= 0:
                 # end menu / quit
                 running = False
 
-        # Maus aus dem Fenster auf virtuelle 1920x1080-Koordinaten mappen
-        vmx, vmy, inside = window_to_virtual(pygame.mouse.get_pos(), WINDOW, VIRTUAL_W, VIRTUAL_H)
-
-        # Untere Kamera-Hover-Bar
-        draw_camera_hover_bar(SCREEN, WIDTH, HEIGHT, camera_active, camera_bar_y, camera_bar_target_y, dt)
-
-        # Rechte Map-Hover-Bar
-        if camera_active:
-            draw_map_hover_bar(SCREEN, vmy, dt)
-
-        # Frame ausgeben
-        present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
-
+        PROFILER.draw(SCREEN)
+        PROFILER.mark("profiler")
 
+        # Frame ausgeben (nur geänderte Bereiche, wenn möglich)
+        if dirty is None:
+            present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H)
+        elif dirty:
+            present_rects(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H, dirty)
+        PROFILER.mark("present")
+
+    if PROFILER.frames:
+        LOG.info("%s", PROFILER.report())
+    LOG.info("Audio: voices %s, sounds %s", VOICES.stats(), SOUNDS.stats())
+    PROFILER.close()
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
+    if "--nearest" in sys.argv:
+        set_present_quality(PRESENT_NEAREST)
     main_menu()
+    wait_for_assets("night")
     show_night_intro(SCREEN, "Night 1")
     main()
     
@@ -0,0 +1,230 @@
+"""
+Headless night simulator for the animatronic AI.
+Runs whole nights at a fixed dt without a window, driven by a seed and a
+scripted door policy, and reports survival, time of death, the culprit and
+the power curve.
+
+    python nightsim.py --nights 2000 --policy threat --seed 1
+    python nightsim.py --nights 200 --policy always --camera --json results.json
+    python nightsim.py --check     # regression checks only
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import contextlib
+from collections import Counter
+from animatronic import Animatronic, ANIMATRONIC_PATHS, GameContext
+from sprites import SpriteAtlas
+from simclock import SIM_STEP
+from scheduler import Scheduler
+from gamelog import GAME_LOG, DEBUG
+import world
+
+# Batch default: 4 game steps per simulated step. Survival and blackout statistics
+# match the game's 1/120 s step within noise at ~4x the nights per minute;
+# pass --dt SIM_STEP (0.008333) to replay a night step for step.
+SIM_DT = 4 * SIM_STEP
+START_ROOMS = {"Rainer": "Stage", "Fliege": "Kitchen"}
+
+
+# ----- Door policies: (time, animatronics, power) -> door Hall/Office closed? -----
+def policy_never(t, animatronics, power):
+    return False
+
+
+def policy_always(t, animatronics, power):
+    return True
+
+
+def policy_threat(t, animatronics, power):
+    """Close the door only while someone is next to or heading into the office."""
+    game = animatronics[0].game
+    corner = game.graph.ids["HallCorner"]
+    for a in animatronics:
+        if a.room == corner:
+            return True
+        if a.transitioning and a.target == game.player_room_id:
+            return True
+    return False
+
+
+POLICIES = {
+    "never": policy_never,
+    "always": policy_always,
+    "threat": policy_threat,
+}
+
+
+def simulate_night(seed, policy=policy_threat, dt=SIM_DT, night_length=world.NIGHT_LENGTH,
+                   camera_on=False, sprites=None):
+    """
+    One night with the game's fixed-step update order (power, door rules, animatronics).
+    Returns a dict with survived, time_of_death, culprit, final_power,
+    blackout_time and power_curve (one sample per simulated second).
+    """
+    doors = world.make_doors()
+    clock = {"t": 0.0}
+    events = Scheduler()
+    power_model = world.PowerModel(doors, clock=lambda: clock["t"], camera_on=camera_on,
+                                   scheduler=events)
+    game = GameContext(
+        rooms=world.make_rooms(),
+        room_connections=world.ROOM_CONNECTIONS,
+        camera_order=list(world.ROOM_WAYPOINTS),
+        anim_img=None,
+        player_room=world.PLAYER_ROOM,
+        door_checker=doors.is_closed,
+        get_power=power_model.level,
+        sprites=sprites if sprites is not None else SpriteAtlas(),
+        doors=doors,
+        rng=random.Random(seed),
+    )
+    animatronics = [Animatronic(name, START_ROOMS[name], game, route=ANIMATRONIC_PATHS[name])
+                    for name in START_ROOMS]
+
+    steps = int(round(night_length / dt))
+    sample_every = max(1, int(round(1.0 / dt)))
+    power_curve = [world.MAX_POWER]
+    power = world.MAX_POWER
+    door_closed = False
+    for step in range(1, steps + 1):
+        if not power_model.blacked_out:
+            closed = policy(clock["t"], animatronics, power)
+            if closed != door_closed:
+                doors.set("Hall", "Office", closed)
+                door_closed = closed
+
+        clock["t"] = t = step * dt
+        events.run_until(t)
+        power = power_model.level(t)   # the blackout itself is a scheduled event
+        for a in animatronics:
+            a.update(dt)
+            if a.room == game.player_room_id and a.state == "jumpscare":
+                power_curve.append(power)
+                return {"seed": seed, "survived": False, "time_of_death": round(t, 3),
+                        "culprit": a.name, "final_power": power, "power_curve": power_curve,
+                        "blackout_time": _blackout(power_model)}
+
+        if step % sample_every == 0:
+            power_curve.append(power)
+
+    return {"seed": seed, "survived": True, "time_of_death": None,
+            "culprit": None, "final_power": power, "power_curve": power_curve,
+            "blackout_time": _blackout(power_model)}
+
+
+def _blackout(power_model):
+    """Blackout time if it happened, else when it would happen with the last drain."""
+    t = power_model.blackout_time()
+    return round(t, 3) if t != float("inf") else None
+
+
+def simulate(nights, seed=0, policy=policy_threat, dt=SIM_DT, camera_on=False, quiet=True):
+    """Run `nights` nights with seeds seed, seed+1, ...; returns the list of results."""
+    sprites = SpriteAtlas()  # never drawn, shared so nights do not rebuild it
+    with GAME_LOG.muted("ai") if quiet else contextlib.nullcontext():
+        return [simulate_night(seed + i, policy, dt, camera_on=camera_on, sprites=sprites)
+                for i in range(nights)]
+
+
+def blackout_check():
+    """
+    The blackout fires exactly once, also when the camera and the door keep
+    changing afterwards (scheduled and update() mode). Returns the blackout time.
+    """
+    for scheduled in (True, False):
+        doors = world.make_doors()
+        clock = {"t": 0.0}
+        events = Scheduler() if scheduled else None
+        power_model = world.PowerModel(doors, clock=lambda: clock["t"], scheduler=events)
+        fired = []
+        power_model.on_blackout(fired.append)
+        due = power_model.blackout_time()
+
+        def run_to(t):
+            clock["t"] = t
+            if events is not None:
+                events.run_until(t)
+            power_model.update()
+
+        run_to(due + 1.0)
+        for i in range(1, 6):
+            power_model.set_camera(i % 2 == 1)
+            doors.toggle("Hall", "Office")
+            run_to(due + 100.0 * i)
+        if fired != [due]:
+            raise AssertionError(f"blackout listeners fired at {fired}, expected once at {due}")
+        if power_model.level() != 0 or doors.closed_count:
+            raise AssertionError("power or doors came back after the blackout")
+    return due
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def summarize(results):
+    deaths = [r for r in results if not r["survived"]]
+    summary = {
+        "nights": len(results),
+        "survived": len(results) - len(deaths),
+        "survival_rate": (len(results) - len(deaths)) / max(1, len(results)),
+        "culprits": dict(Counter(r["culprit"] for r in deaths)),
+        "mean_time_of_death": (sum(r["time_of_death"] for r in deaths) / len(deaths)) if deaths else None,
+        "mean_final_power": sum(r["final_power"] for r in results) / max(1, len(results)),
+        "blackouts": sum(1 for r in results if r["final_power"] <= 0),
+        "mean_blackout_time": _mean([r["blackout_time"] for r in results
+                                     if r["final_power"] <= 0 and r["blackout_time"] is not None]),
+    }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate nights without a window.")
+    parser.add_argument("--nights", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="threat")
+    parser.add_argument("--dt", type=float, default=SIM_DT,
+                        help=f"fixed timestep in seconds (game step: {SIM_STEP:.6f})")
+    parser.add_argument("--camera", action="store_true", help="cameras on for the whole night")
+    parser.add_argument("--json", help="write every night (incl. power curves) to this file")
+    parser.add_argument("--verbose", action="store_true", help="echo every AI event")
+    parser.add_argument("--check", action="store_true", help="run the regression checks and exit")
+    args = parser.parse_args(argv)
+    if args.check:
+        print(f"[OK] blackout fires once (at {blackout_check():.1f}s)")
+        return 0
+    if args.verbose:
+        GAME_LOG.set_level(DEBUG, "ai")
+        GAME_LOG.echo_level = DEBUG
+        GAME_LOG.start()
+
+    start = time.perf_counter()
+    results = simulate(args.nights, args.seed, POLICIES[args.policy], args.dt,
+                       camera_on=args.camera, quiet=not args.verbose)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+
+    print(f"[INFO] {args.nights} nights, policy '{args.policy}', dt {args.dt:.4f}s: "
+          f"{elapsed:.2f}s ({args.nights / max(elapsed, 1e-9) * 60:.0f} nights/min)")
+    print(f"[INFO] survived {summary['survived']}/{summary['nights']} ({summary['survival_rate']:.1%}), "
+          f"blackouts {summary['blackouts']}, mean final power {summary['mean_final_power']:.1f}")
+    if summary["mean_blackout_time"] is not None:
+        print(f"[INFO] mean blackout at {summary['mean_blackout_time']:.1f}s")
+    if summary["culprits"]:
+        print(f"[INFO] deaths by {summary['culprits']}, mean time of death "
+              f"{summary['mean_time_of_death']:.1f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "summary": summary, "nights": results}, f)
+        print(f"[INFO] Wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    sys.exit(main())
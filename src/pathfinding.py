@@ -0,0 +1,108 @@
+"""
+Door-aware pathfinding over the compiled RoomGraph.
+All-pairs shortest paths (BFS per source room) with next-hop tables are
+built once; when a door opens or closes only the source rows whose paths
+can change are rebuilt. Every AI lookup is two list indexings.
+"""
+from collections import deque
+
+UNREACHABLE = -1
+
+
+class PathFinder:
+    """
+    `door_closed(a, b)` answers by room id; `door_pairs` are the id pairs
+    that actually have a door (all edges if None).
+    """
+    def __init__(self, graph, door_closed, door_pairs=None):
+        self.graph = graph
+        self.door_closed = door_closed
+        n = len(graph)
+        if door_pairs is None:
+            door_pairs = {(a, b) for a in range(n) for b in graph.neighbors[a] if a < b}
+        self.door_pairs = [tuple(sorted(pair)) for pair in door_pairs]
+        self._closed = {pair: bool(door_closed(*pair)) for pair in self.door_pairs}
+
+        self.dist = [[UNREACHABLE] * n for _ in range(n)]
+        self.next_hop = [[UNREACHABLE] * n for _ in range(n)]
+        self.parent = [[UNREACHABLE] * n for _ in range(n)]
+        self.rebuilt_rows = 0
+        for source in range(n):
+            self._build_row(source)
+
+    def _blocked(self, a, b):
+        return self._closed.get((a, b) if a < b else (b, a), False)
+
+    def _build_row(self, source):
+        """BFS from `source` over open edges; fills dist/next_hop/parent of that row."""
+        n = len(self.graph)
+        dist, hop, parent = [UNREACHABLE] * n, [UNREACHABLE] * n, [UNREACHABLE] * n
+        dist[source] = 0
+        hop[source] = source
+        queue = deque([source])
+        neighbors = self.graph.neighbors
+        while queue:
+            room = queue.popleft()
+            for other in neighbors[room]:
+                if dist[other] != UNREACHABLE or self._blocked(room, other):
+                    continue
+                dist[other] = dist[room] + 1
+                parent[other] = room
+                hop[other] = other if room == source else hop[room]
+                queue.append(other)
+        self.dist[source], self.next_hop[source], self.parent[source] = dist, hop, parent
+        self.rebuilt_rows += 1
+
+    # ----------------------------------------------------
+
+    def set_door(self, a, b, closed):
+        """Apply one door change; rebuilds only the rows it can affect. Returns their count."""
+        pair = (a, b) if a < b else (b, a)
+        if self._closed.get(pair, False) == closed:
+            return 0
+        self._closed[pair] = closed
+        edges = [(u, v) for u, v in (pair, pair[::-1]) if v in self.graph.neighbors[u]]
+        affected = []
+        for source in range(len(self.graph)):
+            dist, parent = self.dist[source], self.parent[source]
+            for u, v in edges:
+                if closed:
+                    # closing only matters if the edge is part of this BFS tree
+                    hit = parent[v] == u
+                else:
+                    # opening matters if it is a shortcut
+                    hit = dist[u] != UNREACHABLE and (dist[v] == UNREACHABLE or dist[u] + 1 < dist[v])
+                if hit:
+                    affected.append(source)
+                    break
+        for source in affected:
+            self._build_row(source)
+        return len(affected)
+
+    def refresh(self):
+        """Poll the door pairs (not the whole map) and apply what changed."""
+        rebuilt = 0
+        for pair in self.door_pairs:
+            closed = bool(self.door_closed(*pair))
+            if closed != self._closed[pair]:
+                rebuilt += self.set_door(pair[0], pair[1], closed)
+        return rebuilt
+
+    # ----------------------------------------------------
+
+    def step(self, room, goal):
+        """Next room on a shortest open path from `room` to `goal`, or UNREACHABLE."""
+        return self.next_hop[room][goal]
+
+    def distance(self, room, goal):
+        return self.dist[room][goal]
+
+    def path(self, room, goal):
+        """Full room-id path (UI/debugging; the AI only needs step())."""
+        if self.dist[room][goal] == UNREACHABLE:
+            return []
+        rooms = [room]
+        while room != goal:
+            room = self.next_hop[room][goal]
+            rooms.append(room)
+        return rooms
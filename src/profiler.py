@@ -0,0 +1,164 @@
+"""
+Frame-Profiler für die Hauptschleife.
+Die Schleife setzt Zwischenmarken (mark("ai"), mark("present") ...); die Zeit
+seit der vorigen Marke wird der genannten Sektion des laufenden Frames
+gutgeschrieben. Pro Sektion bleiben die letzten Frames für min/avg/p99
+erhalten, optional wird jeder Frame als CSV-Zeile geschrieben. Ausgeschaltet
+sind frame() und mark() leere Funktionen - ein Aufruf, sonst nichts.
+"""
+import csv
+import time
+from collections import deque
+import pygame
+from fonts import PIXEL_FONT, render_text
+
+PROFILE_WINDOW = 240       # Frames für min/avg/p99 und den Graphen
+FRAME_BUDGET_MS = 1000.0 / 60.0
+STATS_REFRESH = 30         # Frames zwischen zwei Text-Aktualisierungen des Overlays
+
+SECTION_COLORS = [
+    (90, 90, 90), (220, 80, 80), (80, 200, 120), (90, 140, 240), (230, 190, 60),
+    (200, 90, 220), (60, 210, 210), (240, 140, 60), (160, 160, 240), (150, 220, 90),
+]
+
+
+def _noop(*args):
+    pass
+
+
+def _color(index):
+    return SECTION_COLORS[index % len(SECTION_COLORS)]
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class FrameProfiler:
+    """Lap-style section timer; `sections` fixes the order of graph and CSV columns."""
+    def __init__(self, sections, window=PROFILE_WINDOW):
+        self.sections = list(sections)
+        self.window = window
+        self.enabled = False
+        self.visible = False
+        self.frames = 0
+        self.history = {name: deque(maxlen=window) for name in self.sections}
+        self.totals = deque(maxlen=window)
+        self._current = dict.fromkeys(self.sections, 0.0)
+        self._frame_start = None
+        self._last = 0.0
+        self._csv_file = None
+        self._csv = None
+        self._stats_lines = []
+        self.frame = self.mark = _noop
+
+    # --- ein/aus ---
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.frame, self.mark = self._frame, self._mark
+        else:
+            self.frame = self.mark = _noop
+            self._frame_start = None
+            self.visible = False
+
+    def toggle_overlay(self):
+        """Hotkey: overlay on/off (turns measuring on with it, unless a CSV keeps it running)."""
+        self.visible = not self.visible
+        if self.visible:
+            self.set_enabled(True)
+        elif self._csv is None:
+            self.set_enabled(False)
+
+    def start_csv(self, path):
+        """Streams one row per frame: frame, total_ms, one column per section."""
+        self._csv_file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(["frame", "total_ms"] + self.sections)
+        self.set_enabled(True)
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = self._csv = None
+
+    # --- Messung (nur aktiv gebunden, wenn enabled) ---
+    def _frame(self):
+        """Closes the previous frame and starts a new one (top of the main loop)."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            current = self._current
+            total = (now - self._frame_start) * 1000.0
+            for name in self.sections:
+                self.history[name].append(current[name])
+            self.totals.append(total)
+            if self._csv is not None:
+                self._csv.writerow([self.frames, f"{total:.3f}"] + [f"{current[n]:.3f}" for n in self.sections])
+            self.frames += 1
+            self._current = dict.fromkeys(self.sections, 0.0)
+        self._frame_start = self._last = now
+
+    def _mark(self, name):
+        """Books the time since the previous mark to `name` (accumulates within a frame)."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._current[name] = self._current.get(name, 0.0) + (now - self._last) * 1000.0
+        self._last = now
+
+    # --- Auswertung ---
+    def stats(self, name):
+        """(min, avg, p99) in ms over the rolling window."""
+        values = self.totals if name == "total" else self.history[name]
+        if not values:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(values)
+        return ordered[0], sum(ordered) / len(ordered), _percentile(ordered, 0.99)
+
+    def report(self):
+        lines = [f"Frame profile over {len(self.totals)} frames (min / avg / p99 ms)"]
+        for name in self.sections + ["total"]:
+            lo, avg, p99 = self.stats(name)
+            lines.append(f"    {name:<10} {lo:7.2f} {avg:7.2f} {p99:7.2f}")
+        return "\n".join(lines)
+
+    # --- Overlay ---
+    def draw(self, surface, x=20, y=120, width=480, height=120):
+        """Stacked bar graph of the last frames plus a min/avg/p99 table."""
+        if not self.visible or not self.totals:
+            return
+        panel = pygame.Rect(x, y, width, height + 24 + 22 * (len(self.sections) + 1))
+        shade = pygame.Surface(panel.size, pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 170))
+        surface.blit(shade, panel.topleft)
+
+        # Graph: eine Spalte pro Frame, Sektionen übereinander, Skala = 2 Frame-Budgets
+        scale = height / (2 * FRAME_BUDGET_MS)
+        bar_w = max(1, width // self.window)
+        base = y + height
+        count = len(self.totals)
+        for i in range(count):
+            bx = x + width - (count - i) * bar_w
+            if bx < x:
+                continue
+            top = base
+            for i_section, name in enumerate(self.sections):
+                new_top = max(top - int(self.history[name][i] * scale), y)
+                if new_top < top:
+                    pygame.draw.rect(surface, _color(i_section), (bx, new_top, bar_w, top - new_top))
+                    top = new_top
+        budget_y = base - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(surface, (255, 255, 255), (x, budget_y), (x + width, budget_y))
+
+        # Tabelle nur alle STATS_REFRESH Frames neu (spart Sortieren und Text-Rendering)
+        if not self._stats_lines or self.frames % STATS_REFRESH == 0:
+            self._stats_lines = []
+            for i_section, name in enumerate(self.sections + ["total"]):
+                lo, avg, p99 = self.stats(name)
+                color = _color(i_section) if name != "total" else (255, 255, 255)
+                self._stats_lines.append((f"{name:<8}{lo:6.1f}{avg:6.1f}{p99:6.1f}", color))
+        ty = base + 8
+        for text, color in self._stats_lines:
+            surface.blit(render_text(PIXEL_FONT, 18, text, color), (x + 8, ty))
+            ty += 22
@@ -1,34 +1,171 @@
 
 import pygame
 import random
+import time
+import math
+from fonts import render_text, dynamic_text
 
-def present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H):
-    """Skaliert die Offscreen-Fläche verlustfrei auf das Fenster und letterboxt."""
-    w, h = WINDOW.get_size()
+PRESENT_SMOOTH = "smooth"
+PRESENT_NEAREST = "nearest"
+PRESENT_QUALITY = PRESENT_SMOOTH
+
+# Vorab angelegtes Skalierziel, wird nur bei Fenstergröße-Änderung neu gebaut
+_present_cache = {"size": None, "target": None, "rect": None, "bars": []}
+PRESENT_STATS = {"last_ms": 0.0, "avg_ms": 0.0, "frames": 0}
+
+def set_present_quality(mode):
+    """Wählt den Skalierfilter: 'smooth' (bilinear) oder 'nearest' (schnell, für schwache Kiosk-PCs)."""
+    global PRESENT_QUALITY
+    if mode not in (PRESENT_SMOOTH, PRESENT_NEAREST):
+        raise ValueError(f"unknown present quality: {mode}")
+    PRESENT_QUALITY = mode
+
+def get_present_quality():
+    return PRESENT_QUALITY
+
+def letterbox(size, VIRTUAL_W, VIRTUAL_H):
+    """(scale, Rect der Spielfläche im Fenster) für eine Fenstergröße."""
+    w, h = size
     scale = min(w / VIRTUAL_W, h / VIRTUAL_H)
     sw, sh = int(VIRTUAL_W * scale), int(VIRTUAL_H * scale)
-    x, y = (w - sw) // 2, (h - sh) // 2
-    frame = pygame.transform.smoothscale(SCREEN, (sw, sh))
-    WINDOW.fill((0, 0, 0))
-    WINDOW.blit(frame, (x, y))
+    return scale, pygame.Rect((w - sw) // 2, (h - sh) // 2, sw, sh)
+
+def _rebuild_present_target(SCREEN, size, VIRTUAL_W, VIRTUAL_H):
+    w, h = size
+    _, rect = letterbox(size, VIRTUAL_W, VIRTUAL_H)
+    x, y, sw, sh = rect
+    # 1:1 braucht kein Zwischenziel, es wird direkt geblittet
+    target = None if (sw, sh) == (VIRTUAL_W, VIRTUAL_H) else pygame.Surface((sw, sh), 0, SCREEN)
+    # Letterbox-Balken (links/rechts bzw. oben/unten)
+    bars = [r for r in (pygame.Rect(0, 0, w, y), pygame.Rect(0, y + sh, w, h - y - sh),
+                        pygame.Rect(0, y, x, sh), pygame.Rect(x + sw, y, w - x - sw, sh))
+            if r.width > 0 and r.height > 0]
+    _present_cache.update(size=size, target=target, rect=rect, bars=bars)
+
+def present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H, quality=None):
+    """Skaliert die Offscreen-Fläche auf das Fenster und letterboxt.
+    Gibt die Dauer in ms zurück (auch in PRESENT_STATS)."""
+    start = time.perf_counter()
+    size = WINDOW.get_size()
+    if _present_cache["size"] != size:
+        _rebuild_present_target(SCREEN, size, VIRTUAL_W, VIRTUAL_H)
+
+    rect = _present_cache["rect"]
+    target = _present_cache["target"]
+    for bar in _present_cache["bars"]:
+        WINDOW.fill((0, 0, 0), bar)
+
+    if target is None:
+        WINDOW.blit(SCREEN, rect.topleft)
+    else:
+        if (quality or PRESENT_QUALITY) == PRESENT_NEAREST:
+            pygame.transform.scale(SCREEN, rect.size, target)
+        else:
+            pygame.transform.smoothscale(SCREEN, rect.size, target)
+        WINDOW.blit(target, rect.topleft)
     pygame.display.flip()
+    return _record_present(start)
+
+def present_rects(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H, rects, quality=None):
+    """Gibt nur die geänderten Bereiche (virtuelle Koordinaten) aus und
+    aktualisiert das Fenster per display.update(rects)."""
+    if _present_cache["size"] != WINDOW.get_size():
+        # neues Fenster: einmal komplett ausgeben
+        return present(SCREEN, WINDOW, VIRTUAL_W, VIRTUAL_H, quality)
+
+    start = time.perf_counter()
+    view = _present_cache["rect"]
+    target = _present_cache["target"]
+    screen_rect = SCREEN.get_rect()
+    sx = view.width / VIRTUAL_W
+    sy = view.height / VIRTUAL_H
+    nearest = (quality or PRESENT_QUALITY) == PRESENT_NEAREST
+    updates = []
+
+    for r in rects:
+        # etwas Rand, damit der bilineare Filter keine Kanten hinterlässt
+        r = pygame.Rect(r).inflate(4, 4).clip(screen_rect)
+        if target is None:
+            WINDOW.blit(SCREEN, (view.x + r.x, view.y + r.y), r)
+            updates.append(r.move(view.topleft))
+            continue
+
+        x0, y0 = int(r.left * sx), int(r.top * sy)
+        x1, y1 = min(view.width, math.ceil(r.right * sx)), min(view.height, math.ceil(r.bottom * sy))
+        dst = pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        if dst.width <= 0 or dst.height <= 0:
+            continue
+        sx0, sy0 = int(x0 / sx), int(y0 / sy)
+        src = pygame.Rect(sx0, sy0, math.ceil(x1 / sx) - sx0, math.ceil(y1 / sy) - sy0).clip(screen_rect)
+        if nearest:
+            pygame.transform.scale(SCREEN.subsurface(src), dst.size, target.subsurface(dst))
+        else:
+            pygame.transform.smoothscale(SCREEN.subsurface(src), dst.size, target.subsurface(dst))
+        WINDOW.blit(target, (view.x + dst.x, view.y + dst.y), dst)
+        updates.append(dst.move(view.topleft))
+
+    if updates:
+        pygame.display.update(updates)
+    return _record_present(start)
+
+def _record_present(start):
+    ms = (time.perf_counter() - start) * 1000.0
+    PRESENT_STATS["last_ms"] = ms
+    PRESENT_STATS["avg_ms"] += (ms - PRESENT_STATS["avg_ms"]) * 0.05
+    PRESENT_STATS["frames"] += 1
+    return ms
 
 def window_to_virtual(pos, WINDOW, VIRTUAL_W, VIRTUAL_H):
     """Mappt Fensterkoordinaten auf virtuelle 1920x1080-Koordinaten."""
     mx, my = pos
-    w, h = WINDOW.get_size()
-    scale = min(w / VIRTUAL_W, h / VIRTUAL_H)
-    sw, sh = int(VIRTUAL_W * scale), int(VIRTUAL_H * scale)
-    ox, oy = (w - sw) // 2, (h - sh) // 2
-    inside = (ox <= mx < ox + sw) and (oy <= my < oy + sh)
-    vx = (mx - ox) / scale
-    vy = (my - oy) / scale
+    scale, view = letterbox(WINDOW.get_size(), VIRTUAL_W, VIRTUAL_H)
+    inside = view.collidepoint(mx, my)
+    vx = (mx - view.x) / scale
+    vy = (my - view.y) / scale
     return int(vx), int(vy), inside
 
-def apply_aspect(mode, compute_window_size):
+class Viewport:
+    """
+    Letterbox transform window -> virtual coordinates, computed once per window size.
+    Call update() on VIDEORESIZE and after apply_aspect(); to_virtual()/mouse() only map.
+    """
+    def __init__(self, VIRTUAL_W, VIRTUAL_H, size=None):
+        self.virtual_size = (VIRTUAL_W, VIRTUAL_H)
+        self.size = None
+        self.scale = 1.0
+        self.rect = pygame.Rect(0, 0, VIRTUAL_W, VIRTUAL_H)
+        if size is not None:
+            self.update(size)
+
+    def update(self, size):
+        """Neue Fenstergröße (Tupel oder Fenster-Surface); gleiche Größe kostet nichts."""
+        if hasattr(size, "get_size"):
+            size = size.get_size()
+        size = tuple(size)
+        if size == self.size:
+            return False
+        self.size = size
+        self.scale, self.rect = letterbox(size, *self.virtual_size)
+        return True
+
+    def to_virtual(self, pos):
+        """(vx, vy, inside) für eine Fensterposition."""
+        mx, my = pos
+        view = self.rect
+        return int((mx - view.x) / self.scale), int((my - view.y) / self.scale), view.collidepoint(mx, my)
+
+    def mouse(self):
+        return self.to_virtual(pygame.mouse.get_pos())
+
+def apply_aspect(mode, compute_window_size, viewport=None):
     """Setzt das Fenster neu im gewünschten Seitenverhältnis."""
     WINDOW_W, WINDOW_H = compute_window_size(mode)
-    return pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+    window = pygame.display.set_mode((WINDOW_W, WINDOW_H), pygame.RESIZABLE)
+    # convert()-Overlays hängen am Pixelformat des Fensters
+    OVERLAYS.invalidate()
+    if viewport is not None:
+        viewport.update(window)
+    return window
 
 def create_scanline_surface(width, height):
     """Erzeugt Scanline-Overlay für Kamera-Effekt."""
@@ -39,64 +176,123 @@ def create_scanline_surface(width, height):
     surf.set_alpha(40)
     return surf
 
+def create_vignette_surface(width, height):
+    """Erzeugt die leichte Vignette am Bildrand."""
+    vignette = pygame.Surface((width, height), pygame.SRCALPHA)
+    for i in range(0, 255, 15):
+        pygame.draw.rect(vignette, (0, 0, 0, i // 8),
+                         (i // 6, i // 6, width - i // 3, height - i // 3), 5)
+    return vignette
+
+def create_fill_surface(width, height, color, alpha):
+    """Einfarbige Vollbild-Fläche mit fester Transparenz (Blackout, Boot-Static, Flicker, Menü)."""
+    surf = pygame.Surface((width, height)).convert()
+    surf.fill(color)
+    surf.set_alpha(alpha)
+    return surf
+
+
+class OverlayCache:
+    """
+    Baut die Vollbild-Overlays einmal pro (width, height) und reicht fertige
+    Flächen zum Blitten raus. Varianten mit Zufalls-Alpha kommen aus einem
+    kleinen, vorab gebauten Pool statt aus neuen Surfaces pro Frame.
+    """
+    POOL_SIZE = 8
+
+    def __init__(self):
+        self.size = None
+        self._layers = {}
+
+    def invalidate(self):
+        """Verwirft alle Layer (z.B. nach Größenänderung)."""
+        self._layers.clear()
+        self.size = None
+
+    def _get(self, name, width, height, build):
+        if self.size != (width, height):
+            self.invalidate()
+            self.size = (width, height)
+        layer = self._layers.get(name)
+        if layer is None:
+            layer = build(width, height)
+            self._layers[name] = layer
+        return layer
+
+    def scanlines(self, width, height):
+        return self._get("scanlines", width, height, create_scanline_surface)
+
+    def vignette(self, width, height):
+        return self._get("vignette", width, height, create_vignette_surface)
+
+    def blackout(self, width, height):
+        return self._get("blackout", width, height,
+                         lambda w, h: create_fill_surface(w, h, (0, 0, 0), 180))
+
+    def dim(self, width, height):
+        """Abdunklung hinter dem Hauptmenü."""
+        return self._get("dim", width, height,
+                         lambda w, h: create_fill_surface(w, h, (0, 0, 0), 80))
+
+    def boot(self, width, height):
+        """Schwarzes Boot-Overlay mit zufälliger Deckkraft (160-220)."""
+        pool = self._get("boot", width, height, lambda w, h: [
+            create_fill_surface(w, h, (0, 0, 0), 160 + (60 * i) // (self.POOL_SIZE - 1))
+            for i in range(self.POOL_SIZE)
+        ])
+        return random.choice(pool)
+
+    def flicker(self, width, height):
+        """Grauer Flacker-Layer mit zufälliger Helligkeit und Deckkraft."""
+        pool = self._get("flicker", width, height, lambda w, h: [
+            create_fill_surface(w, h, (b, b, b), random.randint(20, 60))
+            for b in (random.randint(15, 40) for _ in range(self.POOL_SIZE))
+        ])
+        return random.choice(pool)
+
+    def hud_panel(self, width, height):
+        """Halbtransparenter Hintergrund der Status-UI (280x100, oben rechts)."""
+        def build(w, h):
+            panel = pygame.Surface((280, 100), pygame.SRCALPHA)
+            panel.fill((10, 10, 10, 120))
+            return panel
+        return self._get("hud_panel", width, height, build)
+
+
+OVERLAYS = OverlayCache()
+
 def draw_ui(SCREEN, WIDTH, HEIGHT, night_timer, power, is_door_closed):
     """Zeichnet die Status-UI (Zeit, Türstatus, Power)."""
-    ui_font = pygame.font.SysFont("Arial", 26)
-    panel = pygame.Surface((280, 100), pygame.SRCALPHA)
-    panel.fill((10, 10, 10, 120))
-    SCREEN.blit(panel, (WIDTH - 300, 15))
+    SCREEN.blit(OVERLAYS.hud_panel(WIDTH, HEIGHT), (WIDTH - 300, 15))
     info_x = WIDTH - 280
     info_y = 25
-    timer_text = ui_font.render(f"TIME LEFT: {int(night_timer)}s", True, (220, 220, 220))
+    timer_text = dynamic_text("timer", "Arial", 26, f"TIME LEFT: {int(night_timer)}s", (220, 220, 220))
     SCREEN.blit(timer_text, (info_x, info_y))
     info_y += 28
     door_text = "CLOSED" if is_door_closed else "OPEN"
     door_color = (255, 60, 60) if door_text == "CLOSED" else (100, 255, 100)
-    door_label = ui_font.render(f"DOOR: {door_text}", True, door_color)
+    door_label = render_text("Arial", 26, f"DOOR: {door_text}", door_color)
     SCREEN.blit(door_label, (info_x, info_y))
     info_y += 28
     power_color = (220, 220, 220) if power > 20 else (255, 50, 50)
-    power_label = ui_font.render(f"POWER: {power:.0f}%", True, power_color)
+    power_label = dynamic_text("power", "Arial", 26, f"POWER: {power:.0f}%", power_color)
     SCREEN.blit(power_label, (info_x, info_y))
 
-def draw_camera_overlay(surface, WIDTH, HEIGHT, SCANLINE_OVERLAY, camera_name, booting=False):
-    """Zeichnet Kamera-Overlay (Scanlines, REC, Booting-Effekt)."""
-    surface.blit(SCANLINE_OVERLAY, (0, 0))
-    vignette = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    for i in range(0, 255, 15):
-        pygame.draw.rect(vignette, (0, 0, 0, i // 8),
-                         (i // 6, i // 6, WIDTH - i // 3, HEIGHT - i // 3), 5)
-    surface.blit(vignette, (0, 0))
-    rec_font = pygame.font.SysFont("Arial", 28)
-    rec_text = rec_font.render("REC", True, (255, 40, 40))
-    surface.blit(rec_text, (50, 40))
-    pygame.draw.circle(surface, (255, 0, 0), (130, 50), 8)
-    if booting:
-        signal_font = pygame.font.SysFont("Arial", 38)
-        signal_label = signal_font.render("SIGNAL LOST", True, (255, 255, 255))
-        surface.blit(signal_label, (WIDTH // 2 - signal_label.get_width() // 2,
-                                    HEIGHT // 2 - signal_label.get_height() // 2))
-        boot_overlay = pygame.Surface((WIDTH, HEIGHT))
-        boot_overlay.fill((0, 0, 0))
-        boot_overlay.set_alpha(random.randint(160, 220))
-        surface.blit(boot_overlay, (0, 0))
-
-
-def draw_camera_hover_bar(screen, WIDTH, HEIGHT, camera_active, camera_bar_y, camera_bar_target_y, dt):
-    """Zeichnet die Hover-Bar für Kamera unten und toggelt bei Hover."""
+def camera_hover_bar_state(HEIGHT, camera_bar_y, dt):
+    """Berechnet Hover-Zustand und neue Y-Position der Kamera-Bar (ohne zu zeichnen)."""
     bar_height = 80
     hover_zone = HEIGHT - 120  # Bereich für Hover
     mx, my = pygame.mouse.get_pos()
     # Maus in virtuelle Koordinaten umrechnen (falls nötig)
     hovering = my >= hover_zone
-    # Toggle bei Hover
-    if hovering:
-        camera_active = True
-    else:
-        camera_active = False
-
-    camera_bar_target_y = HEIGHT - (bar_height if camera_active else 20)
+    camera_bar_target_y = HEIGHT - (bar_height if hovering else 20)
     camera_bar_y += (camera_bar_target_y - camera_bar_y) * min(dt * 10, 1)
+    return hovering, camera_bar_y
+
+def draw_camera_hover_bar(screen, WIDTH, HEIGHT, camera_active, camera_bar_y, camera_bar_target_y, dt):
+    """Zeichnet die Hover-Bar für Kamera unten und toggelt bei Hover."""
+    bar_height = 80
+    camera_active, camera_bar_y = camera_hover_bar_state(HEIGHT, camera_bar_y, dt)
     bar_rect = pygame.Rect(0, camera_bar_y, WIDTH, bar_height)
     pygame.draw.rect(screen, (25, 25, 25), bar_rect)
     arrow_y = camera_bar_y + 25
@@ -0,0 +1,91 @@
+"""
+Central scheduler for game timers.
+Subsystems register one-shot and repeating callbacks against game time; each
+frame only the callbacks that are due run (min-heap, cancelled timers are
+dropped lazily). Supports pause, time scaling and fast-forward.
+"""
+import heapq
+import itertools
+
+
+class Timer:
+    __slots__ = ("due", "interval", "callback", "args", "cancelled")
+
+    def __init__(self, due, interval, callback, args):
+        self.due = due
+        self.interval = interval    # None for one-shot timers
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Callbacks keyed by game time. `time` only moves through advance()/run_until()."""
+    def __init__(self, time=0.0):
+        self.time = time
+        self.paused = False
+        self.time_scale = 1.0
+        self.fired = 0
+        self._heap = []
+        self._seq = itertools.count()   # FIFO order for timers due at the same time
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self._heap if not timer.cancelled)
+
+    # --- registering ---
+    def at(self, time, callback, *args):
+        """One-shot at absolute game time."""
+        timer = Timer(time, None, callback, args)
+        heapq.heappush(self._heap, (time, next(self._seq), timer))
+        return timer
+
+    def after(self, delay, callback, *args):
+        """One-shot `delay` seconds from now."""
+        return self.at(self.time + delay, callback, *args)
+
+    def every(self, interval, callback, *args, delay=None):
+        """Repeating every `interval` seconds (first run after `delay`, default one interval)."""
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        timer = Timer(self.time + (interval if delay is None else delay), interval, callback, args)
+        heapq.heappush(self._heap, (timer.due, next(self._seq), timer))
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.cancel()
+
+    # --- running ---
+    def run_until(self, time):
+        """Fire everything due up to `time` in order; callbacks see `self.time` == their due time."""
+        heap = self._heap
+        while heap and heap[0][0] <= time:
+            due, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            self.time = due
+            timer.callback(*timer.args)
+            self.fired += 1
+            if timer.interval is not None and not timer.cancelled:
+                timer.due = due + timer.interval
+                heapq.heappush(heap, (timer.due, next(self._seq), timer))
+        self.time = max(self.time, time)
+
+    def advance(self, dt):
+        """Move game time by dt (scaled; nothing happens while paused)."""
+        if not self.paused:
+            self.run_until(self.time + dt * self.time_scale)
+
+    def fast_forward(self, seconds):
+        """Skip ahead regardless of pause/scale; every due callback still runs, in order."""
+        self.run_until(self.time + seconds)
+
+    def next_due(self):
+        """Time of the next pending callback (None if nothing is scheduled)."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
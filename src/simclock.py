@@ -0,0 +1,40 @@
+"""
+Fixed-timestep game clock.
+The renderer feeds in real frame times; the simulation always advances in
+steps of exactly SIM_STEP seconds, so AI behaviour does not depend on the
+frame rate.
+"""
+
+SIM_STEP = 1.0 / 120.0   # 120 Hz simulation
+MAX_CATCH_UP_STEPS = 12  # at most 0.1 s of game time per rendered frame
+
+
+class FixedStepClock:
+    """Accumulates frame time and hands out whole simulation steps."""
+    def __init__(self, step=SIM_STEP, max_steps=MAX_CATCH_UP_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.steps = 0          # simulated steps so far
+        self.dropped = 0.0      # real time thrown away by the catch-up cap
+
+    @property
+    def time(self):
+        """Game time in seconds (the only clock the night runs on)."""
+        return self.steps * self.step
+
+    def advance(self, frame_dt):
+        """Add one frame's real time; returns how many steps to simulate now (call tick() for each)."""
+        self.accumulator += max(frame_dt, 0.0)
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        if steps > self.max_steps:
+            # after a hitch: skip ahead instead of spiralling into ever longer frames
+            self.dropped += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        return steps
+
+    def tick(self):
+        """Moves game time forward by one step; returns the step length."""
+        self.steps += 1
+        return self.step
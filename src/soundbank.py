@@ -0,0 +1,189 @@
+"""
+Sound-Bank mit Manifest und Speicherbudget.
+Lange Loops (Menü-Musik, Hintergrund) werden über pygame.mixer.music von der
+Platte gestreamt und nie ganz dekodiert. Kurze Effekte werden erst beim
+ersten Abspielen (oder per load() auf einem Loader-Thread) dekodiert; gleiche
+Dateien unter mehreren Namen teilen sich einen Sound. Ambient-Sounds, die
+gerade nicht laufen, werden nach LRU verworfen, sobald das Budget voll ist.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from gamelog import get_logger
+from voices import PRIORITY_AMBIENT, PRIORITY_SFX
+
+STREAM, SFX, AMBIENT = "stream", "sfx", "ambient"
+SOUND_BUDGET_BYTES = 6 * 1024 * 1024   # dekodierte PCM-Daten aller SFX/Ambients
+
+LOG = get_logger("audio")
+
+
+def _file_key(path):
+    return os.path.normcase(os.path.realpath(path))
+
+
+def sound_bytes(sound):
+    """Decoded size in mixer format (without copying the samples like get_raw())."""
+    mixer = pygame.mixer.get_init()
+    if mixer is None:
+        return 0
+    freq, fmt, channels = mixer
+    return int(sound.get_length() * freq) * channels * (abs(fmt) // 8)
+
+
+class MusicStream:
+    """Long loop on pygame.mixer.music; offers the part of the Sound API the game uses."""
+    _current = None   # only one stream can play at a time
+
+    def __init__(self, path):
+        self.path = path
+        self.volume = 1.0
+
+    @property
+    def active(self):
+        return MusicStream._current is self
+
+    def play(self, loops=0):
+        pygame.mixer.music.load(self.path)
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops)
+        MusicStream._current = self
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.active:
+            pygame.mixer.music.set_volume(volume)
+
+    def fadeout(self, ms):
+        if self.active:
+            pygame.mixer.music.fadeout(ms)
+
+    def stop(self):
+        if self.active:
+            pygame.mixer.music.stop()
+            MusicStream._current = None
+
+
+class SoundBank:
+    """name -> (path, kind) manifest; handles are decoded or opened on demand."""
+    def __init__(self, manifest=None, budget=SOUND_BUDGET_BYTES, voices=None):
+        self.budget = budget
+        self.voices = voices            # VoicePool; without one, Sound.play() picks the channel
+        self._entries = {}              # name -> (path, kind)
+        self._sounds = OrderedDict()    # file key -> Sound (LRU order)
+        self._sizes = {}                # file key -> bytes
+        self._streams = {}
+        self._missing = set()
+        self._lock = threading.Lock()
+        self._prefetch = None
+        self.decoded_bytes = 0
+        self.loads = self.hits = self.evictions = 0
+        for name, (path, kind) in (manifest or {}).items():
+            self.register(name, path, kind)
+
+    def register(self, name, path, kind=SFX):
+        self._entries[name] = (path, kind)
+
+    def exists(self, name):
+        return os.path.exists(self._entries[name][0])
+
+    def names(self, kind=None):
+        return [n for n, (_, k) in self._entries.items() if kind is None or k == kind]
+
+    def _decode(self, path):
+        if not os.path.exists(path):
+            LOG.warn("Sound file not found: %s", path)
+            return None
+        try:
+            sound = pygame.mixer.Sound(path)
+            LOG.info("Loaded sound: %s", path)
+            return sound
+        except Exception as e:
+            LOG.error("Could not load sound: %s (%s)", path, e)
+            return None
+
+    def load(self, name):
+        """Decodes `name` now (safe on loader threads) and returns its handle or None."""
+        path, kind = self._entries[name]
+        if kind == STREAM:
+            return self._stream(path)
+        key = _file_key(path)
+        with self._lock:
+            if key in self._missing:
+                return None
+            sound = self._sounds.get(key)
+            if sound is not None:
+                self._sounds.move_to_end(key)
+                self.hits += 1
+                return sound
+        sound = self._decode(path)
+        with self._lock:
+            if sound is None:
+                self._missing.add(key)
+                return None
+            if key in self._sounds:           # ein anderer Thread war schneller
+                return self._sounds[key]
+            self._sounds[key] = sound
+            self._sizes[key] = sound_bytes(sound)
+            self.decoded_bytes += self._sizes[key]
+            self.loads += 1
+        return sound
+
+    get = load
+
+    def _stream(self, path):
+        stream = self._streams.get(path)
+        if stream is None:
+            if not os.path.exists(path):
+                LOG.warn("Sound file not found: %s", path)
+                return None
+            stream = self._streams[path] = MusicStream(path)
+        return stream
+
+    def prefetch(self, name):
+        """Decodes `name` on a background thread (e.g. the next ambient before it is due)."""
+        if self._prefetch is None:
+            self._prefetch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sounds")
+        self._prefetch.submit(self.load, name)
+
+    def play(self, name, volume=1.0, loops=0, priority=None, room=None):
+        """
+        Plays `name` (from `room`, if given, panned and attenuated by the voice pool);
+        returns the channel, None if the sound is missing or was dropped.
+        """
+        sound = self.load(name)
+        if sound is None:
+            return None
+        kind = self._entries[name][1]
+        if self.voices is not None:
+            if priority is None:
+                priority = PRIORITY_AMBIENT if kind == AMBIENT else PRIORITY_SFX
+            channel = self.voices.play(sound, priority, volume=volume, room=room, loops=loops)
+        else:
+            channel = sound.play(loops)
+            if channel:
+                channel.set_volume(volume)
+        if kind == AMBIENT:
+            self.trim()
+        return channel
+
+    def trim(self):
+        """Evicts cold ambients (least recently used first) until the bank fits the budget."""
+        ambient_keys = {_file_key(p) for p, k in self._entries.values() if k == AMBIENT}
+        shared = {_file_key(p) for p, k in self._entries.values() if k != AMBIENT}
+        with self._lock:
+            for key in list(self._sounds):
+                if self.decoded_bytes <= self.budget:
+                    break
+                sound = self._sounds[key]
+                if key not in ambient_keys or key in shared or sound.get_num_channels() > 0:
+                    continue
+                del self._sounds[key]
+                self.decoded_bytes -= self._sizes.pop(key)
+                self.evictions += 1
+
+    def stats(self):
+        return {"decoded_kb": self.decoded_bytes // 1024, "sounds": len(self._sounds),
+                "loads": self.loads, "hits": self.hits, "evictions": self.evictions}
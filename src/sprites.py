@@ -0,0 +1,98 @@
+"""
+Gemeinsamer Sprite-Atlas für Animatronic-Posen.
+Beim Nachtstart wird assets/animatronics/<Name>/ einmal gescannt; der Index
+ignoriert Groß-/Kleinschreibung ("Stage" findet stage.png). Alle Posen werden
+vorab geladen und skaliert und von allen Instanzen geteilt. Fehlende Posen
+werden einmal als Fehltreffer gemerkt und bekommen das Ersatzbild.
+"""
+import os
+import pygame
+from assetpack import ANIMATRONIC_DIR, ANIMATRONIC_SPRITE_SIZE, decode_image, finish_image, load_image
+from gamelog import get_logger
+
+LOG = get_logger("assets")
+
+
+class SpriteAtlas:
+    """Room poses per animatronic, keyed case-insensitively by (name, room)."""
+    def __init__(self, root=ANIMATRONIC_DIR, size=ANIMATRONIC_SPRITE_SIZE, fallback=None):
+        self.root = root
+        self.size = tuple(size)
+        self._fallback_src = fallback
+        self._fallback = None
+        self._index = None     # (name, room) -> path on disk
+        self._sprites = {}     # (name, room) -> surface, None = known miss
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(name, room):
+        return name.lower(), room.lower()
+
+    def scan(self):
+        """Index every *.png below root once; returns the number of poses found."""
+        self._index = {}
+        if os.path.isdir(self.root):
+            for name in sorted(os.listdir(self.root)):
+                folder = os.path.join(self.root, name)
+                if not os.path.isdir(folder):
+                    continue
+                for fname in sorted(os.listdir(folder)):
+                    room, ext = os.path.splitext(fname)
+                    if ext.lower() == ".png":
+                        self._index[self._key(name, room)] = f"{self.root}/{name}/{fname}"
+        return len(self._index)
+
+    def decode_all(self):
+        """Thread-safe part of preload(): scan and decode every pose."""
+        if self._index is None:
+            self.scan()
+        decoded = []
+        for key, path in self._index.items():
+            try:
+                decoded.append((key, decode_image(path, self.size, True, False)))
+            except (pygame.error, OSError) as e:
+                LOG.warn("Sprite %s: %s", path, e)
+        return decoded
+
+    def finish_all(self, decoded):
+        """Main-thread part of preload(): convert and publish the poses."""
+        for key, item in decoded:
+            self._sprites[key] = finish_image(item)
+        return self
+
+    def preload(self):
+        return self.finish_all(self.decode_all())
+
+    def fallback(self):
+        if self._fallback is None:
+            src = self._fallback_src
+            if src is None:
+                src = pygame.Surface((48, 48))
+                src.fill((200, 50, 50))
+            self._fallback = pygame.transform.scale(src, self.size)
+        return self._fallback
+
+    def get(self, name, room):
+        """Pose of `name` in `room`, or the shared fallback image."""
+        key = self._key(name, room)
+        if key in self._sprites:
+            sprite = self._sprites[key]
+            if sprite is not None:
+                self.hits += 1
+                return sprite
+            return self.fallback()
+
+        # nicht vorgeladen: einmal nachschlagen, Ergebnis (auch Fehltreffer) merken
+        self.misses += 1
+        if self._index is None:
+            self.scan()
+        path = self._index.get(key)
+        sprite = None
+        if path is not None:
+            try:
+                sprite = load_image(path, self.size, smooth=False)
+            except (pygame.error, OSError) as e:
+                LOG.warn("Sprite %s: %s", path, e)
+        self._sprites[key] = sprite
+        return sprite if sprite is not None else self.fallback()
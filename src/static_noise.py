@@ -0,0 +1,61 @@
+"""
+Rauschen (Static) für Kamera, Boot-Effekt und Menü.
+Die Quell-Frames (GIF oder prozedural mit NumPy erzeugt) werden einmal pro
+Zielgröße vorskaliert und als Ring-Puffer gehalten; Aufrufer bekommen fertige
+Flächen, die Transparenz ist bereits gesetzt.
+"""
+import numpy as np
+import pygame
+
+NOISE_FRAMES = 8
+NOISE_SOURCE_SIZE = (640, 360)
+
+
+def generate_noise_frames(count=NOISE_FRAMES, size=NOISE_SOURCE_SIZE, seed=None):
+    """Grey TV static with slightly uneven scanline brightness (unconverted surfaces)."""
+    rng = np.random.default_rng(seed)
+    w, h = size
+    frames = []
+    for _ in range(count):
+        grey = rng.integers(0, 256, (w, h), dtype=np.uint8)
+        rows = rng.uniform(0.55, 1.0, (1, h))
+        grey = (grey * rows).astype(np.uint8)
+        frames.append(pygame.surfarray.make_surface(np.repeat(grey[:, :, None], 3, axis=2)))
+    return frames
+
+
+class StaticNoise:
+    """Pre-scaled static frames per target size, handed out ready to blit."""
+    def __init__(self, frames=None):
+        self._source = []
+        self._banks = {}
+        if frames:
+            self.set_source(frames)
+
+    def set_source(self, frames):
+        """Replaces the source frames (converted surfaces) and drops all scaled banks."""
+        self._source = list(frames)
+        self._banks.clear()
+
+    @property
+    def count(self):
+        return max(1, len(self._source))
+
+    def frames(self, size):
+        """All frames scaled to `size`; built once per size."""
+        size = tuple(size)
+        bank = self._banks.get(size)
+        if bank is None:
+            if not self._source:
+                self.set_source([f.convert() for f in generate_noise_frames()])
+            bank = [f if f.get_size() == size else pygame.transform.scale(f, size)
+                    for f in self._source]
+            self._banks[size] = bank
+        return bank
+
+    def frame(self, size, index, alpha=255):
+        """Frame `index` (wraps around) at `size` with `alpha` applied."""
+        bank = self.frames(size)
+        surf = bank[index % len(bank)]
+        surf.set_alpha(max(0, min(255, int(alpha))))
+        return surf
@@ -0,0 +1,113 @@
+"""
+Kanal-Verwaltung für alle Sounds.
+Ein fester Pool von Mixer-Kanälen; jede Stimme hat eine Priorität. Ist der
+Pool voll, wird die älteste Stimme mit der niedrigsten Priorität gestohlen -
+gibt es keine mit gleicher oder niedrigerer Priorität, wird der neue Sound
+verworfen (und gezählt). Sounds mit Quell-Raum werden nach Entfernung zum
+Office leiser und links/rechts gepannt, je nachdem, durch welche Office-Seite
+der kürzeste Weg führt.
+"""
+import itertools
+import pygame
+from collections import deque
+
+PRIORITY_AMBIENT = 1
+PRIORITY_SFX = 2
+PRIORITY_UI = 3
+PRIORITY_JUMPSCARE = 5
+
+VOICE_COUNT = 16
+DISTANCE_FALLOFF = 0.6    # Lautstärke = 1 / (1 + FALLOFF * (Hops - 1)), Office selbst = 1
+PAN_WIDTH = 0.7           # 1.0 = ganz auf einer Seite
+
+
+def _hops(adjacent, source):
+    """BFS hop counts from `source` (-1 = unreachable)."""
+    dist = [-1] * len(adjacent)
+    dist[source] = 0
+    queue = deque([source])
+    while queue:
+        room = queue.popleft()
+        for other in adjacent[room]:
+            if dist[other] < 0:
+                dist[other] = dist[room] + 1
+                queue.append(other)
+    return dist
+
+
+class RoomAcoustics:
+    """Per-room gain and pan as heard from the listener room (doors and edge direction ignored)."""
+    def __init__(self, graph, listener, sides):
+        n = len(graph)
+        # Schall geht in beide Richtungen, auch wo ROOM_CONNECTIONS nur eine Richtung kennt
+        adjacent = [[j for j in range(n) if j != i and (graph.adjacency[i][j] or graph.adjacency[j][i])]
+                    for i in range(n)]
+        side_of = {graph.ids[name]: side for name, side in sides.items()}
+        dist = _hops(adjacent, listener)
+        doorways = {m: _hops(adjacent, m) for m in adjacent[listener]}
+        self.gain = [0.0] * n
+        self.pan = [0.0] * n
+        for room in range(n):
+            hops = dist[room]
+            if hops < 0:
+                continue
+            self.gain[room] = 1.0 if hops <= 1 else 1.0 / (1.0 + DISTANCE_FALLOFF * (hops - 1))
+            if hops == 0:
+                continue
+            # alle Office-Zugänge, durch die ein kürzester Weg ins Office führt
+            entries = [side_of.get(m, 0.0) for m, d in doorways.items() if d[room] == hops - 1]
+            self.pan[room] = PAN_WIDTH * sum(entries) / len(entries) if entries else 0.0
+
+    def volumes(self, room, volume=1.0):
+        """(left, right) channel volumes for a sound from `room`."""
+        gain = self.gain[room] * volume
+        pan = self.pan[room]
+        return gain * min(1.0, 1.0 - pan), gain * min(1.0, 1.0 + pan)
+
+
+class VoicePool:
+    """Owns mixer channels 0..count-1 and hands them out by priority."""
+    def __init__(self, count=VOICE_COUNT, acoustics=None):
+        pygame.mixer.set_num_channels(count)
+        pygame.mixer.set_reserved(count)   # plain Sound.play() never grabs a pool channel
+        self.channels = [pygame.mixer.Channel(i) for i in range(count)]
+        self.acoustics = acoustics
+        self._voices = [None] * count      # (priority, seq) of the last sound per channel
+        self._seq = itertools.count()
+        self.played = self.stolen = self.dropped = 0
+
+    def _pick(self, priority):
+        """Free channel index, else the stealable one; None if every voice outranks `priority`."""
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i, False
+            voice = self._voices[i]
+            if voice is not None and voice[0] <= priority and (victim is None or voice < self._voices[victim]):
+                victim = i
+        return victim, victim is not None
+
+    def play(self, sound, priority=PRIORITY_SFX, volume=1.0, room=None, pan=0.0, loops=0):
+        """Plays `sound` on a pool channel; returns the channel, or None if it was dropped."""
+        index, steal = self._pick(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[index]
+        if steal:
+            channel.stop()
+            self.stolen += 1
+        channel.play(sound, loops)
+        if room is not None and self.acoustics is not None:
+            channel.set_volume(*self.acoustics.volumes(room, volume))
+        else:
+            channel.set_volume(volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan))
+        self._voices[index] = (priority, next(self._seq))
+        self.played += 1
+        return channel
+
+    def busy(self):
+        return sum(1 for channel in self.channels if channel.get_busy())
+
+    def stats(self):
+        return {"played": self.played, "stolen": self.stolen, "dropped": self.dropped, "busy": self.busy()}
@@ -0,0 +1,154 @@
+"""
+Retained-Mode-Widgets für das Hauptmenü und seine Unterseiten.
+Widgets werden einmal gebaut; Beschriftungen und Button-Zustände (normal,
+hover, gedrückt) liegen als fertige Flächen bereit und werden nur neu
+gerendert, wenn sich der Text ändert. Das Farbflackern kommt aus einem
+kleinen Pool vorab gebauter Varianten, das Wackeln ist nur ein Blit-Versatz.
+Ein Panel ist ein Bildschirm: seine Buttons stehen als Gruppe im HitIndex.
+"""
+import random
+import pygame
+from fonts import PIXEL_FONT, render_text
+
+NORMAL, HOVER, PRESSED = "normal", "hover", "pressed"
+
+BUTTON_COLORS = {NORMAL: (40, 30, 30), HOVER: (70, 20, 20), PRESSED: (95, 25, 25)}
+BUTTON_FLICKER = (-10, -5, 0, 5, 10)   # Helligkeitsvarianten pro Zustand
+GLOW_COLOR = (255, 30, 30, 35)
+GLOW_MARGIN = 5
+TITLE_VARIANTS = 8                      # vorab gebaute Zufallsfarben für flackernde Labels
+
+
+def _shade(color, delta):
+    return tuple(max(0, min(255, c + delta)) for c in color)
+
+
+def _over(base, glow):
+    """Farbe von `base` unter dem halbtransparenten `glow` (vorab gemischt)."""
+    a = glow[3] / 255.0
+    return tuple(int(b * (1.0 - a) + g * a) for b, g in zip(base, glow[:3]))
+
+
+class Widget:
+    """Something with a rect that draws from cached surfaces; `name` makes it clickable."""
+    name = None
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+
+    def draw(self, surface, hovered=None, pressed=False):
+        pass
+
+
+class Label(Widget):
+    """Text anchored at `midtop`; re-rendered only when set_text() changes it."""
+    def __init__(self, text, size, color, midtop, face=PIXEL_FONT, flicker=0.0):
+        super().__init__((0, 0, 0, 0))
+        self.face, self.size, self.color = face, size, color
+        self.midtop = midtop
+        self.flicker = flicker      # Wahrscheinlichkeit pro Frame für eine Zufallsfarbe
+        self.text = None
+        self.set_text(text)
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        self.surface = render_text(self.face, self.size, text, self.color)
+        self.rect = self.surface.get_rect(midtop=self.midtop)
+        self._variants = [
+            render_text(self.face, self.size, text, tuple(random.randint(150, 255) for _ in range(3)))
+            for _ in range(TITLE_VARIANTS)
+        ] if self.flicker else []
+
+    def draw(self, surface, hovered=None, pressed=False):
+        if self._variants and random.random() < self.flicker:
+            surface.blit(random.choice(self._variants), self.rect)
+        else:
+            surface.blit(self.surface, self.rect)
+
+
+class Button(Widget):
+    """Rounded button with flickering fill, glow and a shaking label while hovered."""
+    def __init__(self, name, rect, text, size=28, face=PIXEL_FONT, color=(220, 220, 220)):
+        super().__init__(rect)
+        self.name = name
+        self.face, self.size, self.color = face, size, color
+        self.text = None
+        self._states = {}           # Zustand -> [(Fläche, Position), ...] je Flacker-Variante
+        self.set_text(text)
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        self.label = render_text(self.face, self.size, text, self.color)
+        self.label_pos = (self.rect.centerx - self.label.get_width() // 2,
+                          self.rect.centery - self.label.get_height() // 2)
+
+    def _build(self, state):
+        """Fill variants for one state; hover/pressed include the glow around the button."""
+        variants = []
+        glow = state != NORMAL
+        margin = GLOW_MARGIN if glow else 0
+        for delta in BUTTON_FLICKER:
+            fill = _shade(BUTTON_COLORS[state], delta)
+            surf = pygame.Surface((self.rect.width + 2 * margin, self.rect.height + 2 * margin), pygame.SRCALPHA)
+            if glow:
+                pygame.draw.rect(surf, GLOW_COLOR, surf.get_rect(), border_radius=12)
+                fill = _over(fill, GLOW_COLOR)
+            pygame.draw.rect(surf, fill, (margin, margin, self.rect.width, self.rect.height), border_radius=12)
+            variants.append((surf, (self.rect.x - margin, self.rect.y - margin)))
+        self._states[state] = variants
+        return variants
+
+    def state(self, hovered, pressed):
+        if hovered == self.name:
+            return PRESSED if pressed else HOVER
+        return NORMAL
+
+    def draw(self, surface, hovered=None, pressed=False):
+        state = self.state(hovered, pressed)
+        variants = self._states.get(state) or self._build(state)
+        surf, pos = variants[random.randrange(len(variants))]
+        surface.blit(surf, pos)
+        if state == NORMAL:
+            surface.blit(self.label, self.label_pos)
+        else:
+            lx, ly = self.label_pos
+            surface.blit(self.label, (lx + random.randint(-1, 1), ly + random.randint(-1, 1)))
+
+
+class Toggle(Button):
+    """Button that stays lit (hover look) while `selected`."""
+    def __init__(self, name, rect, text, selected=False, **kwargs):
+        super().__init__(name, rect, text, **kwargs)
+        self.selected = selected
+
+    def state(self, hovered, pressed):
+        if hovered == self.name:
+            return PRESSED if pressed else HOVER
+        return HOVER if self.selected else NORMAL
+
+
+class Panel:
+    """One menu screen: draws its widgets in order and hit-tests its buttons via `hits`."""
+    def __init__(self, group, hits):
+        self.group = group
+        self.hits = hits
+        self.widgets = []
+
+    def add(self, widget):
+        if widget.name is not None:
+            self.hits.add((self.group, widget.name), widget.rect, self.group)
+        self.widgets.append(widget)
+        return widget
+
+    def hit(self, x, y):
+        """Name of the button under (x, y), or None."""
+        key = self.hits.hit(x, y, self.group)
+        return key[1] if key is not None else None
+
+    def draw(self, surface, hovered=None, pressed=False):
+        for widget in self.widgets:
+            widget.draw(surface, hovered, pressed)
@@ -0,0 +1,322 @@
+"""
+Night rules shared by the game and the headless simulator:
+rooms, connections, doors and power. No display or assets needed.
+Room names are for the UI; the AI works on the dense integer ids of a
+compiled RoomGraph.
+"""
+
+PLAYER_ROOM = "Office"  # the room that is the player's location
+NIGHT_LENGTH = 450  # 7 minutes 30 seconds like FNaF
+
+
+# ----- Map / Rooms / Waypoints -----
+class Room:
+    __slots__ = ("name", "view_surface", "waypoints", "id")
+
+    def __init__(self, name, view_surface, waypoints, id=-1):
+        self.name = name
+        self.view_surface = view_surface    # pygame.Surface, filled in by the asset loader
+        self.waypoints = waypoints          # coordinates local to room
+        self.id = id                        # dense id in the RoomGraph
+
+    def __repr__(self):
+        return f"Room({self.name!r}, id={self.id})"
+
+
+ROOM_WAYPOINTS = {
+    "Stage":      [(160, 30), (160, 210)],
+    "Hall":       [(50, 50), (250, 180)],
+    "Kitchen":    [(30, 30), (280, 200)],
+    "HallCorner": [(60, 60), (260, 180)],
+    "Backroom":   [(100, 100), (220, 160)],
+    "Office":     [(0, 0)],
+}
+
+ROOM_CONNECTIONS = {
+    "Stage": ["Hall"],
+    "Hall": ["Stage", "Backroom", "HallCorner"],
+    "Kitchen": ["Backroom"],
+    "HallCorner": ["Hall", "Office"],
+    "Backroom": ["Hall", "HallCorner"],
+    "Office": ["Hall", "HallCorner"]
+}
+
+
+def make_rooms():
+    """Fresh room table; view surfaces are filled in by the game's asset loader."""
+    return {name: Room(name, None, list(points), i) for i, (name, points) in enumerate(ROOM_WAYPOINTS.items())}
+
+
+class CompiledRoute:
+    """A route as room ids plus next-hop tables (no list.index() per decision)."""
+    __slots__ = ("ids", "next_index", "next_room", "first_index")
+
+    def __init__(self, ids, room_count):
+        self.ids = tuple(ids)
+        n = len(self.ids)
+        self.next_index = tuple((i + 1) % n for i in range(n))
+        self.next_room = tuple(self.ids[(i + 1) % n] for i in range(n))
+        first = [-1] * room_count
+        for i in reversed(range(n)):
+            first[self.ids[i]] = i
+        self.first_index = tuple(first)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class RoomGraph:
+    """Rooms with dense integer ids and an adjacency array; names only at the UI edges."""
+    __slots__ = ("names", "ids", "rooms", "adjacency", "neighbors", "waypoints")
+
+    def __init__(self, rooms, connections):
+        self.names = tuple(rooms)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.rooms = tuple(rooms[name] for name in self.names)
+        for i, room in enumerate(self.rooms):
+            room.id = i
+        n = len(self.names)
+        adjacency = [[False] * n for _ in range(n)]
+        for name, others in connections.items():
+            for other in others:
+                adjacency[self.ids[name]][self.ids[other]] = True
+        self.adjacency = tuple(tuple(row) for row in adjacency)
+        self.neighbors = tuple(tuple(j for j in range(n) if adjacency[i][j]) for i in range(n))
+        self.waypoints = tuple(tuple(room.waypoints) for room in self.rooms)
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, name):
+        return self.ids[name]
+
+    def name(self, room_id):
+        return self.names[room_id]
+
+    def compile_route(self, route):
+        return CompiledRoute([self.ids[name] for name in route], len(self.names))
+
+
+# ----- Door & Power System -----
+class Door:
+    __slots__ = ("id", "rooms", "kind", "closed")
+
+    def __init__(self, id, rooms, kind="door", closed=False):
+        self.id = id            # canonical pair id (index in the registry)
+        self.rooms = rooms      # (room_a, room_b) names as declared
+        self.kind = kind        # "door", "left", "right", "vent", ...
+        self.closed = closed
+
+    def __repr__(self):
+        return f"Door({self.rooms[0]!r}<->{self.rooms[1]!r}, {'closed' if self.closed else 'open'})"
+
+
+class DoorRegistry:
+    """
+    Every door once, indexed by both orientations of its room pair (and by
+    room id after bind()). Keeps the number of closed doors and tells
+    subscribers about every open/close instead of being polled.
+    """
+    def __init__(self):
+        self.doors = []
+        self.closed_count = 0
+        self._by_pair = {}
+        self._by_ids = None
+        self._listeners = []
+
+    def add(self, room_a, room_b, kind="door", closed=False):
+        door = Door(len(self.doors), (room_a, room_b), kind, closed)
+        self.doors.append(door)
+        self._by_pair[(room_a, room_b)] = self._by_pair[(room_b, room_a)] = door
+        self.closed_count += closed
+        return door
+
+    def bind(self, graph):
+        """Room-id lookup table for the AI (graph ids, both orientations)."""
+        n = len(graph)
+        self._by_ids = [[None] * n for _ in range(n)]
+        for door in self.doors:
+            a, b = (graph.ids[name] for name in door.rooms)
+            self._by_ids[a][b] = self._by_ids[b][a] = door
+        return self
+
+    # --- lookups ---
+    def __iter__(self):
+        return (door.rooms for door in self.doors)
+
+    def __len__(self):
+        return len(self.doors)
+
+    def get(self, room_a, room_b):
+        return self._by_pair.get((room_a, room_b))
+
+    def is_closed(self, room_a, room_b):
+        door = self._by_pair.get((room_a, room_b))
+        return door is not None and door.closed
+
+    def is_closed_ids(self, a, b):
+        door = self._by_ids[a][b]
+        return door is not None and door.closed
+
+    # --- changes ---
+    def subscribe(self, listener):
+        """listener(door) runs after every open/close."""
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set(self, room_a, room_b, closed):
+        door = self._by_pair.get((room_a, room_b))
+        if door is not None:
+            self._set(door, closed)
+        return door
+
+    def toggle(self, room_a, room_b):
+        door = self._by_pair.get((room_a, room_b))
+        if door is not None:
+            self._set(door, not door.closed)
+        return door
+
+    def open_all(self):
+        if self.closed_count:
+            for door in self.doors:
+                self._set(door, False)
+
+    def _set(self, door, closed):
+        closed = bool(closed)
+        if door.closed == closed:
+            return
+        door.closed = closed
+        self.closed_count += 1 if closed else -1
+        for listener in self._listeners:
+            listener(door)
+
+
+# side of the office each doorway is on (-1 left, +1 right); used for positional audio
+OFFICE_SIDES = {"Hall": -1.0, "HallCorner": 1.0}
+
+
+def make_doors():
+    doors = DoorRegistry()
+    doors.add("Hall", "Office", kind="left")
+    return doors
+
+
+MAX_POWER = 100.0
+POWER_DRAIN_IDLE = 0.0025      # slower idle drain
+POWER_DRAIN_CAMERA = 0.008     # slower drain when cameras are active
+POWER_DRAIN_DOOR = 0.02        # slightly reduced door cost
+
+
+def drain_rate(camera_on, closed_doors):
+    """Power units per second."""
+    total_drain = POWER_DRAIN_IDLE
+    if camera_on:
+        total_drain += POWER_DRAIN_CAMERA
+    # add drain for each closed door
+    total_drain += POWER_DRAIN_DOOR * closed_doors
+    return total_drain * 60
+
+
+class PowerModel:
+    """
+    Power as a piecewise linear function of game time. The drain rate is only
+    recomputed when the camera or a door changes; in between, the level is
+    integrated analytically and the blackout moment is known in advance.
+    `clock()` returns the current game time. With a `scheduler` (driven by
+    the same clock) the blackout is a scheduled event; without one, update()
+    checks for it.
+    """
+    def __init__(self, doors, clock, capacity=MAX_POWER, camera_on=False, scheduler=None):
+        self.doors = doors
+        self.clock = clock
+        self.camera_on = camera_on
+        self.blacked_out = False
+        self.scheduler = scheduler
+        self._blackout_timer = None
+        self._listeners = []
+        self._t0 = clock()
+        self._p0 = capacity
+        self.rate = drain_rate(camera_on, doors.closed_count)
+        doors.subscribe(self._door_changed)
+        self._schedule_blackout()
+
+    def level(self, t=None):
+        """Power at game time t (default: now)."""
+        t = self.clock() if t is None else t
+        return max(self._p0 - self.rate * (t - self._t0), 0)
+
+    def blackout_time(self):
+        """Game time at which power reaches zero with the current drain (inf if never)."""
+        if self.blacked_out:
+            return self._t0
+        return self._t0 + self._p0 / self.rate if self.rate > 0 else float("inf")
+
+    def time_until_zero(self, t=None):
+        t = self.clock() if t is None else t
+        return max(self.blackout_time() - t, 0.0)
+
+    def on_blackout(self, listener):
+        """listener(time) runs once, at the exact blackout time."""
+        self._listeners.append(listener)
+        return listener
+
+    # --- state changes ---
+    def _rebase(self):
+        now = self.clock()
+        self._p0 = self.level(now)
+        self._t0 = now
+
+    def _schedule_blackout(self):
+        if self.scheduler is None or self.blacked_out:
+            return
+        self.scheduler.cancel(self._blackout_timer)
+        t = self.blackout_time()
+        self._blackout_timer = None if t == float("inf") else self.scheduler.at(t, self._blackout, t)
+
+    def set_camera(self, on):
+        if self.blacked_out:
+            # stays at zero; the blackout must not be scheduled (and fired) again
+            self.camera_on = on
+            return
+        if on != self.camera_on:
+            self._rebase()
+            self.camera_on = on
+            self.rate = drain_rate(on, self.doors.closed_count)
+            self._schedule_blackout()
+
+    def _door_changed(self, door):
+        if self.blacked_out:
+            # no power: doors cannot be closed any more
+            if door.closed:
+                self.doors.set(*door.rooms, False)
+            return
+        self._rebase()
+        self.rate = drain_rate(self.camera_on, self.doors.closed_count)
+        self._schedule_blackout()
+
+    def _blackout(self, t):
+        self._p0, self._t0 = 0, t
+        self.blacked_out = True
+        self._blackout_timer = None
+        self.doors.open_all()
+        for listener in self._listeners:
+            listener(t)
+
+    def update(self):
+        """Fires the blackout if its time has come (unscheduled mode); returns the current level."""
+        now = self.clock()
+        if self.scheduler is None and not self.blacked_out and now >= self.blackout_time():
+            self._blackout(self.blackout_time())
+        return self.level(now)
+
+CLOCK_LABELS = ["12 AM", "1 AM", "2 AM", "3 AM", "4 AM", "5 AM", "6 AM"]
+
+
+def hour_label(elapsed, night_length=NIGHT_LENGTH):
+    """12 AM → 1 AM → ... → 6 AM over the night (6 stages)."""
+    hours = int(elapsed / night_length * 6)
+    return CLOCK_LABELS[min(max(hours, 0), len(CLOCK_LABELS) - 1)]